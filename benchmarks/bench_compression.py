@@ -0,0 +1,86 @@
+"""
+Shows the bytes and latency trade-off of request body compression at
+several payload sizes.
+
+For each size and setting it reports the bytes sent, the CPU time spent
+compressing, the round trip against a local stand-in server (where the
+network is free, so only the CPU cost shows), and the estimated upload time
+over a link of --bandwidth-mbps, where the saved bytes pay off.
+
+    PYTHONPATH=src python benchmarks/bench_compression.py --rows 10 100 1000 10000
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.codec import default_codec
+from databricks.model_serving.compression import (
+    GZIP,
+    ZSTD,
+    Compression,
+    zstd_available,
+)
+from databricks.model_serving.testing import LocalServingServer
+
+
+def _settings():
+    settings = {"none": None, "gzip-1": Compression(GZIP, 0, 1)}
+    settings["gzip-6"] = Compression(GZIP, 0, 6)
+    if zstd_available():
+        settings["zstd-3"] = Compression(ZSTD, 0, 3)
+    return settings
+
+
+def _payload(rows, columns, rng):
+    values = np.round(rng.standard_normal((rows, columns)), 6)
+    names = [f"feature_{i}" for i in range(columns)]
+    return {"dataframe_records": [dict(zip(names, row)) for row in values.tolist()]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--bandwidth-mbps", type=float, default=100.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    codec = default_codec()
+    results = {}
+    with LocalServingServer(predict=lambda name, body: {"predictions": []}) as server:
+        for rows in args.rows:
+            payload = _payload(rows, args.columns, rng)
+            raw = codec.dumps(payload)
+            results[rows] = {}
+            for name, compression in _settings().items():
+                start = time.process_time()
+                body = compression.compress(raw)[0] if compression else raw
+                cpu = time.process_time() - start
+                with EndpointClient(
+                    server.base_url, "FAKETOKEN", compression=compression
+                ) as client:
+                    client.query_inference_endpoint("bench", payload)
+                    latencies = []
+                    for _ in range(args.calls):
+                        start = time.perf_counter()
+                        client.query_inference_endpoint("bench", payload)
+                        latencies.append(time.perf_counter() - start)
+                upload = len(body) * 8 / (args.bandwidth_mbps * 1e6)
+                results[rows][name] = {
+                    "bytes": len(body),
+                    "ratio": round(len(raw) / len(body), 2),
+                    "compress_ms": round(cpu * 1000, 3),
+                    "loopback_ms": round(statistics.median(latencies) * 1000, 3),
+                    "upload_ms": round(upload * 1000, 3),
+                    "compress_plus_upload_ms": round((cpu + upload) * 1000, 3),
+                }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
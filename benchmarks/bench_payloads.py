@@ -0,0 +1,56 @@
+"""
+Compares payload size and encoding CPU time of `dataframe_records` against
+the `dataframe_split` and `inputs` builders in databricks.model_serving.payloads.
+
+    PYTHONPATH=src python benchmarks/bench_payloads.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from databricks.model_serving.payloads import dataframe_split, tensor_inputs
+
+
+def _measure(build, repeat):
+    best, size = None, None
+    for _ in range(repeat):
+        start = time.process_time()
+        size = len(json.dumps(build()).encode())
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"bytes": size, "cpu_s": round(best, 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--dtype", default="float32")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    results = {}
+    for rows in args.rows:
+        values = rng.standard_normal((rows, args.columns)).astype(args.dtype)
+        df = pd.DataFrame(values, columns=[f"f{i}" for i in range(args.columns)])
+        records = _measure(
+            lambda: {"dataframe_records": df.to_dict(orient="records")}, args.repeat
+        )
+        split = _measure(lambda: dataframe_split(df), args.repeat)
+        inputs = _measure(lambda: tensor_inputs(values), args.repeat)
+        results[rows] = {
+            "dataframe_records": records,
+            "dataframe_split": split,
+            "inputs": inputs,
+            "split_bytes_saved": round(1 - split["bytes"] / records["bytes"], 3),
+            "split_cpu_saved": round(1 - split["cpu_s"] / records["cpu_s"], 3),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compares per-call latency of pooled keep-alive sessions against opening a
+new connection for every request (the previous EndpointClient behaviour).
+
+Runs fully offline against a local stand-in server:
+
+    PYTHONPATH=src python benchmarks/bench_pooling.py --calls 500
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import requests
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.testing import LocalServingServer
+
+
+def _summary(latencies):
+    latencies = sorted(latencies)
+    return {
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+    }
+
+
+def _time_calls(call, calls):
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    server = LocalServingServer().start()
+    base_url = server.base_url
+    payload = {"dataframe_records": [{"x": 1.0}]}
+    url = f"{base_url}/serving-endpoints/bench/invocations"
+
+    def unpooled():
+        requests.request("POST", url=url, data=json.dumps(payload)).json()
+
+    with EndpointClient(base_url, "FAKETOKEN") as client:
+        client.query_inference_endpoint("bench", payload)
+
+        def pooled():
+            client.query_inference_endpoint("bench", payload)
+
+        results = {
+            "unpooled": _summary(_time_calls(unpooled, args.calls)),
+            "pooled": _summary(_time_calls(pooled, args.calls)),
+        }
+
+    server.stop()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
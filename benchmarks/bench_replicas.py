@@ -0,0 +1,64 @@
+"""
+Measures the throughput of ReplicatedEndpointClient as replicas are added.
+
+Each replica is a local stand-in server that serves a few concurrent
+invocations at most and throttles the rest, like a small endpoint:
+
+    PYTHONPATH=src python benchmarks/bench_replicas.py --replicas 1 2 4
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from databricks.model_serving.exceptions import ThrottledError
+from databricks.model_serving.replicas import ReplicatedEndpointClient
+from databricks.model_serving.testing import LocalServingServer
+
+
+def _run(count, args):
+    servers = [
+        LocalServingServer(latency=args.latency, concurrency_limit=args.limit).start()
+        for _ in range(count)
+    ]
+    replicas = [(s.base_url, "FAKETOKEN", "bench") for s in servers]
+    payload = {"dataframe_records": [{"x": 1.0}]}
+    throttled = 0
+    with ReplicatedEndpointClient(replicas, cooldown=args.latency) as client:
+
+        def call(_):
+            try:
+                client.query_inference_endpoint(payload)
+                return True
+            except ThrottledError:
+                return False
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            results = list(pool.map(call, range(args.calls)))
+        elapsed = time.perf_counter() - start
+        throttled = results.count(False)
+    for server in servers:
+        server.stop()
+    return {
+        "replicas": count,
+        "calls_per_s": round(results.count(True) / elapsed, 1),
+        "throttled": throttled,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--limit", type=int, default=8)
+    args = parser.parse_args()
+
+    print(json.dumps([_run(count, args) for count in args.replicas], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -80,14 +80,10 @@ client.list_inference_endpoints()
 
 # COMMAND ----------
 
-import time
+result = client.wait_for_config_update(endpoint_name)
 
-endpoint = client.get_inference_endpoint(endpoint_name)
-
-while endpoint['state']['config_update'] == "IN_PROGRESS":
-  time.sleep(5)
-  endpoint = client.get_inference_endpoint(endpoint_name)
-  print(endpoint["name"], endpoint["state"])
+for transition in result.timeline:
+  print(endpoint_name, f"{transition.elapsed:.0f}s", transition.state)
 
 # COMMAND ----------
 
@@ -165,14 +161,10 @@ client.update_served_models(endpoint_name, models)
 
 # COMMAND ----------
 
-import time
-
-endpoint = client.get_inference_endpoint(endpoint_name)
+result = client.wait_for_config_update(endpoint_name)
 
-while endpoint['state']['config_update'] == "IN_PROGRESS":
-  time.sleep(5)
-  endpoint = client.get_inference_endpoint(endpoint_name)
-  print(endpoint["name"], endpoint["state"])
+for transition in result.timeline:
+  print(endpoint_name, f"{transition.elapsed:.0f}s", transition.state)
 
 # COMMAND ----------
 
@@ -238,14 +230,65 @@ client.get_inference_endpoint(endpoint_name)
 
 # COMMAND ----------
 
-import time
+result = client.wait_for_config_update(endpoint_name)
+
+for transition in result.timeline:
+  print(endpoint_name, f"{transition.elapsed:.0f}s", transition.state)
 
-endpoint = client.get_inference_endpoint(endpoint_name)
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC
+# MAGIC ## Progressive rollout
+# MAGIC
+# MAGIC Instead of a fixed split, a `RolloutController` can shift traffic to the Staging model step by step. Each step is gated on the p99 latency and error rate the client observes on that model, and the original split is restored if the SLO is breached.
+# MAGIC
+# MAGIC The controller only observes the invocations sent through the client, so it runs in a background thread while this cell keeps querying the endpoint. At 1% of the traffic, the first step needs about 10,000 requests for the Staging model to get the 100 it is judged on.
+
+# COMMAND ----------
 
-while endpoint['state']['config_update'] == "IN_PROGRESS":
-  time.sleep(5)
-  endpoint = client.get_inference_endpoint(endpoint_name)
-  print(endpoint["name"], endpoint["state"])
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from databricks.model_serving.exceptions import EndpointClientError
+from databricks.model_serving.rollout import RolloutController, RolloutSLO
+
+controller = RolloutController(
+    client,
+    endpoint_name,
+    candidate=f"{model_name}-{model_version_staging}",
+    slo=RolloutSLO(max_p99=0.5, max_error_rate=0.01, min_requests=100),
+    schedule=(1, 5, 25, 50, 100),
+    step_duration=120,
+)
+outcome = {}
+
+def run():
+  try:
+    outcome["result"] = controller.run()
+  except Exception as e:
+    outcome["error"] = e
+
+runner = threading.Thread(target=run)
+runner.start()
+
+def query(_):
+  try:
+    client.query_inference_endpoint(endpoint_name, input_data)
+  except EndpointClientError:
+    pass  # Failed invocations are counted by the controller all the same
+
+with ThreadPoolExecutor(max_workers=8) as pool:
+  while runner.is_alive():
+    list(pool.map(query, range(32)))
+
+runner.join()
+if "error" in outcome:
+  raise outcome["error"]
+result = outcome["result"]
+print(result.status, result.reason)
+for step in result.steps:
+  print(f"{step.percentage}%: {step.requests} requests, p99 {step.p99}, {step.breach or 'passed'}")
 
 # COMMAND ----------
 
@@ -141,3 +141,15 @@ client.get_served_model_build_logs(latest_event["endpoint_name"], latest_event["
 # COMMAND ----------
 
 client.get_served_model_server_logs(latest_event["endpoint_name"], latest_event["served_model_name"])
+
+# COMMAND ----------
+
+# MAGIC %md ### Follow the server logs
+# MAGIC Prints the current log lines, then only the new ones as they arrive (polling backs off while the log is idle), for up to 5 minutes.
+
+# COMMAND ----------
+
+for line in client.tail_served_model_logs(
+    latest_event["endpoint_name"], latest_event["served_model_name"], follow=True, timeout=300
+):
+    print(line)
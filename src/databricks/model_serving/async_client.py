@@ -0,0 +1,660 @@
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+from typing import Callable, List, Dict, Sequence, Tuple
+
+import aiohttp
+from databricks.model_serving.batching import (
+    DEFAULT_MAX_ROWS,
+    DEFAULT_MAX_WORKERS,
+    BulkResult,
+    chunk_predictions,
+    chunk_records,
+    merge_chunk,
+)
+from databricks.model_serving.cache import PredictionCache
+from databricks.model_serving.circuit import CircuitBreaker, CircuitBreakerConfig
+from databricks.model_serving.codec import JsonCodec, default_codec
+from databricks.model_serving.compression import Compression, accept_encoding
+from databricks.model_serving.concurrency import AIMDConfig, AsyncAdaptiveLimiter
+from databricks.model_serving.endpoint import Endpoint
+from databricks.model_serving.exceptions import (
+    CircuitOpenError,
+    EndpointClientError,
+    ServiceUnavailableError,
+    ThrottledError,
+    raise_api_error,
+)
+from databricks.model_serving.hedging import Hedger, HedgingConfig
+from databricks.model_serving.metadata import LIST_KEY, MetadataCache, endpoint_key
+from databricks.model_serving.metrics import SERVED_MODEL_HEADER, RequestTiming
+from databricks.model_serving.retry import RetryPolicy
+from databricks.model_serving.transport import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+)
+
+try:
+    from aiohttp.compression_utils import HAS_ZSTD as ZSTD_RESPONSES
+except ImportError:  # pragma: no cover - older aiohttp
+    ZSTD_RESPONSES = False
+
+DEFAULT_MAX_CONCURRENCY = 100
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncEndpointClient:
+    """
+    asyncio counterpart of EndpointClient, built on aiohttp.
+
+    A single event loop can keep hundreds of requests in flight: all calls
+    share one connection pool, and a semaphore bounds how many of them are
+    outstanding at once.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        limit_per_host: int = 0,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        session: aiohttp.ClientSession = None,
+        codec: JsonCodec = None,
+        retry_policy: RetryPolicy = None,
+        adaptive_concurrency: AIMDConfig = None,
+        prediction_cache: PredictionCache = None,
+        metadata_cache: MetadataCache = None,
+        request_hooks: List[Callable[[RequestTiming], None]] = None,
+        hedging: HedgingConfig = None,
+        compression: Compression = None,
+        circuit_breaker: CircuitBreakerConfig = None,
+    ):
+        """
+        Instantiates an AsyncEndpointClient. Parameters.
+
+        base_url: A string pointing to your workspace URL.
+        token: Access Token for interacting with your Databricks Workspace.
+        max_concurrency: Maximum number of requests in flight at once. Also
+        used as the size of the connection pool.
+        limit_per_host: Maximum connections per host, 0 for no extra limit.
+        connect_timeout: Seconds to wait for a TCP/TLS connection.
+        read_timeout: Seconds to wait for the server to send data.
+        session: Optional aiohttp.ClientSession to share between clients.
+        When omitted, one is created lazily inside the running event loop.
+        codec: JSON codec used for request and response bodies. Defaults to
+        the standard library; pass an OrjsonCodec to use orjson.
+        retry_policy: Retry behaviour of the REST helpers, see EndpointClient.
+        adaptive_concurrency: Per-endpoint AIMD limit on invocations, see
+        EndpointClient. Applies on top of max_concurrency.
+        prediction_cache: Optional PredictionCache, see EndpointClient.
+        metadata_cache: Optional MetadataCache, see EndpointClient.
+        request_hooks: Callables receiving a RequestTiming after every HTTP
+        request, see EndpointClient. Connect times are only measured on
+        sessions created by the client.
+        hedging: Opt-in hedging of query_inference_endpoint calls, see
+        EndpointClient. The losing request is cancelled.
+        compression: Optional Compression of request bodies, see
+        EndpointClient.
+        circuit_breaker: Opt-in circuit breaker per endpoint, see
+        EndpointClient. Cancelled invocations, e.g. losing hedges, are not
+        counted.
+        """
+        self.base_url = base_url
+        self.token = token
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Accept-Encoding": accept_encoding(ZSTD_RESPONSES),
+        }
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self._owns_session = session is None
+        self._session = session
+        self._semaphore = None
+        self.codec = codec if codec is not None else default_codec()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.adaptive_concurrency = adaptive_concurrency
+        self.limiters: Dict[str, AsyncAdaptiveLimiter] = {}
+        self.prediction_cache = prediction_cache
+        self.metadata_cache = metadata_cache
+        self.request_hooks = list(request_hooks or [])
+        self.hedging = hedging
+        self.compression = compression
+        self.hedgers: Dict[str, Hedger] = {}
+        self.circuit_breaker = circuit_breaker
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    async def close(self):
+        """
+        Closes the pooled connections, unless the session was passed in.
+        """
+
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def create_inference_endpoint(
+        self, endpoint_name: str, served_models: List[str], traffic_config: Dict = None
+    ):
+        """
+        Creates inference endpoints for models.
+
+        endpoint_name: Serving endpoint name.
+        served_models: List of model names that will be deployed.
+        traffic_config: Traffic percentage split between served models.
+        """
+
+        config_dict = {"served_models": served_models}
+        if traffic_config is not None:
+            config_dict["traffic_config"] = traffic_config
+        data = {"name": endpoint_name, "config": config_dict}
+        try:
+            return await self._post(uri=Endpoint.SERVING.value, body=data)
+        finally:
+            self.invalidate_metadata(endpoint_name)
+
+    async def get_inference_endpoint(
+        self, endpoint_name: str, refresh: bool = False
+    ) -> Dict:
+        """
+        Gets info on the inference endpoint.
+
+        endpoint_name: Serving endpoint name.
+        refresh: Bypass (and refresh) the metadata cache, if any.
+        """
+
+        uri = f"{Endpoint.SERVING.value}/{endpoint_name}"
+        if self.metadata_cache is None:
+            return await self._get(uri)
+        return await self.metadata_cache.get_async(
+            endpoint_key(endpoint_name), lambda: self._get(uri), refresh=refresh
+        )
+
+    async def list_inference_endpoints(self, refresh: bool = False) -> Dict:
+        """
+        Lists all running inference endpoints.
+
+        refresh: Bypass (and refresh) the metadata cache, if any.
+        """
+
+        if self.metadata_cache is None:
+            return await self._get(Endpoint.SERVING.value)
+        return await self.metadata_cache.get_async(
+            LIST_KEY, lambda: self._get(Endpoint.SERVING.value), refresh=refresh
+        )
+
+    async def update_served_models(
+        self, endpoint_name: str, served_models: List[str], traffic_config: Dict = None
+    ):
+        """
+        Updates served models with the specified traffic_config.
+
+        endpoint_name: Serving endpoint name.
+        served_models: List of served models.
+        traffic_config: New traffic split configuration.
+        """
+
+        config_dict = {"served_models": served_models}
+        if traffic_config is not None:
+            config_dict["traffic_config"] = traffic_config
+        try:
+            return await self._put(
+                Endpoint.CONFIG.value.format(endpoint_name), config_dict
+            )
+        finally:
+            self.invalidate_metadata(endpoint_name)
+
+    async def delete_inference_endpoint(self, endpoint_name: str) -> Dict:
+        """
+        Deletes an inference endpoint.
+
+        endpoint_name: Serving endpoint name.
+        """
+
+        try:
+            return await self._delete(f"{Endpoint.SERVING.value}/{endpoint_name}")
+        finally:
+            self.invalidate_metadata(endpoint_name)
+
+    async def query_inference_endpoint(self, endpoint_name: str, data: Dict) -> Dict:
+        """
+        Makes HTTP requests to an inference endpoint.
+
+        endpoint_name: Serving endpoint name.
+        data: Payload containing the data expected by the model.
+        """
+
+        cache = self.prediction_cache
+        try:
+            if cache is None:
+                return await self._query(endpoint_name, data)
+            version = await self._cached_config_version(endpoint_name)
+            key = cache.key(endpoint_name, data, version)
+            cached = cache.get(key)
+            if cached is not None:
+                return self.codec.loads(cached)
+            response = await self._query(endpoint_name, data)
+        except CircuitOpenError as e:
+            if self.circuit_breaker.fallback is None:
+                raise
+            return self.circuit_breaker.fallback(endpoint_name, data, e)
+        cache.put(key, self.codec.dumps(response))
+        return response
+
+    async def query_inference_endpoint_bulk(
+        self,
+        endpoint_name: str,
+        records: Sequence,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_bytes: int = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        input_key: str = "dataframe_records",
+        build_payload: Callable[[List], Dict] = None,
+    ) -> BulkResult:
+        """
+        Scores a large record set in concurrent, size-bounded chunks.
+
+        See EndpointClient.query_inference_endpoint_bulk. max_workers bounds
+        the number of chunks in flight for this call.
+        """
+
+        cache = self.prediction_cache
+        store = None
+        predictions = [None] * len(records)
+        pending = range(len(records))
+        if cache is not None:
+            version = await self._cached_config_version(endpoint_name)
+            keys, predictions, pending = cache.lookup_rows(
+                endpoint_name, records, version, input_key, self.codec.loads
+            )
+
+            def store(row, prediction):
+                cache.put(keys[row], self.codec.dumps(prediction))
+
+        pending_records = [records[i] for i in pending]
+        bounds = chunk_records(
+            pending_records,
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+            dumps=self.codec.dumps,
+        )
+        failures = []
+        if build_payload is None:
+
+            def build_payload(chunk):
+                return {input_key: chunk}
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def score(start, stop):
+            async with semaphore:
+                response = await self._invoke(
+                    endpoint_name, build_payload(pending_records[start:stop])
+                )
+            return chunk_predictions(response, stop - start)
+
+        outcomes = await asyncio.gather(
+            *[score(start, stop) for start, stop in bounds], return_exceptions=True
+        )
+        for index, ((start, stop), outcome) in enumerate(zip(bounds, outcomes)):
+            merge_chunk(
+                predictions, failures, index, pending[start:stop], outcome, store
+            )
+        return BulkResult(predictions, failures)
+
+    def invalidate_metadata(self, endpoint_name: str = None):
+        """
+        Drops the cached metadata and predictions of an endpoint, or of all
+        endpoints.
+
+        endpoint_name: Serving endpoint name, None for all endpoints.
+        """
+
+        if self.metadata_cache is not None:
+            self.metadata_cache.invalidate(endpoint_name)
+        if self.prediction_cache is not None:
+            self.prediction_cache.invalidate(endpoint_name)
+
+    async def _invoke(self, endpoint_name: str, data: Dict) -> Dict:
+        breaker = self._get_breaker(endpoint_name)
+        with breaker.call() if breaker is not None else nullcontext():
+            return await self._post(
+                Endpoint.INVOCATIONS.value.format(endpoint_name),
+                data,
+                retry=self.retry_policy.retry_invocations,
+                limiter=self._get_limiter(endpoint_name),
+            )
+
+    async def _query(self, endpoint_name: str, data: Dict) -> Dict:
+        if self.hedging is None:
+            return await self._invoke(endpoint_name, data)
+        return await self._invoke_hedged(endpoint_name, data)
+
+    async def _invoke_hedged(self, endpoint_name: str, data: Dict) -> Dict:
+        hedger = self._get_hedger(endpoint_name)
+        delay = hedger.start()
+        primary = asyncio.ensure_future(self._timed_invoke(hedger, endpoint_name, data))
+        tasks = [primary]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and hedger.try_hedge():
+                    tasks.append(
+                        asyncio.ensure_future(
+                            self._timed_invoke(hedger, endpoint_name, data)
+                        )
+                    )
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            hedger.hedge_won()
+                        return task.result()
+            return primary.result()
+        finally:
+            # Cancelling the loser aborts its request and frees its connection.
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _timed_invoke(self, hedger: Hedger, endpoint_name: str, data: Dict):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        response = await self._invoke(endpoint_name, data)
+        hedger.observe(loop.time() - start)
+        return response
+
+    async def _cached_config_version(self, endpoint_name: str):
+        found, version = self.prediction_cache.cached_version(endpoint_name)
+        if found:
+            return version
+        try:
+            endpoint = await self.get_inference_endpoint(endpoint_name)
+            version = endpoint.get("config", {}).get("config_version")
+        except EndpointClientError:
+            version = None
+        self.prediction_cache.set_version(endpoint_name, version)
+        return version
+
+    def concurrency_limits(self) -> Dict[str, Dict]:
+        """
+        Returns the adaptive concurrency limit, in-flight count and limit
+        history of every endpoint queried so far.
+        """
+
+        return {name: limiter.snapshot() for name, limiter in self.limiters.items()}
+
+    def hedging_stats(self) -> Dict[str, Dict]:
+        """
+        Returns the hedging delay and the request, hedge and hedge win
+        counts of every endpoint queried so far.
+        """
+
+        return {name: hedger.snapshot() for name, hedger in self.hedgers.items()}
+
+    def circuit_breakers(self) -> Dict[str, Dict]:
+        """
+        Returns the state, counts and recent transitions of every endpoint's
+        circuit breaker.
+        """
+
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
+
+    def _get_breaker(self, endpoint_name: str) -> CircuitBreaker:
+        if self.circuit_breaker is None:
+            return None
+        if endpoint_name not in self.breakers:
+            self.breakers[endpoint_name] = CircuitBreaker(
+                f"{self.base_url}/{endpoint_name}",
+                self.circuit_breaker,
+                (aiohttp.ClientConnectionError, asyncio.TimeoutError),
+            )
+        return self.breakers[endpoint_name]
+
+    def _get_hedger(self, endpoint_name: str) -> Hedger:
+        if endpoint_name not in self.hedgers:
+            self.hedgers[endpoint_name] = Hedger(self.hedging)
+        return self.hedgers[endpoint_name]
+
+    def _get_limiter(self, endpoint_name: str) -> AsyncAdaptiveLimiter:
+        if self.adaptive_concurrency is None:
+            return None
+        if endpoint_name not in self.limiters:
+            self.limiters[endpoint_name] = AsyncAdaptiveLimiter(
+                self.adaptive_concurrency
+            )
+        return self.limiters[endpoint_name]
+
+    # Debugging
+
+    async def get_served_model_build_logs(
+        self, endpoint_name: str, served_model_name: str
+    ) -> Dict:
+        """
+        Gets the build logs for the specified endpoint/model.
+
+        endpoint_name: Serving endpoint name.
+        served_model_name: Served model name.
+        """
+
+        served_models_path = Endpoint.SERVED_MODELS.value.format(endpoint_name)
+        build_logs_path = f"{served_model_name}/build-logs"
+        return await self._get(f"{served_models_path}/{build_logs_path}")
+
+    async def get_served_model_server_logs(
+        self, endpoint_name: str, served_model_name: str
+    ) -> Dict:
+        """
+        Gets the server logs for the specified endpoint/model.
+
+        endpoint_name: Serving endpoint name.
+        served_model_name: Served model name.
+        """
+
+        served_models_path = Endpoint.SERVED_MODELS.value.format(endpoint_name)
+        server_logs_path = f"{served_model_name}/logs"
+        return await self._get(f"{served_models_path}/{server_logs_path}")
+
+    async def get_inference_endpoint_events(self, endpoint_name: str) -> Dict:
+        """
+        Gets the build endpoint events for the specified endpoint.
+
+        endpoint_name: Serving endpoint name.
+        """
+        return await self._get(Endpoint.EVENTS.value.format(endpoint_name))
+
+    # REST API methods
+    async def _get(self, uri) -> Dict:
+        return await self._request("GET", uri)
+
+    async def _post(
+        self, uri, body, retry: bool = None, limiter: AsyncAdaptiveLimiter = None
+    ) -> Dict:
+        return await self._request("POST", uri, body, retry=retry, limiter=limiter)
+
+    async def _put(self, uri, body) -> Dict:
+        return await self._request("PUT", uri, body)
+
+    async def _delete(self, uri) -> Dict:
+        return await self._request("DELETE", uri)
+
+    async def _request(
+        self,
+        method: str,
+        uri: str,
+        body: Dict = None,
+        retry: bool = None,
+        limiter: AsyncAdaptiveLimiter = None,
+    ) -> Dict:
+        if retry is None:
+            retry = self.retry_policy.retries(method)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(method, uri, body, limiter)
+            except (
+                EndpointClientError,
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+            ) as e:
+                if not retry or not self._is_retryable(e):
+                    raise
+                delay = self.retry_policy.delay(
+                    attempt, loop.time() - start, getattr(e, "retry_after", None)
+                )
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _attempt(
+        self, method: str, uri: str, body: Dict, limiter: AsyncAdaptiveLimiter
+    ) -> Dict:
+        if limiter is None:
+            return await self._send(method, uri, body)
+        start = await limiter.acquire()
+        throttled = dropped = False
+        try:
+            return await self._send(method, uri, body)
+        except (ThrottledError, ServiceUnavailableError):
+            throttled = True
+            raise
+        except BaseException:
+            dropped = True
+            raise
+        finally:
+            await limiter.release(start, throttled=throttled, dropped=dropped)
+
+    async def _send(self, method: str, uri: str, body: Dict = None) -> Dict:
+        if self.request_hooks:
+            return await self._send_timed(method, uri, body)
+        session = self._get_session()
+        url = f"{self.base_url}/{uri}"
+        json_body, headers = self._encode(body)
+        async with self._get_semaphore():
+            async with session.request(
+                method, url, headers=headers, data=json_body
+            ) as response:
+                content = await response.read()
+        return self._handle_api_error(response, content)
+
+    async def _send_timed(self, method: str, uri: str, body: Dict = None) -> Dict:
+        session = self._get_session()
+        timing = RequestTiming(method, uri)
+        start = time.perf_counter()
+        try:
+            json_body, headers = self._encode(body)
+            timing.request_bytes = len(json_body) if json_body else 0
+            timing.serialize = time.perf_counter() - start
+            async with self._get_semaphore():
+                sent = time.perf_counter()
+                async with session.request(
+                    method,
+                    f"{self.base_url}/{uri}",
+                    headers=headers,
+                    data=json_body,
+                    trace_request_ctx=timing,
+                ) as response:
+                    received = time.perf_counter()
+                    timing.ttfb = received - sent
+                    timing.status_code = response.status
+                    timing.served_model_name = response.headers.get(SERVED_MODEL_HEADER)
+                    content = await response.read()
+                    timing.response_bytes = len(content)
+            read = time.perf_counter()
+            timing.transfer = read - received
+            try:
+                return self._handle_api_error(response, content)
+            finally:
+                timing.deserialize = time.perf_counter() - read
+        except Exception as e:
+            timing.error = type(e).__name__
+            raise
+        finally:
+            timing.total = time.perf_counter() - start
+            self._emit(timing)
+
+    def _emit(self, timing: RequestTiming):
+        for hook in self.request_hooks:
+            try:
+                hook(timing)
+            except Exception:
+                logger.exception("Request hook %r failed", hook)
+
+    def _handle_api_error(self, response, content: bytes):
+        if response.status == 200:
+            return self.codec.loads(content)
+        raise_api_error(
+            response.status,
+            content.decode("utf-8", "replace"),
+            response.headers.get("Retry-After"),
+        )
+
+    def _encode(self, body: Dict = None) -> Tuple[bytes, Dict[str, str]]:
+        json_body = self.codec.dumps(body) if body is not None else None
+        if self.compression is None:
+            return json_body, self.headers
+        json_body, encoding = self.compression.compress(json_body)
+        if encoding is None:
+            return json_body, self.headers
+        return json_body, {**self.headers, "Content-Encoding": encoding}
+
+    def _is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+            return True
+        return self.retry_policy.is_retryable(error)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # aiohttp sessions and asyncio primitives must be created inside the
+        # event loop that uses them, hence the lazy initialisation.
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency, limit_per_host=self.limit_per_host
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                trace_configs=[_connect_trace_config()],
+            )
+        return self._session
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+
+def _connect_trace_config() -> aiohttp.TraceConfig:
+    # Records the time spent opening new connections into the RequestTiming
+    # passed as trace_request_ctx by _send_timed.
+    async def on_start(session, context, params):
+        context.connect_start = time.perf_counter()
+
+    async def on_end(session, context, params):
+        timing = context.trace_request_ctx
+        if isinstance(timing, RequestTiming):
+            timing.connect += time.perf_counter() - context.connect_start
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(on_start)
+    trace_config.on_connection_create_end.append(on_end)
+    return trace_config
@@ -0,0 +1,123 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_MAX_ROWS = 1000
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class ChunkFailure:
+    """
+    A chunk of a bulk request that could not be scored.
+
+    index: Position of the chunk in the bulk request.
+    start: Index of the first record of the chunk.
+    stop: Index one past the last record of the chunk.
+    error: The exception raised while scoring the chunk.
+    rows: Indices of the records of the chunk. They are range(start, stop)
+    unless cached rows were skipped in between.
+    """
+
+    index: int
+    start: int
+    stop: int
+    error: Exception
+    rows: Optional[Sequence[int]] = None
+
+
+@dataclass
+class BulkResult:
+    """
+    Predictions of a bulk request, in the order of the input records.
+
+    Records that belong to a failed chunk have a None prediction, and the
+    failure itself is reported in `failures`.
+    """
+
+    predictions: List[Any]
+    failures: List[ChunkFailure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+def chunk_records(
+    records: Sequence,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_bytes: int = None,
+    dumps: Callable[[Any], bytes] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Splits records into contiguous chunks and returns their (start, stop) bounds.
+
+    records: Records (or tensor rows) to split.
+    max_rows: Maximum number of records per chunk.
+    max_bytes: Optional bound on the JSON-encoded size of a chunk's records.
+    A single record larger than max_bytes still gets a chunk of its own.
+    dumps: Serializer used to measure records, json.dumps by default.
+    """
+
+    if max_rows is None or max_rows < 1:
+        raise ValueError("max_rows must be a positive integer")
+    if max_bytes is None:
+        return [
+            (start, min(start + max_rows, len(records)))
+            for start in range(0, len(records), max_rows)
+        ]
+
+    dumps = dumps or json.dumps
+    bounds = []
+    start, size = 0, 2
+    for i, record in enumerate(records):
+        # Each record costs its encoded length plus a separating comma.
+        record_size = len(dumps(record)) + 1
+        if i > start and (i - start >= max_rows or size + record_size > max_bytes):
+            bounds.append((start, i))
+            start, size = i, 2
+        size += record_size
+    if start < len(records):
+        bounds.append((start, len(records)))
+    return bounds
+
+
+def merge_chunk(
+    predictions: List[Any],
+    failures: List[ChunkFailure],
+    index: int,
+    rows: Sequence[int],
+    outcome: Any,
+    store: Callable[[int, Any], None] = None,
+):
+    """
+    Merges the outcome of a chunk into the predictions of a bulk request.
+
+    rows: Indices of the chunk's records in the bulk request.
+    outcome: The chunk's predictions, or the exception raised scoring it.
+    store: Optional callback receiving each (row, prediction) pair.
+    """
+
+    if isinstance(outcome, Exception):
+        failures.append(ChunkFailure(index, rows[0], rows[-1] + 1, outcome, rows))
+        return
+    for row, prediction in zip(rows, outcome):
+        predictions[row] = prediction
+        if store is not None:
+            store(row, prediction)
+
+
+def chunk_predictions(response: Dict, expected: int) -> List[Any]:
+    """
+    Extracts the per-record predictions from an invocations response.
+
+    response: Decoded invocations response.
+    expected: Number of records sent in the request.
+    """
+
+    predictions = response.get("predictions") if isinstance(response, dict) else None
+    if not isinstance(predictions, list) or len(predictions) != expected:
+        raise ValueError(
+            f"Expected {expected} predictions in response, got: {response!r:.200}"
+        )
+    return predictions
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 300.0
+DEFAULT_VERSION_TTL = 30.0
+
+# Rough per-entry overhead of the key, the OrderedDict node and the tuple.
+_ENTRY_OVERHEAD = 200
+
+
+class PredictionCache:
+    """
+    Thread-safe in-memory cache of endpoint predictions with LRU and TTL
+    eviction and a memory bound.
+
+    Entries are keyed by endpoint name, a canonical hash of the payload and
+    the endpoint's served-model config version, so a config update never
+    serves predictions of the previous models.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL,
+        version_ttl: float = DEFAULT_VERSION_TTL,
+    ):
+        """
+        Instantiates a PredictionCache. Parameters.
+
+        max_entries: Maximum number of cached predictions.
+        max_bytes: Approximate bound on the memory used by cached values.
+        ttl: Seconds a prediction stays valid.
+        version_ttl: Seconds an endpoint's config version is trusted before
+        it is looked up again.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version_ttl = version_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._versions: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def key(self, endpoint_name: str, payload: Any, version: Any = None) -> str:
+        """
+        Builds the cache key of a payload sent to an endpoint.
+        """
+
+        digest = hashlib.sha256(_canonical_bytes(payload)).hexdigest()
+        return f"{endpoint_name}:{version}:{digest}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Returns the cached, encoded value of a key, or None on a miss.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: bytes):
+        """
+        Caches an encoded value, evicting least recently used entries to
+        stay within max_entries and max_bytes.
+        """
+
+        size = len(value) + len(key) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def version(self, endpoint_name: str, resolve: Callable[[str], Any]) -> Any:
+        """
+        Returns the endpoint's config version, calling resolve at most once
+        per version_ttl.
+        """
+
+        found, version = self.cached_version(endpoint_name)
+        if not found:
+            version = resolve(endpoint_name)
+            self.set_version(endpoint_name, version)
+        return version
+
+    def cached_version(self, endpoint_name: str) -> Tuple[bool, Any]:
+        with self._lock:
+            version, expires = self._versions.get(endpoint_name, (None, 0.0))
+        return expires >= time.monotonic(), version
+
+    def set_version(self, endpoint_name: str, version: Any):
+        with self._lock:
+            self._versions[endpoint_name] = (
+                version,
+                time.monotonic() + self.version_ttl,
+            )
+
+    def invalidate(self, endpoint_name: str = None):
+        """
+        Drops the cached predictions and config version of an endpoint, or
+        of every endpoint when endpoint_name is None.
+        """
+
+        with self._lock:
+            if endpoint_name is None:
+                self._entries.clear()
+                self._versions.clear()
+                self._bytes = 0
+                return
+            self._versions.pop(endpoint_name, None)
+            prefix = f"{endpoint_name}:"
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def lookup_rows(
+        self,
+        endpoint_name: str,
+        records: Sequence,
+        version: Any,
+        input_key: str,
+        loads: Callable[[bytes], Any],
+    ) -> Tuple[List[str], List[Any], List[int]]:
+        """
+        Looks up the prediction of every record of a bulk request.
+
+        Returns the row keys, the predictions (None for misses) and the
+        positions of the records that still have to be scored.
+        """
+
+        keys = [
+            self.key(endpoint_name, ["row", input_key, record], version)
+            for record in records
+        ]
+        predictions = [None] * len(records)
+        misses = []
+        for i, key in enumerate(keys):
+            value = self.get(key)
+            if value is None:
+                misses.append(i)
+            else:
+                predictions[i] = loads(value)
+        return keys, predictions, misses
+
+    def _remove(self, key: str):
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value) + len(key) + _ENTRY_OVERHEAD
+
+
+def _canonical_bytes(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            option=orjson.OPT_SORT_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,266 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from databricks.model_serving.exceptions import (
+    CircuitOpenError,
+    EndpointClientError,
+    ServerError,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BreakerTransition:
+    """
+    A change of state of a circuit breaker, and why it happened.
+    """
+
+    timestamp: float
+    name: str
+    from_state: str
+    to_state: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class CircuitBreakerConfig:
+    """
+    Settings of per-endpoint circuit breakers.
+
+    window: Seconds of recent calls the failure and slow call rates are
+    computed over.
+    min_calls: Calls in the window before the breaker may open.
+    failure_rate: Fraction of failed calls opening the breaker.
+    slow_call_duration: Calls slower than this many seconds count as slow.
+    None to ignore latency.
+    slow_call_rate: Fraction of slow calls opening the breaker.
+    open_duration: Seconds calls fail fast before trial calls are let
+    through (half-open).
+    half_open_calls: Trial calls let through while half-open. The breaker
+    closes once they all succeed, and opens again on the first failure.
+    failure_errors: API errors counted as failures. Connection errors and
+    timeouts always are; other errors, e.g. a 400, count as successes since
+    the endpoint answered.
+    fallback: Optional callable answering query_inference_endpoint, from
+    (endpoint name, payload, CircuitOpenError), while the breaker is open.
+    on_transition: Optional callable receiving every BreakerTransition.
+    """
+
+    window: float = 30.0
+    min_calls: int = 20
+    failure_rate: float = 0.5
+    slow_call_duration: Optional[float] = None
+    slow_call_rate: float = 0.5
+    open_duration: float = 30.0
+    half_open_calls: int = 3
+    failure_errors: Tuple = (ServerError,)
+    fallback: Optional[Callable[[str, Dict, CircuitOpenError], Dict]] = None
+    on_transition: Optional[Callable[[BreakerTransition], None]] = None
+
+
+class CircuitBreaker:
+    """
+    Closed, open and half-open breaker of the invocations of one endpoint.
+
+    Closed, calls go through and their outcomes are counted in one-tenth of
+    a window buckets. When the failure (or slow call) rate over the window
+    crosses its threshold, the breaker opens and calls fail fast with
+    CircuitOpenError for open_duration seconds. It then lets
+    half_open_calls trial calls through, and closes if they all succeed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: CircuitBreakerConfig = None,
+        transport_errors: Tuple = (),
+        max_transitions: int = 100,
+    ):
+        """
+        Instantiates a CircuitBreaker. Parameters.
+
+        name: Label of the breaker, e.g. the endpoint's URL.
+        config: CircuitBreakerConfig.
+        transport_errors: Connection and timeout errors of the HTTP library,
+        counted as failures.
+        max_transitions: Number of recent transitions kept.
+        """
+        self.name = name
+        self.config = config or CircuitBreakerConfig()
+        self.failures = tuple(self.config.failure_errors) + tuple(transport_errors)
+        self.state = CLOSED
+        self.transitions: Deque[BreakerTransition] = deque(maxlen=max_transitions)
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._generation = 0
+        self._trials = 0
+        self._trial_successes = 0
+        self._bucket_width = self.config.window / 10
+        self._buckets: Deque[List] = deque()
+        # Reentrant so that on_transition may read the breaker's snapshot.
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def call(self):
+        """
+        Context manager around one invocation: raises CircuitOpenError
+        instead of entering it while open, and records its outcome.
+        """
+
+        generation = self.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.record(generation, time.monotonic() - start, e)
+            raise
+        self.record(generation, time.monotonic() - start)
+
+    def acquire(self) -> int:
+        """
+        Lets a call through or raises CircuitOpenError. Returns the token to
+        pass to record().
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN:
+                reopen = self._opened_at + self.config.open_duration
+                if now < reopen:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"Circuit breaker of {self.name} is open",
+                        self.name,
+                        reopen - now,
+                    )
+                self._transition(HALF_OPEN, "open duration elapsed")
+            if self.state == HALF_OPEN:
+                if self._trials >= self.config.half_open_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"Circuit breaker of {self.name} is half-open", self.name
+                    )
+                self._trials += 1
+            return self._generation
+
+    def record(self, generation: int, latency: float, error: BaseException = None):
+        """
+        Records the outcome of a call let through by acquire().
+        """
+
+        failed = isinstance(error, self.failures)
+        slow = (
+            self.config.slow_call_duration is not None
+            and latency > self.config.slow_call_duration
+        )
+        # Cancellations and errors raised before the endpoint answered say
+        # nothing about its health.
+        ignored = error is not None and not (
+            failed or isinstance(error, EndpointClientError)
+        )
+        with self._lock:
+            if generation != self._generation:
+                return
+            if self.state == HALF_OPEN:
+                if ignored:
+                    self._trials -= 1
+                elif failed or slow:
+                    self._open("trial call " + ("failed" if failed else "too slow"))
+                else:
+                    self._trial_successes += 1
+                    if self._trial_successes >= self.config.half_open_calls:
+                        self._buckets.clear()
+                        self._transition(CLOSED, "trial calls succeeded")
+                return
+            if ignored:
+                return
+            self._count(time.monotonic(), failed, slow)
+            reason = self._breached()
+            if reason is not None:
+                self._open(reason)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            calls, failures, slow = self._totals(time.monotonic())
+            return {
+                "state": self.state,
+                "calls": calls,
+                "failures": failures,
+                "slow_calls": slow,
+                "rejected": self.rejected,
+                "transitions": [t.__dict__ for t in self.transitions],
+            }
+
+    def _count(self, now: float, failed: bool, slow: bool):
+        self._prune(now)
+        if not self._buckets or now - self._buckets[-1][0] >= self._bucket_width:
+            self._buckets.append([now, 0, 0, 0])
+        bucket = self._buckets[-1]
+        bucket[1] += 1
+        bucket[2] += failed
+        bucket[3] += slow
+
+    def _prune(self, now: float):
+        while self._buckets and self._buckets[0][0] <= now - self.config.window:
+            self._buckets.popleft()
+
+    def _totals(self, now: float) -> Tuple[int, int, int]:
+        self._prune(now)
+        calls = sum(b[1] for b in self._buckets)
+        failures = sum(b[2] for b in self._buckets)
+        slow = sum(b[3] for b in self._buckets)
+        return calls, failures, slow
+
+    def _breached(self) -> Optional[str]:
+        calls, failures, slow = self._totals(time.monotonic())
+        if calls < self.config.min_calls:
+            return None
+        if failures / calls >= self.config.failure_rate:
+            return f"{failures}/{calls} calls failed"
+        if (
+            self.config.slow_call_duration is not None
+            and slow / calls >= self.config.slow_call_rate
+        ):
+            return (
+                f"{slow}/{calls} calls slower than "
+                f"{self.config.slow_call_duration}s"
+            )
+        return None
+
+    def _open(self, reason: str):
+        self._opened_at = time.monotonic()
+        self._transition(OPEN, reason)
+
+    def _transition(self, state: str, reason: str):
+        # Called with the lock held. The generation makes the outcomes of
+        # calls let through in the previous state count for nothing.
+        transition = BreakerTransition(
+            time.time(), self.name, self.state, state, reason
+        )
+        self.state = state
+        self._generation += 1
+        self._trials = self._trial_successes = 0
+        self.transitions.append(transition)
+        logger.log(
+            logging.WARNING if state == OPEN else logging.INFO,
+            "Circuit breaker of %s: %s -> %s (%s)",
+            self.name,
+            transition.from_state,
+            state,
+            reason,
+        )
+        if self.config.on_transition is not None:
+            try:
+                self.config.on_transition(transition)
+            except Exception:
+                logger.exception("Circuit breaker transition hook failed")
@@ -1,7 +1,80 @@
-import json
-from typing import List, Dict
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, Iterator, List, Dict, Sequence, Tuple
 import requests
+from databricks.model_serving.batching import (
+    DEFAULT_MAX_ROWS,
+    DEFAULT_MAX_WORKERS,
+    BulkResult,
+    chunk_predictions,
+    chunk_records,
+    merge_chunk,
+)
+from databricks.model_serving.cache import PredictionCache
+from databricks.model_serving.circuit import CircuitBreaker, CircuitBreakerConfig
+from databricks.model_serving.codec import JsonCodec, default_codec
+from databricks.model_serving.compression import Compression, accept_encoding
+from databricks.model_serving.concurrency import AdaptiveLimiter, AIMDConfig
 from databricks.model_serving.endpoint import Endpoint
+from databricks.model_serving.events import (
+    DEFAULT_MAX_INTERVAL as DEFAULT_EVENTS_MAX_INTERVAL,
+    DEFAULT_POLL_INTERVAL as DEFAULT_EVENTS_POLL_INTERVAL,
+    watch_events,
+)
+from databricks.model_serving.exceptions import (
+    CircuitOpenError,
+    EndpointClientError,
+    ServiceUnavailableError,
+    ThrottledError,
+    raise_api_error,
+)
+from databricks.model_serving.fleet import (
+    DEFAULT_MAX_CONCURRENCY,
+    EndpointOperation,
+    FleetResult,
+    run_operations,
+)
+from databricks.model_serving.hedging import HedgeTimer, Hedger, HedgingConfig
+from databricks.model_serving.logs import (
+    BUILD_LOGS,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_WINDOW,
+    SERVER_LOGS,
+    tail_logs,
+)
+from databricks.model_serving.metadata import LIST_KEY, MetadataCache, endpoint_key
+from databricks.model_serving.metrics import SERVED_MODEL_HEADER, RequestTiming
+from databricks.model_serving.reconcile import ReconcilePlan, plan_reconcile
+from databricks.model_serving.retry import RetryPolicy
+from databricks.model_serving.shadow import ShadowMirror
+from databricks.model_serving.transport import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_READ_TIMEOUT,
+    ZSTD_RESPONSES,
+    RequestAbort,
+    RequestAborted,
+    abortable,
+    check_aborted,
+    connect_time,
+    create_session,
+    reset_connect_time,
+)
+from databricks.model_serving.waiter import (
+    DEFAULT_MAX_DELAY,
+    DEFAULT_WAIT_TIMEOUT,
+    UNTIL_CONFIG_UPDATED,
+    UNTIL_READY,
+    WaitResult,
+    wait_for_endpoints,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class EndpointClient:
@@ -10,19 +83,124 @@ class EndpointClient:
     Inference Endpoints.
     """
 
-    def __init__(self, base_url: str, token: str):
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        session: requests.Session = None,
+        codec: JsonCodec = None,
+        retry_policy: RetryPolicy = None,
+        adaptive_concurrency: AIMDConfig = None,
+        prediction_cache: PredictionCache = None,
+        metadata_cache: MetadataCache = None,
+        request_hooks: List[Callable[[RequestTiming], None]] = None,
+        hedging: HedgingConfig = None,
+        compression: Compression = None,
+        circuit_breaker: CircuitBreakerConfig = None,
+    ):
         """
         Instantiates an EndpointClient. Parameters.
 
         base_url: A string pointing to your workspace URL.
         token: Access Token for interacting with your Databricks Workspace.
+        pool_connections: Number of per-host connection pools to cache.
+        pool_maxsize: Maximum number of keep-alive connections per host.
+        connect_timeout: Seconds to wait for a TCP/TLS connection.
+        read_timeout: Seconds to wait for the server to send a response.
+        session: Optional requests.Session to share between clients. When
+        omitted, the client creates (and owns) a pooled session of its own.
+        codec: JSON codec used for request and response bodies. Defaults to
+        the standard library; pass an OrjsonCodec to use orjson.
+        retry_policy: Retry behaviour of the REST helpers. By default GET and
+        DELETE calls are retried on throttling, 5xx and connection errors,
+        and invocations are not.
+        adaptive_concurrency: When set, invocations of each endpoint go
+        through an AIMD limiter that searches for the highest in-flight
+        count the endpoint sustains without throttling or slowing down.
+        prediction_cache: Optional PredictionCache. When set, identical
+        payloads (and, for bulk requests, identical rows) sent to the same
+        served-model config are answered from memory.
+        metadata_cache: Optional MetadataCache for get_inference_endpoint and
+        list_inference_endpoints. Creating, updating or deleting an endpoint
+        through this client invalidates its entries.
+        request_hooks: Callables receiving a RequestTiming after every HTTP
+        request (each retry attempt included), e.g. a MetricsRegistry.
+        Exceptions raised by hooks are logged and ignored. Connect times are
+        measured on sessions mounting a TimedHTTPAdapter, as created ones do.
+        hedging: Opt-in hedging of query_inference_endpoint calls. A call
+        still unanswered after the endpoint's recent p95 (by default) latency
+        is duplicated and the first answer wins, within a budget of extra
+        requests. The losing request is aborted, closing its connection, on
+        sessions mounting a TimedHTTPAdapter, as created ones do. The
+        endpoint may still score it: only enable hedging when scoring a
+        payload twice is harmless.
+        compression: Optional Compression of request bodies above a size
+        threshold. Compressed responses are always accepted and decoded.
+        circuit_breaker: Opt-in circuit breaker per endpoint. Once too many
+        recent invocations failed (or were slow), invocations fail fast with
+        CircuitOpenError, or are answered by its fallback, until trial calls
+        succeed again. See circuit_breakers() for their states.
         """
         self.base_url = base_url
         self.token = token
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
+            "Accept-Encoding": accept_encoding(ZSTD_RESPONSES),
         }
+        self.timeout = (connect_timeout, read_timeout)
+        self._owns_session = session is None
+        if session is None:
+            session = create_session(
+                pool_connections=pool_connections, pool_maxsize=pool_maxsize
+            )
+        self.session = session
+        self.codec = codec if codec is not None else default_codec()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.adaptive_concurrency = adaptive_concurrency
+        self.limiters: Dict[str, AdaptiveLimiter] = {}
+        self._limiters_lock = threading.Lock()
+        self.prediction_cache = prediction_cache
+        self.metadata_cache = metadata_cache
+        self.request_hooks = list(request_hooks or [])
+        self.hedging = hedging
+        self.compression = compression
+        self.hedgers: Dict[str, Hedger] = {}
+        self._hedge_executor = None
+        self._hedge_timer = None
+        self._hedge_slots = (
+            threading.BoundedSemaphore(hedging.max_workers) if hedging else None
+        )
+        self.shadows: Dict[str, ShadowMirror] = {}
+        self.circuit_breaker = circuit_breaker
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def close(self):
+        """
+        Closes the pooled connections, unless the session was passed in.
+        Shadow mirrors are stopped once their queued payloads are sent.
+        """
+
+        for endpoint_name in list(self.shadows):
+            self.remove_shadow(endpoint_name)
+        if self._hedge_timer is not None:
+            self._hedge_timer.close()
+            self._hedge_timer = None
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def create_inference_endpoint(
         self, endpoint_name: str, served_models: List[str], traffic_config: Dict = None
@@ -51,23 +229,38 @@ class EndpointClient:
         if traffic_config is not None:
             config_dict["traffic_config"] = traffic_config
         data = {"name": endpoint_name, "config": config_dict}
-        return self._post(uri=Endpoint.SERVING.value, body=data)
+        try:
+            return self._post(uri=Endpoint.SERVING.value, body=data)
+        finally:
+            self.invalidate_metadata(endpoint_name)
 
-    def get_inference_endpoint(self, endpoint_name: str) -> Dict:
+    def get_inference_endpoint(self, endpoint_name: str, refresh: bool = False) -> Dict:
         """
         Gets info on the inference endpoint.
 
         endpoint_name: Serving endpoint name.
+        refresh: Bypass (and refresh) the metadata cache, if any.
         """
 
-        return self._get(f"{Endpoint.SERVING.value}/{endpoint_name}")
+        uri = f"{Endpoint.SERVING.value}/{endpoint_name}"
+        if self.metadata_cache is None:
+            return self._get(uri)
+        return self.metadata_cache.get(
+            endpoint_key(endpoint_name), lambda: self._get(uri), refresh=refresh
+        )
 
-    def list_inference_endpoints(self) -> Dict:
+    def list_inference_endpoints(self, refresh: bool = False) -> Dict:
         """
         Lists all running inference endpoints.
+
+        refresh: Bypass (and refresh) the metadata cache, if any.
         """
 
-        return self._get(Endpoint.SERVING.value)
+        if self.metadata_cache is None:
+            return self._get(Endpoint.SERVING.value)
+        return self.metadata_cache.get(
+            LIST_KEY, lambda: self._get(Endpoint.SERVING.value), refresh=refresh
+        )
 
     def update_served_models(
         self, endpoint_name: str, served_models: List[str], traffic_config: Dict = None
@@ -94,7 +287,10 @@ class EndpointClient:
         config_dict = {"served_models": served_models}
         if traffic_config is not None:
             config_dict["traffic_config"] = traffic_config
-        return self._put(Endpoint.CONFIG.value.format(endpoint_name), config_dict)
+        try:
+            return self._put(Endpoint.CONFIG.value.format(endpoint_name), config_dict)
+        finally:
+            self.invalidate_metadata(endpoint_name)
 
     def delete_inference_endpoint(self, endpoint_name: str) -> Dict:
         """
@@ -103,7 +299,10 @@ class EndpointClient:
         endpoint_name: Serving endpoint name.
         """
 
-        return self._delete(f"{Endpoint.SERVING.value}/{endpoint_name}")
+        try:
+            return self._delete(f"{Endpoint.SERVING.value}/{endpoint_name}")
+        finally:
+            self.invalidate_metadata(endpoint_name)
 
     def query_inference_endpoint(self, endpoint_name: str, data: Dict) -> Dict:
         """
@@ -113,7 +312,450 @@ class EndpointClient:
         data: Payload containing the data expected by the model.
         """
 
-        return self._post(Endpoint.INVOCATIONS.value.format(endpoint_name), data)
+        cache = self.prediction_cache
+        try:
+            if cache is None:
+                return self._query(endpoint_name, data)
+            version = cache.version(endpoint_name, self._config_version)
+            key = cache.key(endpoint_name, data, version)
+            cached = cache.get(key)
+            if cached is not None:
+                return self.codec.loads(cached)
+            response = self._query(endpoint_name, data)
+        except CircuitOpenError as e:
+            if self.circuit_breaker.fallback is None:
+                raise
+            return self.circuit_breaker.fallback(endpoint_name, data, e)
+        cache.put(key, self.codec.dumps(response))
+        return response
+
+    def query_inference_endpoint_bulk(
+        self,
+        endpoint_name: str,
+        records: Sequence,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_bytes: int = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        input_key: str = "dataframe_records",
+        build_payload: Callable[[List], Dict] = None,
+    ) -> BulkResult:
+        """
+        Scores a large record set in concurrent, size-bounded chunks.
+
+        endpoint_name: Serving endpoint name.
+        records: Records to score, e.g. the rows of a dataframe_records payload.
+        max_rows: Maximum number of records sent per request.
+        max_bytes: Optional bound on the encoded size of each request.
+        max_workers: Number of chunks scored concurrently.
+        input_key: Payload key the chunk is sent under, e.g. "inputs".
+        build_payload: Optional function turning a chunk of records into the
+        request payload, for formats such as dataframe_split. It replaces
+        {input_key: chunk}; input_key still namespaces cached rows.
+
+        Returns a BulkResult whose predictions follow the order of records.
+        A failed chunk does not affect the others: its rows get None
+        predictions and the error is reported in BulkResult.failures.
+        """
+
+        cache = self.prediction_cache
+        store = None
+        predictions = [None] * len(records)
+        pending = range(len(records))
+        if cache is not None:
+            version = cache.version(endpoint_name, self._config_version)
+            keys, predictions, pending = cache.lookup_rows(
+                endpoint_name, records, version, input_key, self.codec.loads
+            )
+
+            def store(row, prediction):
+                cache.put(keys[row], self.codec.dumps(prediction))
+
+        pending_records = [records[i] for i in pending]
+        bounds = chunk_records(
+            pending_records,
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+            dumps=self.codec.dumps,
+        )
+        failures = []
+        if build_payload is None:
+
+            def build_payload(chunk):
+                return {input_key: chunk}
+
+        def score(start, stop):
+            response = self._invoke(
+                endpoint_name, build_payload(pending_records[start:stop])
+            )
+            return chunk_predictions(response, stop - start)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(score, start, stop) for start, stop in bounds]
+            for index, ((start, stop), future) in enumerate(zip(bounds, futures)):
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = e
+                merge_chunk(
+                    predictions, failures, index, pending[start:stop], outcome, store
+                )
+        return BulkResult(predictions, failures)
+
+    def wait_until_ready(
+        self,
+        endpoint_name: str,
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> WaitResult:
+        """
+        Waits until the endpoint is READY with no config update in progress.
+
+        endpoint_name: Serving endpoint name.
+        timeout: Seconds to wait before raising WaitTimeoutError.
+        max_delay: Ceiling of the backoff between polls, in seconds.
+
+        Returns a WaitResult with the final endpoint, whether it failed and
+        the timeline of observed states. Failure states end the wait early.
+        """
+
+        return wait_for_endpoints(
+            self, [endpoint_name], UNTIL_READY, timeout=timeout, max_delay=max_delay
+        )[endpoint_name]
+
+    def wait_for_config_update(
+        self,
+        endpoint_name: str,
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> WaitResult:
+        """
+        Waits until the endpoint's config update is no longer IN_PROGRESS.
+
+        endpoint_name: Serving endpoint name.
+        timeout: Seconds to wait before raising WaitTimeoutError.
+        max_delay: Ceiling of the backoff between polls, in seconds.
+        """
+
+        return wait_for_endpoints(
+            self,
+            [endpoint_name],
+            UNTIL_CONFIG_UPDATED,
+            timeout=timeout,
+            max_delay=max_delay,
+        )[endpoint_name]
+
+    def run_endpoint_operations(
+        self,
+        operations: Sequence[EndpointOperation],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate: float = None,
+        wait: bool = False,
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> FleetResult:
+        """
+        Creates, updates and deletes many endpoints concurrently.
+
+        operations: EndpointOperations, at most one per endpoint.
+        max_concurrency: Operations in flight at most.
+        rate: Operations started per second at most, None for no limit.
+        wait: Then wait until every created or updated endpoint is READY.
+        timeout: Seconds to wait for the endpoints.
+        max_delay: Ceiling of the backoff between polls, in seconds.
+
+        Returns a FleetResult with the response or error, and the WaitResult,
+        of every endpoint. Failed operations do not stop the others.
+        """
+
+        return run_operations(
+            self,
+            operations,
+            max_concurrency=max_concurrency,
+            rate=rate,
+            wait=wait,
+            timeout=timeout,
+            max_delay=max_delay,
+        )
+
+    def reconcile_endpoints(
+        self,
+        desired: Dict[str, Dict],
+        dry_run: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate: float = None,
+        wait: bool = False,
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+    ) -> ReconcilePlan:
+        """
+        Brings endpoints to a desired state with as few API calls as
+        possible.
+
+        desired: Desired config of each endpoint, by name, e.g.
+        {"my-endpoint": {"served_models": [...], "traffic_config": {...}}}.
+        dry_run: Only plan the changes. ReconcilePlan.format() shows them.
+        max_concurrency, rate, wait, timeout: See run_endpoint_operations.
+
+        The current state is read with a single list_inference_endpoints
+        call, plus a get_inference_endpoint call for each endpoint that
+        seems to differ while its listing leaves out desired fields. Missing
+        endpoints are created, and only endpoints whose config differs are
+        updated, so identical configs trigger no rebuild.
+        """
+
+        listing = self.list_inference_endpoints(refresh=True)
+        plan = plan_reconcile(
+            desired,
+            listing.get("endpoints", []),
+            fetch=lambda name: self.get_inference_endpoint(name, refresh=True),
+        )
+        if not dry_run:
+            plan.result = self.run_endpoint_operations(
+                plan.operations(),
+                max_concurrency=max_concurrency,
+                rate=rate,
+                wait=wait,
+                timeout=timeout,
+            )
+        return plan
+
+    def invalidate_metadata(self, endpoint_name: str = None):
+        """
+        Drops the cached metadata and predictions of an endpoint, or of all
+        endpoints.
+
+        endpoint_name: Serving endpoint name, None for all endpoints.
+        """
+
+        if self.metadata_cache is not None:
+            self.metadata_cache.invalidate(endpoint_name)
+        if self.prediction_cache is not None:
+            self.prediction_cache.invalidate(endpoint_name)
+
+    def _invoke(self, endpoint_name: str, data: Dict) -> Dict:
+        breaker = self._get_breaker(endpoint_name)
+        with breaker.call() if breaker is not None else nullcontext():
+            return self._post(
+                Endpoint.INVOCATIONS.value.format(endpoint_name),
+                data,
+                retry=self.retry_policy.retry_invocations,
+                limiter=self._get_limiter(endpoint_name),
+            )
+
+    def _query(self, endpoint_name: str, data: Dict) -> Dict:
+        shadow = self.shadows.get(endpoint_name)
+        start = time.monotonic()
+        if self.hedging is None:
+            response = self._invoke(endpoint_name, data)
+        else:
+            response = self._invoke_hedged(endpoint_name, data)
+        if shadow is not None:
+            shadow.offer(data, response, time.monotonic() - start)
+        return response
+
+    def _invoke_hedged(self, endpoint_name: str, data: Dict) -> Dict:
+        hedger = self._get_hedger(endpoint_name)
+        delay = hedger.start()
+        start = time.monotonic()
+        if delay is None:
+            response = self._invoke(endpoint_name, data)
+            hedger.observe(time.monotonic() - start)
+            return response
+
+        # The request is sent from this thread, and the hedge, if the delay
+        # elapses first, from the pool. The first answer aborts the other
+        # request, so that neither holds a thread and a connection for long.
+        primary, secondary = RequestAbort(), RequestAbort()
+        lock = threading.Lock()
+        call = {"done": False, "hedge": None}
+
+        def settle() -> bool:
+            # Returns whether the calling side answered first.
+            with lock:
+                first = not call["done"]
+                call["done"] = True
+                return first
+
+        def send_hedge():
+            try:
+                with abortable(secondary):
+                    hedge_start = time.monotonic()
+                    response = self._invoke(endpoint_name, data)
+                hedger.observe(time.monotonic() - hedge_start)
+                if settle():
+                    hedger.hedge_won()
+                    primary.abort()
+                return response
+            finally:
+                self._hedge_slots.release()
+
+        def start_hedge():
+            with lock:
+                if call["done"]:
+                    return
+                capacity = self._hedge_slots.acquire(blocking=False)
+                if not hedger.try_hedge(capacity):
+                    if capacity:
+                        self._hedge_slots.release()
+                    return
+                call["hedge"] = self._get_hedge_executor().submit(send_hedge)
+
+        timer = self._get_hedge_timer()
+        entry = timer.schedule(delay, start_hedge)
+        try:
+            with abortable(primary):
+                response = self._invoke(endpoint_name, data)
+        except Exception as error:
+            timer.cancel(entry)
+            with lock:
+                hedge = call["hedge"]
+                call["done"] = call["done"] or hedge is None
+            if hedge is None:
+                raise
+            if isinstance(error, RequestAborted):
+                # Beaten by the hedge: its latency is at least this long.
+                hedger.observe(time.monotonic() - start)
+            try:
+                return hedge.result()
+            except Exception:
+                raise error
+        except BaseException:
+            timer.cancel(entry)
+            settle()
+            secondary.abort()
+            raise
+        timer.cancel(entry)
+        hedger.observe(time.monotonic() - start)
+        if settle():
+            secondary.abort()
+        return response
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._limiters_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.hedging.max_workers,
+                    thread_name_prefix="hedging",
+                )
+            return self._hedge_executor
+
+    def _get_hedge_timer(self) -> HedgeTimer:
+        with self._limiters_lock:
+            if self._hedge_timer is None:
+                self._hedge_timer = HedgeTimer()
+            return self._hedge_timer
+
+    def _get_hedger(self, endpoint_name: str) -> Hedger:
+        with self._limiters_lock:
+            if endpoint_name not in self.hedgers:
+                self.hedgers[endpoint_name] = Hedger(self.hedging)
+            return self.hedgers[endpoint_name]
+
+    def _config_version(self, endpoint_name: str):
+        try:
+            endpoint = self.get_inference_endpoint(endpoint_name)
+        except EndpointClientError:
+            return None
+        return endpoint.get("config", {}).get("config_version")
+
+    def concurrency_limits(self) -> Dict[str, Dict]:
+        """
+        Returns the adaptive concurrency limit, in-flight count and limit
+        history of every endpoint queried so far.
+        """
+
+        with self._limiters_lock:
+            limiters = dict(self.limiters)
+        return {name: limiter.snapshot() for name, limiter in limiters.items()}
+
+    def hedging_stats(self) -> Dict[str, Dict]:
+        """
+        Returns the hedging delay and the request, hedge and hedge win
+        counts of every endpoint queried so far.
+        """
+
+        with self._limiters_lock:
+            hedgers = dict(self.hedgers)
+        return {name: hedger.snapshot() for name, hedger in hedgers.items()}
+
+    def add_shadow(
+        self, endpoint_name: str, candidate_endpoint: str, **options
+    ) -> ShadowMirror:
+        """
+        Mirrors a sample of the query_inference_endpoint calls of an endpoint
+        to a candidate endpoint, in the background, and returns the
+        ShadowMirror recording the latency and output differences.
+
+        endpoint_name: Primary serving endpoint name.
+        candidate_endpoint: Endpoint receiving the mirrored payloads.
+        options: ShadowMirror parameters (sample_rate, queue_size, workers,
+        max_records, tolerance, keep_payloads, sink).
+
+        Primary responses are returned as usual: payloads are only queued,
+        and dropped when the bounded queue is full. Cache hits are not
+        mirrored.
+        """
+
+        mirror = ShadowMirror(self, endpoint_name, candidate_endpoint, **options)
+        with self._limiters_lock:
+            previous = self.shadows.get(endpoint_name)
+            self.shadows[endpoint_name] = mirror
+        if previous is not None:
+            previous.close()
+        return mirror
+
+    def remove_shadow(self, endpoint_name: str, wait: bool = True) -> ShadowMirror:
+        """
+        Stops mirroring an endpoint and returns its ShadowMirror, None when
+        it was not mirrored. wait: Send the queued payloads first.
+        """
+
+        with self._limiters_lock:
+            mirror = self.shadows.pop(endpoint_name, None)
+        if mirror is not None:
+            mirror.close(wait=wait)
+        return mirror
+
+    def shadow_stats(self) -> Dict[str, Dict]:
+        """
+        Returns the mirrored, dropped, matching and failed call counts and
+        the latency histograms of every mirrored endpoint.
+        """
+
+        with self._limiters_lock:
+            shadows = dict(self.shadows)
+        return {name: mirror.stats() for name, mirror in shadows.items()}
+
+    def circuit_breakers(self) -> Dict[str, Dict]:
+        """
+        Returns the state, recent call, failure and rejection counts and
+        the recent state transitions of every endpoint's circuit breaker.
+        """
+
+        with self._limiters_lock:
+            breakers = dict(self.breakers)
+        return {name: breaker.snapshot() for name, breaker in breakers.items()}
+
+    def _get_breaker(self, endpoint_name: str) -> CircuitBreaker:
+        if self.circuit_breaker is None:
+            return None
+        with self._limiters_lock:
+            if endpoint_name not in self.breakers:
+                self.breakers[endpoint_name] = CircuitBreaker(
+                    f"{self.base_url}/{endpoint_name}",
+                    self.circuit_breaker,
+                    (requests.ConnectionError, requests.Timeout),
+                )
+            return self.breakers[endpoint_name]
+
+    def _get_limiter(self, endpoint_name: str) -> AdaptiveLimiter:
+        if self.adaptive_concurrency is None:
+            return None
+        with self._limiters_lock:
+            if endpoint_name not in self.limiters:
+                self.limiters[endpoint_name] = AdaptiveLimiter(
+                    self.adaptive_concurrency
+                )
+            return self.limiters[endpoint_name]
 
     # Debugging
 
@@ -142,9 +784,50 @@ class EndpointClient:
         """
 
         served_models_path = Endpoint.SERVED_MODELS.value.format(endpoint_name)
-        server_logs_path = f"{served_model_name}/build-logs"
+        server_logs_path = f"{served_model_name}/logs"
         return self._get(f"{served_models_path}/{server_logs_path}")
 
+    def tail_served_model_logs(
+        self,
+        endpoint_name: str,
+        served_model_name: str,
+        logs: str = SERVER_LOGS,
+        follow: bool = False,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        window: int = DEFAULT_WINDOW,
+        timeout: float = None,
+    ) -> Iterator[str]:
+        """
+        Yields the lines of the server or build logs of a served model, and
+        with follow, only the lines added since the previous poll.
+
+        endpoint_name: Serving endpoint name.
+        served_model_name: Served model name.
+        logs: SERVER_LOGS or BUILD_LOGS.
+        follow: Keep polling for new lines, backing off up to max_interval
+        while the log is idle, until timeout or the caller stops iterating.
+        poll_interval: Seconds between polls while lines keep coming.
+        max_interval: Ceiling of the polling interval.
+        window: Number of recent lines kept to tell new lines from seen ones.
+        timeout: Seconds after which following stops.
+        """
+
+        if logs == SERVER_LOGS:
+            get = self.get_served_model_server_logs
+        elif logs == BUILD_LOGS:
+            get = self.get_served_model_build_logs
+        else:
+            raise ValueError(f"Unknown logs: {logs}")
+        return tail_logs(
+            lambda: get(endpoint_name, served_model_name).get("logs", ""),
+            follow=follow,
+            poll_interval=poll_interval,
+            max_interval=max_interval,
+            window=window,
+            timeout=timeout,
+        )
+
     def get_inference_endpoint_events(self, endpoint_name: str) -> Dict:
         """
         Gets the build endpoint events for the specified endpoint.
@@ -153,43 +836,184 @@ class EndpointClient:
         """
         return self._get(Endpoint.EVENTS.value.format(endpoint_name))
 
+    def watch_inference_endpoint_events(
+        self,
+        endpoint_names: Sequence[str],
+        served_model_names: Sequence[str] = None,
+        event_types: Sequence[str] = None,
+        since: int = None,
+        follow: bool = True,
+        poll_interval: float = DEFAULT_EVENTS_POLL_INTERVAL,
+        max_interval: float = DEFAULT_EVENTS_MAX_INTERVAL,
+        timeout: float = None,
+    ) -> Iterator[Dict]:
+        """
+        Yields the events of one or more endpoints that were not yielded
+        before, polling every endpoint from the calling thread.
+
+        endpoint_names: Serving endpoint name, or a list of them.
+        served_model_names: Only yield events of these served models.
+        event_types: Only yield events of these types.
+        since: Skip events at or before this timestamp, in milliseconds.
+        follow: Keep polling for new events until timeout or the caller
+        stops iterating. Otherwise yield the current events and return.
+        poll_interval: Seconds between polls of an endpoint with new events.
+        max_interval: Ceiling of the polling interval of an idle endpoint.
+        timeout: Seconds after which watching stops.
+        """
+
+        if isinstance(endpoint_names, str):
+            endpoint_names = [endpoint_names]
+        return watch_events(
+            lambda name: self.get_inference_endpoint_events(name).get("events", []),
+            endpoint_names,
+            served_model_names=served_model_names,
+            event_types=event_types,
+            since=since,
+            follow=follow,
+            poll_interval=poll_interval,
+            max_interval=max_interval,
+            timeout=timeout,
+        )
+
     # REST API methods
     def _get(self, uri) -> Dict:
-        url = f"{self.base_url}/{uri}"
-        response = requests.request("GET", url=url, headers=self.headers)
-        return self._handle_api_error(response)
-
-    def _post(self, uri, body) -> Dict:
-        json_body = json.dumps(body)
-        url = f"{self.base_url}/{uri}"
-        response = requests.request(
-            "POST", url=url, headers=self.headers, data=json_body
-        )
-        return self._handle_api_error(response)
+        return self._request("GET", uri)
+
+    def _post(
+        self, uri, body, retry: bool = None, limiter: AdaptiveLimiter = None
+    ) -> Dict:
+        return self._request("POST", uri, body, retry=retry, limiter=limiter)
 
     def _put(self, uri, body) -> Dict:
-        json_body = json.dumps(body)
-        url = f"{self.base_url}/{uri}"
-        response = requests.request(
-            "PUT", url=url, headers=self.headers, data=json_body
-        )
-        return self._handle_api_error(response)
+        return self._request("PUT", uri, body)
 
     def _delete(self, uri) -> Dict:
-        url = f"{self.base_url}/{uri}"
-        response = requests.request("DELETE", url=url, headers=self.headers)
-        return self._handle_api_error(response)
+        return self._request("DELETE", uri)
+
+    def _request(
+        self,
+        method: str,
+        uri: str,
+        body: Dict = None,
+        retry: bool = None,
+        limiter: AdaptiveLimiter = None,
+    ) -> Dict:
+        if retry is None:
+            retry = self.retry_policy.retries(method)
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return self._attempt(method, uri, body, limiter)
+            except (EndpointClientError, requests.RequestException) as e:
+                if not retry or not self._is_retryable(e):
+                    raise
+                delay = self.retry_policy.delay(
+                    attempt,
+                    time.monotonic() - start,
+                    getattr(e, "retry_after", None),
+                )
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    def _attempt(
+        self, method: str, uri: str, body: Dict, limiter: AdaptiveLimiter
+    ) -> Dict:
+        if limiter is None:
+            return self._send(method, uri, body)
+        start = limiter.acquire()
+        throttled = dropped = False
+        try:
+            return self._send(method, uri, body)
+        except (ThrottledError, ServiceUnavailableError):
+            throttled = True
+            raise
+        except Exception:
+            dropped = True
+            raise
+        finally:
+            limiter.release(start, throttled=throttled, dropped=dropped)
+
+    def _send(self, method: str, uri: str, body: Dict = None) -> Dict:
+        # Requests of a hedged call may be aborted by the other one, see
+        # RequestAbort; they then raise RequestAborted.
+        check_aborted()
+        try:
+            if self.request_hooks:
+                return self._send_timed(method, uri, body)
+            url = f"{self.base_url}/{uri}"
+            json_body, headers = self._encode(body)
+            response = self.session.request(
+                method, url=url, headers=headers, data=json_body, timeout=self.timeout
+            )
+            return self._handle_api_error(response)
+        except requests.RequestException:
+            check_aborted()
+            raise
+
+    def _send_timed(self, method: str, uri: str, body: Dict = None) -> Dict:
+        timing = RequestTiming(method, uri)
+        start = time.perf_counter()
+        try:
+            json_body, headers = self._encode(body)
+            timing.request_bytes = len(json_body) if json_body else 0
+            sent = time.perf_counter()
+            timing.serialize = sent - start
+            reset_connect_time()
+            response = self.session.request(
+                method,
+                url=f"{self.base_url}/{uri}",
+                headers=headers,
+                data=json_body,
+                timeout=self.timeout,
+                stream=True,
+            )
+            received = time.perf_counter()
+            timing.ttfb = received - sent
+            timing.connect = connect_time()
+            timing.status_code = response.status_code
+            timing.served_model_name = response.headers.get(SERVED_MODEL_HEADER)
+            timing.response_bytes = len(response.content)
+            read = time.perf_counter()
+            timing.transfer = read - received
+            try:
+                return self._handle_api_error(response)
+            finally:
+                timing.deserialize = time.perf_counter() - read
+        except Exception as e:
+            timing.error = type(e).__name__
+            raise
+        finally:
+            timing.total = time.perf_counter() - start
+            self._emit(timing)
+
+    def _emit(self, timing: RequestTiming):
+        for hook in self.request_hooks:
+            try:
+                hook(timing)
+            except Exception:
+                logger.exception("Request hook %r failed", hook)
+
+    def _encode(self, body: Dict = None) -> Tuple[bytes, Dict[str, str]]:
+        json_body = self.codec.dumps(body) if body is not None else None
+        if self.compression is None:
+            return json_body, self.headers
+        json_body, encoding = self.compression.compress(json_body)
+        if encoding is None:
+            return json_body, self.headers
+        return json_body, {**self.headers, "Content-Encoding": encoding}
+
+    def _is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        return self.retry_policy.is_retryable(error)
 
     def _handle_api_error(self, response):
         if response.status_code == requests.codes.ok:
-            return response.json()
-        elif response.status_code == requests.codes.bad_request:
-            raise Exception(f"Bad request: {response.text}")
-        elif response.status_code == requests.codes.unauthorized:
-            raise Exception(f"Unauthorized: {response.text}")
-        elif response.status_code == requests.codes.not_found:
-            raise Exception(f"Not found: {response.text}")
-        elif response.status_code == requests.codes.internal_server_error:
-            raise Exception(f"Internal server error: {response.text}")
-        else:
-            raise Exception(f"Unhandled error: {response.text}")
+            return self.codec.loads(response.content)
+        raise_api_error(
+            response.status_code, response.text, response.headers.get("Retry-After")
+        )
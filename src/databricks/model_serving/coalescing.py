@@ -0,0 +1,213 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from databricks.model_serving.metrics import LATENCY_BUCKETS, Histogram
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_DELAY = 0.005
+DEFAULT_MAX_CONCURRENT_BATCHES = 4
+
+
+@dataclass
+class _Pending:
+    record: Any
+    future: Future
+    enqueued: float
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-record requests to an endpoint into batched
+    invocations.
+
+    Records submitted for the same endpoint are queued until max_batch_size
+    of them are waiting or the oldest has waited max_delay seconds, then sent
+    together through query_inference_endpoint_bulk. Each caller gets a
+    Future resolved with its own prediction, or with the error of the
+    invocation that carried its record.
+
+    While max_concurrent_batches are in flight no batch is cut: records keep
+    queuing, so that the next batch is fuller instead of waiting for a slot.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_concurrent_batches: int = DEFAULT_MAX_CONCURRENT_BATCHES,
+        input_key: str = "dataframe_records",
+    ):
+        """
+        Instantiates a MicroBatcher. Parameters.
+
+        client: EndpointClient sending the batches.
+        max_batch_size: Maximum number of records per invocation.
+        max_delay: Longest time, in seconds, a record waits for others to
+        join its batch. This is the latency cost of batching at low load.
+        max_concurrent_batches: Batches in flight at once, across endpoints.
+        input_key: Payload key the batched records are sent under.
+        """
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.input_key = input_key
+        self.batches = 0
+        self.records = 0
+        sizes = [1]
+        while sizes[-1] < max_batch_size:
+            sizes.append(min(sizes[-1] * 2, max_batch_size))
+        self.batch_sizes = Histogram(sizes)
+        self.queue_delays = Histogram(LATENCY_BUCKETS)
+        self._queues: Dict[str, List[_Pending]] = {}
+        self._free_slots = max_concurrent_batches
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches, thread_name_prefix="micro-batch"
+        )
+        self._thread = None
+        self._closed = False
+
+    def submit(self, endpoint_name: str, record: Any) -> Future:
+        """
+        Queues a record, e.g. one dataframe_records row, and returns the
+        Future of its prediction.
+        """
+
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            queue = self._queues.setdefault(endpoint_name, [])
+            queue.append(_Pending(record, future, time.monotonic()))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="micro-batch-dispatcher", daemon=True
+                )
+                self._thread.start()
+            # The dispatcher only needs waking up to start a new deadline or
+            # to send a batch that just filled up.
+            if len(queue) == 1 or len(queue) >= self.max_batch_size:
+                self._condition.notify()
+        return future
+
+    def predict(self, endpoint_name: str, record: Any, timeout: float = None) -> Any:
+        """
+        Submits a record and waits for its prediction.
+        """
+
+        return self.submit(endpoint_name, record).result(timeout)
+
+    def stats(self) -> Dict:
+        """
+        Batch count, record count, and the distributions of batch sizes and
+        of the time records spent queued.
+        """
+
+        with self._condition:
+            return {
+                "batches": self.batches,
+                "records": self.records,
+                "batch_size": self.batch_sizes.to_dict(),
+                "queue_delay": self.queue_delays.to_dict(),
+            }
+
+    def close(self):
+        """
+        Sends the records still queued and waits for every batch to finish.
+        """
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wake = None
+                dispatched = False
+                # Oldest records first, for fairness when slots are scarce.
+                queues = sorted(
+                    ((name, queue) for name, queue in self._queues.items() if queue),
+                    key=lambda item: item[1][0].enqueued,
+                )
+                for endpoint_name, queue in queues:
+                    if not self._free_slots:
+                        # A finishing batch notifies the condition.
+                        wake = None
+                        break
+                    deadline = queue[0].enqueued + self.max_delay
+                    if (
+                        len(queue) >= self.max_batch_size
+                        or deadline <= now
+                        or self._closed
+                    ):
+                        batch = queue[: self.max_batch_size]
+                        del queue[: self.max_batch_size]
+                        self._dispatch(endpoint_name, batch, now)
+                        dispatched = True
+                    elif wake is None or deadline < wake:
+                        wake = deadline
+                if dispatched:
+                    continue
+                if self._closed and not queues:
+                    return
+                self._condition.wait(None if wake is None else wake - now)
+
+    def _dispatch(self, endpoint_name: str, batch: List[_Pending], now: float):
+        # Callers may have cancelled their futures while queued.
+        batch = [p for p in batch if p.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self.batches += 1
+        self.records += len(batch)
+        self.batch_sizes.observe(len(batch))
+        for pending in batch:
+            self.queue_delays.observe(now - pending.enqueued)
+        self._free_slots -= 1
+        self._executor.submit(self._send, endpoint_name, batch)
+
+    def _send(self, endpoint_name: str, batch: List[_Pending]):
+        try:
+            self._invoke(endpoint_name, batch)
+        finally:
+            with self._condition:
+                self._free_slots += 1
+                self._condition.notify()
+
+    def _invoke(self, endpoint_name: str, batch: List[_Pending]):
+        try:
+            result = self.client.query_inference_endpoint_bulk(
+                endpoint_name,
+                [pending.record for pending in batch],
+                max_rows=len(batch),
+                max_workers=1,
+                input_key=self.input_key,
+            )
+        except Exception as e:
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+        errors = {}
+        for failure in result.failures:
+            for row in failure.rows:
+                errors[row] = failure.error
+        for row, pending in enumerate(batch):
+            if row in errors:
+                pending.future.set_exception(errors[row])
+            else:
+                pending.future.set_result(result.predictions[row])
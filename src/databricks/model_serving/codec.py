@@ -0,0 +1,75 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class JsonCodec(ABC):
+    """
+    Serializes request bodies to bytes and deserializes response bodies.
+
+    Subclass this (or pass any object with the same two methods) to plug a
+    different JSON implementation into EndpointClient.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        pass
+
+
+class StdlibJsonCodec(JsonCodec):
+    """
+    Codec based on the standard library json module.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Codec based on orjson, which encodes straight to bytes and natively
+    serializes NumPy arrays and scalars.
+
+    Its output differs from StdlibJsonCodec's: NaN and infinities become
+    null instead of NaN and Infinity, and integers beyond 64 bits are
+    rejected.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson: pip install orjson")
+        self._option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, option=self._option)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+def default_codec() -> JsonCodec:
+    """
+    Returns the codec clients use unless given one: a StdlibJsonCodec, so
+    that installing orjson never changes what is sent. Pass an OrjsonCodec
+    to opt in.
+    """
+
+    return StdlibJsonCodec()
@@ -0,0 +1,103 @@
+import gzip
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        from backports import zstd as _zstd
+    except ImportError:
+        _zstd = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+DEFAULT_COMPRESSION_THRESHOLD = 4096
+# gzip's default level 6 costs several times the CPU of level 1 for ~25%
+# fewer bytes, which only pays off on very slow links (see
+# benchmarks/bench_compression.py).
+DEFAULT_LEVELS = {GZIP: 1, ZSTD: 3}
+
+
+def zstd_available() -> bool:
+    return _zstd is not None or zstandard is not None
+
+
+def _zstd_compress(data: bytes, level: int) -> bytes:
+    if _zstd is not None:
+        return _zstd.compress(data, level=level)
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def zstd_decompress(data: bytes) -> bytes:
+    if _zstd is not None:
+        return _zstd.decompress(data)
+    return zstandard.ZstdDecompressor().decompress(data, max_output_size=1 << 31)
+
+
+@dataclass(frozen=True)
+class Compression:
+    """
+    Request body compression settings.
+
+    algorithm: GZIP, or ZSTD (needs Python 3.14, backports.zstd or
+    zstandard).
+    threshold: Bodies smaller than this many bytes are sent uncompressed,
+    since compressing them costs more time than it saves.
+    level: Compression level, DEFAULT_LEVELS[algorithm] by default. Lower
+    levels are faster and compress less.
+    """
+
+    algorithm: str = GZIP
+    threshold: int = DEFAULT_COMPRESSION_THRESHOLD
+    level: Optional[int] = None
+
+    def __post_init__(self):
+        if self.algorithm not in DEFAULT_LEVELS:
+            raise ValueError(f"Unknown compression algorithm: {self.algorithm}")
+        if self.algorithm == ZSTD and not zstd_available():
+            raise ImportError("zstd compression requires the zstandard package")
+
+    def compress(self, body: bytes) -> Tuple[bytes, Optional[str]]:
+        """
+        Returns the body to send and its Content-Encoding, None when the
+        body is sent as is.
+        """
+
+        if body is None or len(body) < self.threshold:
+            return body, None
+        level = self.level if self.level is not None else DEFAULT_LEVELS[self.algorithm]
+        if self.algorithm == GZIP:
+            return gzip.compress(body, compresslevel=level), GZIP
+        return _zstd_compress(body, level), ZSTD
+
+
+def accept_encoding(zstd_decoding: bool = False) -> str:
+    """
+    Accept-Encoding header value for the encodings the HTTP library can
+    decode. zstd_decoding: Whether it decodes zstd responses.
+    """
+
+    return "gzip, deflate, zstd" if zstd_decoding else "gzip, deflate"
+
+
+DECODERS = {GZIP: gzip.decompress, ZSTD: zstd_decompress}
+
+
+def decoder(content_encoding: Optional[str]) -> Optional[Callable[[bytes], bytes]]:
+    """
+    Decompression function of a Content-Encoding, None for identity.
+    """
+
+    if not content_encoding or content_encoding == "identity":
+        return None
+    try:
+        return DECODERS[content_encoding]
+    except KeyError:
+        raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
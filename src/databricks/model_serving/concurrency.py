@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Tuple
+
+
+@dataclass
+class AIMDConfig:
+    """
+    Settings of an additive-increase/multiplicative-decrease concurrency limit.
+
+    initial_limit: In-flight requests allowed before any feedback.
+    min_limit: The limit never drops below this value.
+    max_limit: The limit never grows above this value.
+    increase: How much the limit grows per fully used window of successes.
+    decrease_factor: Factor applied to the limit on throttling or overload.
+    latency_tolerance: A success slower than this multiple of the baseline
+    (the fastest of the last baseline_window successes) counts as overload.
+    None disables it.
+    latency_threshold: Absolute latency, in seconds, above which a success
+    counts as overload. None disables it.
+    baseline_window: Number of recent latencies the baseline is taken from.
+    history_size: Number of limit changes kept for monitoring.
+    """
+
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 256
+    increase: float = 1.0
+    decrease_factor: float = 0.7
+    latency_tolerance: Optional[float] = 2.0
+    latency_threshold: Optional[float] = None
+    baseline_window: int = 100
+    history_size: int = 1000
+
+
+class _AIMDLimit:
+    """
+    Limit bookkeeping shared by the thread and asyncio limiters.
+    """
+
+    def __init__(self, config: AIMDConfig = None):
+        self.config = config or AIMDConfig()
+        self._limit = float(self.config.initial_limit)
+        self.in_flight = 0
+        self._latencies: Deque[float] = deque(maxlen=self.config.baseline_window)
+        self._last_decrease = float("-inf")
+        self.history: Deque[Tuple[float, int]] = deque(
+            [(time.time(), self.limit)], maxlen=self.config.history_size
+        )
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def snapshot(self) -> dict:
+        """
+        Current limit, in-flight count and limit history, for monitoring.
+        """
+
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "history": list(self.history),
+        }
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < self.limit
+
+    def _on_release(self, start: float, throttled: bool, dropped: bool):
+        now = time.monotonic()
+        saturated = self.in_flight >= self.limit // 2
+        self.in_flight -= 1
+        if dropped:
+            return
+        latency = now - start
+        overloaded = throttled or self._is_overloaded(latency)
+        if not throttled:
+            # Every answered request feeds the baseline, slow ones included,
+            # so that it follows a lasting change of the normal latency
+            # (bigger payloads, a new model version) instead of pinning the
+            # limit to min_limit.
+            self._latencies.append(latency)
+        if overloaded:
+            # Only requests sent after the last decrease may shrink the limit
+            # again, so a burst of throttles costs a single decrease.
+            if start > self._last_decrease:
+                self._last_decrease = now
+                self._set_limit(self._limit * self.config.decrease_factor)
+            return
+        if saturated:
+            self._set_limit(self._limit + self.config.increase / max(self._limit, 1))
+
+    def _is_overloaded(self, latency: float) -> bool:
+        config = self.config
+        if config.latency_threshold is not None and latency > config.latency_threshold:
+            return True
+        if config.latency_tolerance is None or len(self._latencies) < 10:
+            return False
+        return latency > min(self._latencies) * config.latency_tolerance
+
+    def _set_limit(self, value: float):
+        previous = self.limit
+        self._limit = min(
+            float(self.config.max_limit), max(float(self.config.min_limit), value)
+        )
+        if self.limit != previous:
+            self.history.append((time.time(), self.limit))
+
+
+class AdaptiveLimiter(_AIMDLimit):
+    """
+    Thread-safe AIMD limiter on the number of in-flight requests.
+
+    Usage:
+        start = limiter.acquire()
+        ... send the request ...
+        limiter.release(start, throttled=...)
+    """
+
+    def __init__(self, config: AIMDConfig = None):
+        super().__init__(config)
+        self._condition = threading.Condition()
+
+    def acquire(self) -> float:
+        """
+        Blocks until a slot is free and returns the request start time.
+        """
+
+        with self._condition:
+            while not self._has_capacity():
+                self._condition.wait()
+            self.in_flight += 1
+        return time.monotonic()
+
+    def release(self, start: float, throttled: bool = False, dropped: bool = False):
+        """
+        Frees a slot and feeds the outcome back into the limit.
+
+        start: Value returned by acquire.
+        throttled: The endpoint rejected the request as overloaded.
+        dropped: The request failed for an unrelated reason; no feedback.
+        """
+
+        with self._condition:
+            self._on_release(start, throttled, dropped)
+            self._condition.notify_all()
+
+
+class AsyncAdaptiveLimiter(_AIMDLimit):
+    """
+    asyncio flavour of AdaptiveLimiter. Must be used from a single event loop.
+    """
+
+    def __init__(self, config: AIMDConfig = None):
+        super().__init__(config)
+        self._condition = None
+
+    async def acquire(self) -> float:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(self._has_capacity)
+            self.in_flight += 1
+        return time.monotonic()
+
+    async def release(
+        self, start: float, throttled: bool = False, dropped: bool = False
+    ):
+        async with self._condition:
+            self._on_release(start, throttled, dropped)
+            self._condition.notify_all()
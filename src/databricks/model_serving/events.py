@@ -0,0 +1,189 @@
+import heapq
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import requests
+
+from databricks.model_serving.exceptions import (
+    NotFoundError,
+    ServerError,
+    ThrottledError,
+)
+
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 30.0
+DEFAULT_BACKOFF_FACTOR = 2.0
+DEFAULT_LOOKBACK = 60.0
+DEFAULT_MAX_SEEN = 10000
+
+# Errors after which an endpoint is polled again; any other error stops
+# watching.
+TRANSIENT_ERRORS = (
+    ThrottledError,
+    ServerError,
+    requests.ConnectionError,
+    requests.Timeout,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def event_id(event: Dict) -> str:
+    """
+    Identity of an event: its id when the API sends one, otherwise its
+    canonical JSON (timestamp, type, served model and message included).
+    """
+
+    if event.get("id") is not None:
+        return str(event["id"])
+    return json.dumps(event, sort_keys=True, separators=(",", ":"))
+
+
+class EventStream:
+    """
+    Deduplicated view of the events of one endpoint across polls.
+
+    An event is new when its id was not seen before and it is at most
+    lookback seconds older than the newest event seen, so that events
+    landing slightly out of order are not missed while the set of seen ids
+    stays bounded.
+    """
+
+    def __init__(
+        self,
+        endpoint_name: str,
+        served_model_names: Iterable[str] = None,
+        event_types: Iterable[str] = None,
+        since: int = None,
+        lookback: float = DEFAULT_LOOKBACK,
+        max_seen: int = DEFAULT_MAX_SEEN,
+    ):
+        """
+        Instantiates an EventStream. Parameters.
+
+        endpoint_name: Serving endpoint name.
+        served_model_names: Only yield events of these served models.
+        event_types: Only yield events of these types.
+        since: Timestamp, in milliseconds, of the newest event to skip. All
+        existing events are yielded by default.
+        lookback: Seconds before the newest seen event within which late
+        events are still accepted.
+        max_seen: Maximum number of event ids remembered.
+        """
+        self.endpoint_name = endpoint_name
+        self.served_model_names = set(served_model_names or ()) or None
+        self.event_types = set(event_types or ()) or None
+        self.since = since
+        self.newest: Optional[int] = None
+        self.lookback_ms = lookback * 1000
+        self.max_seen = max_seen
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+
+    def update(self, events: Sequence[Dict]) -> List[Dict]:
+        """
+        Returns the events of a poll not returned before, oldest first,
+        that match the filters.
+        """
+
+        new = []
+        floor = None if self.newest is None else self.newest - self.lookback_ms
+        for event in sorted(events, key=lambda e: e.get("timestamp", 0)):
+            timestamp = event.get("timestamp", 0)
+            if self.since is not None and timestamp <= self.since:
+                continue
+            if floor is not None and timestamp < floor:
+                continue
+            key = event_id(event)
+            if key in self._seen:
+                continue
+            self._remember(key)
+            if self.newest is None or timestamp > self.newest:
+                self.newest = timestamp
+            if self._matches(event):
+                new.append({"endpoint_name": self.endpoint_name, **event})
+        return new
+
+    def _matches(self, event: Dict) -> bool:
+        if self.served_model_names is not None and (
+            event.get("served_model_name") not in self.served_model_names
+        ):
+            return False
+        if self.event_types is not None and event.get("type") not in self.event_types:
+            return False
+        return True
+
+    def _remember(self, key: str):
+        self._seen[key] = None
+        if len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+
+
+def watch_events(
+    fetch: Callable[[str], Sequence[Dict]],
+    endpoint_names: Sequence[str],
+    served_model_names: Iterable[str] = None,
+    event_types: Iterable[str] = None,
+    since: int = None,
+    follow: bool = True,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    timeout: float = None,
+) -> Iterator[Dict]:
+    """
+    Yields the unseen events of several endpoints from a single polling
+    loop.
+
+    fetch: Returns the events list of an endpoint.
+    endpoint_names: Endpoints to watch.
+    served_model_names, event_types, since: Filters, see EventStream.
+    follow: Keep polling for new events. Otherwise every endpoint is polled
+    once.
+    poll_interval: Seconds between polls of an endpoint with new events.
+    max_interval: Ceiling of the polling interval of an idle endpoint.
+    backoff_factor: Growth of an endpoint's interval per idle poll.
+    timeout: Seconds after which watching stops, None to watch forever.
+
+    Each endpoint has its own polling interval, so busy endpoints are polled
+    often and idle ones back off, all from the calling thread. A fetch
+    failing with a transient error (throttling, 5xx, connection error or
+    timeout) is logged and polled again after backing off, and an endpoint
+    not found is no longer polled, without stopping the other endpoints.
+    Any other error, e.g. an invalid token, is raised.
+    """
+
+    streams = {
+        name: EventStream(name, served_model_names, event_types, since)
+        for name in endpoint_names
+    }
+    intervals = {name: poll_interval for name in endpoint_names}
+    start = time.monotonic()
+    schedule = [(start, name) for name in endpoint_names]
+    heapq.heapify(schedule)
+    while schedule:
+        due, name = heapq.heappop(schedule)
+        now = time.monotonic()
+        if timeout is not None and due - start >= timeout:
+            return
+        if due > now:
+            time.sleep(due - now)
+        try:
+            events = fetch(name)
+        except NotFoundError as e:
+            logger.warning("Stopped watching the events of %s: %s", name, e)
+            continue
+        except TRANSIENT_ERRORS as e:
+            logger.warning("Fetching the events of %s failed: %s", name, e)
+            events = []
+        new = streams[name].update(events)
+        yield from new
+        if not follow:
+            continue
+        if new:
+            intervals[name] = poll_interval
+        else:
+            intervals[name] = min(max_interval, intervals[name] * backoff_factor)
+        heapq.heappush(schedule, (time.monotonic() + intervals[name], name))
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+
+class EndpointClientError(Exception):
+    """
+    Base class for errors returned by the Databricks REST API.
+
+    status_code: HTTP status code of the response.
+    text: Body of the response.
+    retry_after: Seconds the server asked us to wait (Retry-After), if any.
+    """
+
+    def __init__(
+        self, message: str, status_code: int, text: str, retry_after: float = None
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.text = text
+        self.retry_after = retry_after
+
+
+class BadRequestError(EndpointClientError):
+    """400: the request was malformed or rejected by the model."""
+
+
+class UnauthorizedError(EndpointClientError):
+    """401/403: the token is missing, invalid or lacks permissions."""
+
+
+class NotFoundError(EndpointClientError):
+    """404: the endpoint or served model does not exist."""
+
+
+class ThrottledError(EndpointClientError):
+    """429: the endpoint or workspace is rate limiting requests."""
+
+
+class ServerError(EndpointClientError):
+    """5xx: the server failed to handle the request."""
+
+
+class ServiceUnavailableError(ServerError):
+    """503: the endpoint is overloaded, scaling or not ready yet."""
+
+
+class CircuitOpenError(ServiceUnavailableError):
+    """
+    Raised without calling the endpoint while its circuit breaker is open.
+
+    endpoint_name: Serving endpoint name.
+    retry_after: Seconds until a trial call is let through, None while the
+    half-open trial calls are in flight.
+    """
+
+    def __init__(self, message: str, endpoint_name: str, retry_after: float = None):
+        super().__init__(message, 503, "", retry_after)
+        self.endpoint_name = endpoint_name
+
+
+_ERRORS = {
+    requests.codes.bad_request: (BadRequestError, "Bad request"),
+    requests.codes.unauthorized: (UnauthorizedError, "Unauthorized"),
+    requests.codes.forbidden: (UnauthorizedError, "Forbidden"),
+    requests.codes.not_found: (NotFoundError, "Not found"),
+    requests.codes.too_many_requests: (ThrottledError, "Too many requests"),
+    requests.codes.internal_server_error: (ServerError, "Internal server error"),
+    requests.codes.service_unavailable: (
+        ServiceUnavailableError,
+        "Service unavailable",
+    ),
+}
+
+
+def raise_api_error(status_code: int, text: str, retry_after: str = None):
+    """
+    Raises the EndpointClientError subclass matching an HTTP error status.
+
+    status_code: HTTP status code of the response.
+    text: Body of the response.
+    retry_after: Raw value of the Retry-After header, if present.
+    """
+
+    if status_code in _ERRORS:
+        error, prefix = _ERRORS[status_code]
+    elif status_code >= 500:
+        error, prefix = ServerError, "Server error"
+    else:
+        error, prefix = EndpointClientError, "Unhandled error"
+    raise error(f"{prefix}: {text}", status_code, text, parse_retry_after(retry_after))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header given either in seconds or as an HTTP date.
+    """
+
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
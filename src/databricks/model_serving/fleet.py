@@ -0,0 +1,199 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from databricks.model_serving.waiter import (
+    DEFAULT_MAX_DELAY,
+    DEFAULT_WAIT_TIMEOUT,
+    UNTIL_READY,
+    WaitResult,
+    WaitTimeoutError,
+    wait_for_endpoints,
+)
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+@dataclass
+class EndpointOperation:
+    """
+    One create, update or delete of an endpoint.
+
+    action: CREATE, UPDATE or DELETE.
+    served_models, traffic_config: Config of CREATE and UPDATE operations.
+    """
+
+    action: str
+    endpoint_name: str
+    served_models: Optional[List] = None
+    traffic_config: Optional[Dict] = None
+
+    def __post_init__(self):
+        if self.action not in (CREATE, UPDATE, DELETE):
+            raise ValueError(f"Unknown endpoint operation: {self.action}")
+        if self.action != DELETE and self.served_models is None:
+            raise ValueError(f"{self.action} {self.endpoint_name} needs served_models")
+
+
+@dataclass
+class OperationResult:
+    """
+    Outcome of an EndpointOperation.
+
+    response: API response of the operation, None when it failed.
+    error: Exception raised by the operation, or WaitTimeoutError when the
+    endpoint did not settle in time.
+    wait: WaitResult of the endpoint, when waiting was requested.
+    elapsed: Seconds from dispatching the operation to its response.
+    """
+
+    operation: EndpointOperation
+    response: Optional[Dict] = None
+    error: Optional[Exception] = None
+    wait: Optional[WaitResult] = None
+    elapsed: float = 0.0
+
+    @property
+    def endpoint_name(self) -> str:
+        return self.operation.endpoint_name
+
+    @property
+    def succeeded(self) -> bool:
+        if self.error is not None:
+            return False
+        return self.wait is None or self.wait.succeeded
+
+
+@dataclass
+class FleetResult:
+    """
+    OperationResult of every endpoint of a batch, by endpoint name.
+    """
+
+    results: Dict[str, OperationResult] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> List[str]:
+        return [name for name, r in self.results.items() if r.succeeded]
+
+    @property
+    def failed(self) -> List[str]:
+        return [name for name, r in self.results.items() if not r.succeeded]
+
+    def __getitem__(self, endpoint_name: str) -> OperationResult:
+        return self.results[endpoint_name]
+
+
+class RateLimiter:
+    """
+    Spaces calls at least 1 / rate seconds apart, across threads.
+    """
+
+    def __init__(self, rate: float = None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def run_operations(
+    client,
+    operations: Sequence[EndpointOperation],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    rate: float = None,
+    wait: bool = False,
+    until: str = UNTIL_READY,
+    timeout: float = DEFAULT_WAIT_TIMEOUT,
+    max_delay: float = DEFAULT_MAX_DELAY,
+) -> FleetResult:
+    """
+    Dispatches endpoint operations concurrently and returns a FleetResult.
+
+    client: EndpointClient used for the operations.
+    operations: EndpointOperations, at most one per endpoint.
+    max_concurrency: Operations in flight at most.
+    rate: Operations started per second at most, None for no limit.
+    wait: Then wait for every created or updated endpoint to settle, see
+    wait_for_endpoints. Deleted endpoints are not waited for.
+    until, timeout, max_delay: Wait condition and settings.
+
+    A failing operation is recorded in its OperationResult and does not
+    stop the others. Endpoints are waited for together, with one list call
+    per polling round. A failed poll is retried until the timeout, after
+    which only the endpoints still pending get a WaitTimeoutError.
+    """
+
+    names = [op.endpoint_name for op in operations]
+    if len(set(names)) != len(names):
+        raise ValueError("Each endpoint can only appear once per batch")
+    limiter = RateLimiter(rate)
+    fleet = FleetResult({op.endpoint_name: OperationResult(op) for op in operations})
+
+    def run(result: OperationResult):
+        limiter.acquire()
+        start = time.monotonic()
+        try:
+            result.response = _apply(client, result.operation)
+        except Exception as e:
+            result.error = e
+        result.elapsed = time.monotonic() - start
+
+    if operations:
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            list(pool.map(run, fleet.results.values()))
+
+    if wait:
+        pending = [
+            name
+            for name, result in fleet.results.items()
+            if result.error is None and result.operation.action != DELETE
+        ]
+        _wait(client, fleet, pending, until, timeout, max_delay)
+    return fleet
+
+
+def _apply(client, op: EndpointOperation) -> Dict:
+    if op.action == CREATE:
+        return client.create_inference_endpoint(
+            op.endpoint_name, op.served_models, op.traffic_config
+        )
+    if op.action == UPDATE:
+        return client.update_served_models(
+            op.endpoint_name, op.served_models, op.traffic_config
+        )
+    return client.delete_inference_endpoint(op.endpoint_name)
+
+
+def _wait(client, fleet: FleetResult, names, until, timeout, max_delay):
+    if not names:
+        return
+    try:
+        waits = wait_for_endpoints(
+            client, names, until, timeout=timeout, max_delay=max_delay
+        )
+    except WaitTimeoutError as e:
+        waits = e.results
+        for name, wait in waits.items():
+            if not wait.done:
+                fleet[name].error = e
+    except Exception as e:
+        for name in names:
+            fleet[name].error = e
+        return
+    for name, wait in waits.items():
+        fleet[name].wait = wait
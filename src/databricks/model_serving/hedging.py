@@ -0,0 +1,192 @@
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HedgingConfig:
+    """
+    Settings of hedged invocations.
+
+    quantile: Latency quantile after which a duplicate request is sent,
+    e.g. 0.95 hedges the slowest 5% of requests.
+    min_delay: The hedging delay never drops below this many seconds.
+    max_delay: Optional ceiling of the hedging delay, in seconds.
+    min_samples: Latencies observed before the first hedge is sent.
+    window: Number of recent latencies the quantile is taken from.
+    budget: Hedges allowed per request, e.g. 0.05 caps the extra load at 5%.
+    burst: Maximum number of hedges the unused budget can save up.
+    max_workers: Threads sending the hedges of EndpointClient, whose
+    first requests are sent from the calling thread. A hedge is denied
+    while they are all busy, which bounds the extra requests in flight.
+    """
+
+    quantile: float = 0.95
+    min_delay: float = 0.001
+    max_delay: Optional[float] = None
+    min_samples: int = 20
+    window: int = 1000
+    budget: float = 0.05
+    burst: float = 10.0
+    max_workers: int = 64
+
+
+class Hedger:
+    """
+    Per-endpoint hedging state: the recent latency distribution the delay is
+    taken from, and the token bucket enforcing the hedge budget.
+
+    Every request adds `budget` tokens (up to `burst`) and every hedge spends
+    one, so hedges never exceed budget times the number of requests.
+    """
+
+    def __init__(self, config: HedgingConfig = None):
+        self.config = config or HedgingConfig()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.denied = 0
+        self._latencies: Deque[float] = deque(maxlen=self.config.window)
+        self._observed = 0
+        self._delay: Optional[float] = None
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def start(self) -> Optional[float]:
+        """
+        Registers a request and returns how long to wait for its response
+        before hedging, or None while too few latencies were observed.
+        """
+
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.config.burst, self._tokens + self.config.budget)
+            return self._delay
+
+    def try_hedge(self, capacity: bool = True) -> bool:
+        """
+        Spends a hedge from the budget, if one is left.
+
+        capacity: Whether a worker is free to send the hedge. The hedge is
+        denied otherwise.
+        """
+
+        with self._lock:
+            if not capacity or self._tokens < 1:
+                self.denied += 1
+                return False
+            self._tokens -= 1
+            self.hedges += 1
+            return True
+
+    def hedge_won(self):
+        with self._lock:
+            self.hedge_wins += 1
+
+    def observe(self, latency: float):
+        """
+        Records the latency of a successful request, hedge or not.
+        """
+
+        with self._lock:
+            self._latencies.append(latency)
+            self._observed += 1
+            # Sorting the window on every request would dominate the cost of
+            # hedging; the delay is refreshed every few observations instead.
+            if self._observed >= self.config.min_samples and (
+                self._delay is None or self._observed % 10 == 0
+            ):
+                self._delay = self._quantile()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "delay": self._delay,
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "denied": self.denied,
+            }
+
+    def _quantile(self) -> float:
+        latencies = sorted(self._latencies)
+        rank = math.ceil(self.config.quantile * len(latencies))
+        delay = max(self.config.min_delay, latencies[max(rank, 1) - 1])
+        if self.config.max_delay is not None:
+            delay = min(delay, self.config.max_delay)
+        return delay
+
+
+class HedgeTimer:
+    """
+    Runs callbacks once their delay has elapsed, all from one thread, so
+    that waiting out hedging delays does not hold a thread per call.
+    Callbacks must return quickly, e.g. by submitting work to a pool.
+    """
+
+    def __init__(self, name: str = "hedge-timer"):
+        self.name = name
+        self._heap: List[List] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> List:
+        """
+        Runs callback after delay seconds. Returns the entry to cancel.
+        """
+
+        entry = [time.monotonic() + delay, next(self._counter), callback]
+        with self._condition:
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self.name, daemon=True
+                )
+                self._thread.start()
+            elif self._heap[0] is entry:
+                self._condition.notify()
+        return entry
+
+    def cancel(self, entry: List) -> bool:
+        """
+        Cancels a scheduled callback. Returns False when it already ran.
+        """
+
+        with self._condition:
+            scheduled = entry[2] is not None
+            entry[2] = None
+            return scheduled
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    while self._heap and self._heap[0][2] is None:
+                        heapq.heappop(self._heap)
+                    if self._closed:
+                        return
+                    now = time.monotonic()
+                    if self._heap and self._heap[0][0] <= now:
+                        entry = heapq.heappop(self._heap)
+                        callback, entry[2] = entry[2], None
+                        break
+                    self._condition.wait(self._heap[0][0] - now if self._heap else None)
+            try:
+                callback()
+            except Exception:
+                logger.exception("Hedge timer callback failed")
@@ -0,0 +1,380 @@
+"""
+Replays a payload file against a serving endpoint and reports throughput,
+latency percentiles and error rates.
+
+Closed loop (a fixed number of workers sending back to back):
+
+    model-serving-loadtest my-endpoint payload.json --concurrency 16 --duration 60
+
+Open loop (requests sent at a constant arrival rate, whatever the latency):
+
+    model-serving-loadtest my-endpoint payload.json --rate 200 --duration 60
+
+The workspace URL and token are read from --host/--token or the
+DATABRICKS_HOST/DATABRICKS_TOKEN environment variables.
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.exceptions import (
+    ServiceUnavailableError,
+    ThrottledError,
+)
+from databricks.model_serving.metrics import MetricsRegistry
+from databricks.model_serving.retry import NO_RETRY
+
+CLOSED_LOOP = "closed"
+OPEN_LOOP = "open"
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_DURATION = 30.0
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+
+@dataclass
+class Sample:
+    """
+    Outcome of one request.
+
+    intended: When the request should have been sent, in perf_counter
+    seconds. Equals sent in closed loop mode.
+    sent: When the request was actually sent.
+    latency: Seconds from sent until the response (service time).
+    error: Exception type name, None on success.
+    """
+
+    intended: float
+    sent: float
+    latency: float
+    error: Optional[str] = None
+    throttled: bool = False
+
+    @property
+    def response_time(self) -> float:
+        """
+        Seconds from the intended send time until the response.
+        """
+
+        return self.sent - self.intended + self.latency
+
+
+@dataclass
+class LoadTestResult:
+    endpoint_name: str
+    mode: str
+    concurrency: int
+    rate: Optional[float]
+    elapsed: float
+    samples: List[Sample] = field(default_factory=list)
+    phases: Dict = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        total = len(self.samples)
+        ok = [s for s in self.samples if s.error is None]
+        throttled = sum(s.throttled for s in self.samples)
+        errors: Dict[str, int] = {}
+        for sample in self.samples:
+            if sample.error is not None:
+                errors[sample.error] = errors.get(sample.error, 0) + 1
+        service = [s.latency for s in ok]
+        if self.mode == OPEN_LOOP:
+            corrected = [s.response_time for s in ok]
+        else:
+            corrected = correct_coordinated_omission(service)
+        return {
+            "endpoint_name": self.endpoint_name,
+            "mode": self.mode,
+            "concurrency": self.concurrency,
+            "target_rate": self.rate,
+            "elapsed": self.elapsed,
+            "requests": total,
+            "successes": len(ok),
+            "throughput": len(ok) / self.elapsed if self.elapsed else 0.0,
+            "error_rate": (total - len(ok)) / total if total else 0.0,
+            "throttle_rate": throttled / total if total else 0.0,
+            "errors": errors,
+            "latency": summarize(service),
+            "corrected_latency": summarize(corrected),
+            "phases": self.phases,
+        }
+
+
+def percentile(values: Sequence[float], p: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of sorted values.
+    """
+
+    if not values:
+        return None
+    rank = max(1, int(-(-p * len(values) // 100)))
+    return values[min(rank, len(values)) - 1]
+
+
+def summarize(latencies: Sequence[float]) -> Dict:
+    values = sorted(latencies)
+    result = {"count": len(values)}
+    if values:
+        result["min"] = values[0]
+        result["mean"] = sum(values) / len(values)
+        result["max"] = values[-1]
+    for p in PERCENTILES:
+        result[f"p{p:g}"] = percentile(values, p)
+    return result
+
+
+def correct_coordinated_omission(
+    latencies: Sequence[float], expected_interval: float = None
+) -> List[float]:
+    """
+    Backfills the requests a closed loop worker did not send while it was
+    stuck on a slow response.
+
+    A worker waiting L seconds for a response would, at its usual pace, have
+    sent a request every expected_interval seconds in the meantime, and those
+    would have waited L - interval, L - 2 * interval, ... seconds. This is
+    HdrHistogram's correction; expected_interval defaults to the mean latency.
+    """
+
+    if not latencies:
+        return []
+    if expected_interval is None:
+        expected_interval = sum(latencies) / len(latencies)
+    corrected = list(latencies)
+    if expected_interval <= 0:
+        return corrected
+    for latency in latencies:
+        missing = latency - expected_interval
+        while missing >= expected_interval:
+            corrected.append(missing)
+            missing -= expected_interval
+    return corrected
+
+
+def run_load_test(
+    client: EndpointClient,
+    endpoint_name: str,
+    payloads: Sequence[Dict],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate: float = None,
+    duration: float = None,
+    requests: int = None,
+    warmup: float = 0.0,
+) -> LoadTestResult:
+    """
+    Sends payloads (cycling through them) to an endpoint and records a
+    Sample per request.
+
+    client: EndpointClient to send requests with. Should not retry
+    invocations, so that errors and throttling show in the results.
+    concurrency: Closed loop: number of workers. Open loop: maximum number
+    of requests in flight.
+    rate: Requests per second of the open loop mode. Closed loop when None.
+    duration: Seconds to send requests for, after the warmup.
+    requests: Number of requests to send, after the warmup. Runs for
+    DEFAULT_DURATION seconds when neither this nor duration is set.
+    warmup: Seconds of traffic sent first and left out of the results.
+
+    In open loop mode latencies are also measured from the time each request
+    was scheduled, so that a slow endpoint delaying later requests (queueing
+    behind busy workers) is not hidden from the results.
+    """
+
+    if not payloads:
+        raise ValueError("No payloads to send")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be positive")
+    if duration is None and requests is None:
+        duration = DEFAULT_DURATION
+
+    if warmup > 0:
+        _run(client, endpoint_name, payloads, concurrency, rate, warmup, None)
+    registry = MetricsRegistry()
+    client.request_hooks.append(registry)
+    try:
+        start = time.perf_counter()
+        samples = _run(
+            client, endpoint_name, payloads, concurrency, rate, duration, requests
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        client.request_hooks.remove(registry)
+    phases = registry.to_dict().get(endpoint_name, {}).get("POST invocations", {})
+    return LoadTestResult(
+        endpoint_name,
+        OPEN_LOOP if rate is not None else CLOSED_LOOP,
+        concurrency,
+        rate,
+        elapsed,
+        samples,
+        phases.get("latency", {}),
+    )
+
+
+def _run(client, endpoint_name, payloads, concurrency, rate, duration, requests):
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + duration if duration is not None else None
+    counter = iter(range(sys.maxsize if requests is None else requests))
+    schedule: "queue.Queue[Optional[tuple]]" = queue.Queue()
+
+    def send(i, intended):
+        sent = time.perf_counter()
+        error = None
+        throttled = False
+        try:
+            client.query_inference_endpoint(endpoint_name, payloads[i % len(payloads)])
+        except Exception as e:
+            error = type(e).__name__
+            throttled = isinstance(e, (ThrottledError, ServiceUnavailableError))
+        sample = Sample(intended, sent, time.perf_counter() - sent, error, throttled)
+        with lock:
+            samples.append(sample)
+
+    def closed_worker():
+        while deadline is None or time.perf_counter() < deadline:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            send(i, time.perf_counter())
+
+    def open_worker():
+        while True:
+            item = schedule.get()
+            if item is None:
+                return
+            send(*item)
+
+    if rate is None:
+        workers = [threading.Thread(target=closed_worker) for _ in range(concurrency)]
+    else:
+        workers = [threading.Thread(target=open_worker) for _ in range(concurrency)]
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+
+    if rate is not None:
+        # Requests are scheduled at start + i / rate regardless of how many
+        # are still waiting for a response.
+        for i in counter:
+            intended = start + i / rate
+            if deadline is not None and intended >= deadline:
+                break
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            schedule.put((i, intended))
+        for _ in workers:
+            schedule.put(None)
+    for worker in workers:
+        worker.join()
+    return samples
+
+
+def load_payloads(path: str) -> List[Dict]:
+    """
+    Reads payloads from a JSON file holding one payload or a list of them,
+    or from a JSON Lines file with one payload per line.
+    """
+
+    with open(path) as f:
+        text = f.read()
+    try:
+        payloads = json.loads(text)
+    except json.JSONDecodeError:
+        payloads = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return payloads if isinstance(payloads, list) else [payloads]
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"{report['mode']} loop, {report['requests']} requests"
+        f" in {report['elapsed']:.1f}s against {report['endpoint_name']}",
+        f"throughput: {report['throughput']:.1f} req/s"
+        f"  errors: {report['error_rate']:.2%}"
+        f"  throttled: {report['throttle_rate']:.2%}",
+    ]
+    for name in ("latency", "corrected_latency"):
+        stats = report[name]
+        if stats["count"]:
+            values = "  ".join(
+                f"p{p:g}={stats[f'p{p:g}'] * 1000:.1f}ms" for p in PERCENTILES
+            )
+            lines.append(f"{name}: mean={stats['mean'] * 1000:.1f}ms  {values}")
+    for error, count in sorted(report["errors"].items()):
+        lines.append(f"  {error}: {count}")
+    return "\n".join(lines)
+
+
+def run_cli(argv: Sequence[str] = None) -> Dict:
+    """
+    Runs the command line load test, prints its report and returns it.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="model-serving-loadtest",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("endpoint_name")
+    parser.add_argument("payload", help="JSON or JSON Lines file of payloads")
+    parser.add_argument("--host", default=os.environ.get("DATABRICKS_HOST"))
+    parser.add_argument("--token", default=os.environ.get("DATABRICKS_TOKEN"))
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--rate", type=float, help="requests/s, enables open loop")
+    parser.add_argument("--duration", type=float, help="seconds")
+    parser.add_argument("--requests", type=int, help="number of requests")
+    parser.add_argument("--warmup", type=float, default=0.0, help="seconds")
+    parser.add_argument("--read-timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--json", action="store_true", help="print JSON report")
+    args = parser.parse_args(argv)
+    if not args.host or not args.token:
+        parser.error("--host and --token (or DATABRICKS_HOST/TOKEN) are required")
+
+    client = EndpointClient(
+        args.host.rstrip("/"),
+        args.token,
+        pool_maxsize=args.concurrency,
+        read_timeout=args.read_timeout,
+        retry_policy=NO_RETRY,
+    )
+    with client:
+        result = run_load_test(
+            client,
+            args.endpoint_name,
+            load_payloads(args.payload),
+            concurrency=args.concurrency,
+            rate=args.rate,
+            duration=args.duration,
+            requests=args.requests,
+            warmup=args.warmup,
+        )
+    report = result.to_dict()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return report
+
+
+def main(argv: Sequence[str] = None):
+    """
+    Entry point of the model-serving-loadtest console script.
+    """
+
+    run_cli(argv)
+
+
+if __name__ == "__main__":
+    main()
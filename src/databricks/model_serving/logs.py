@@ -0,0 +1,117 @@
+import hashlib
+import time
+from collections import deque
+from typing import Callable, Deque, Iterator, List
+
+SERVER_LOGS = "server"
+BUILD_LOGS = "build"
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_MAX_INTERVAL = 30.0
+DEFAULT_BACKOFF_FACTOR = 2.0
+DEFAULT_WINDOW = 1000
+
+
+class LogTailer:
+    """
+    Turns repeated fetches of a whole log blob into a stream of new lines.
+
+    The logs API has no offset parameter, so every poll downloads the full
+    blob. Only the last `window` lines already seen are kept: a new blob is
+    aligned on them, and the lines after the match are the new ones. The
+    match is first expected where the previous blob ended, as a log only
+    grows, so that repeated lines are never returned twice. When no match
+    is found (the log was truncated or rotated past the window), the whole
+    blob is treated as new.
+    """
+
+    def __init__(self, fetch: Callable[[], str], window: int = DEFAULT_WINDOW):
+        """
+        Instantiates a LogTailer. Parameters.
+
+        fetch: Returns the current log blob.
+        window: Number of seen lines kept to align the next blob on.
+        """
+        self.fetch = fetch
+        self.window: Deque[str] = deque(maxlen=window)
+        self._digest = None
+        self._length = 0
+
+    def poll(self) -> List[str]:
+        """
+        Fetches the log and returns the lines not returned before.
+        """
+
+        blob = self.fetch() or ""
+        digest = hashlib.sha256(blob.encode("utf-8", "replace")).digest()
+        if digest == self._digest:
+            return []
+        self._digest = digest
+        lines = blob.splitlines()
+        new = lines[self._overlap(lines) :]
+        self._length = len(lines)
+        self.window.extend(new)
+        return new
+
+    def _overlap(self, lines: List[str]) -> int:
+        # Returns the index just after the seen window in lines: where the
+        # previous blob ended when the log was only appended to, otherwise
+        # the latest position before it that ends with the whole window, or
+        # else after the longest suffix of the window starting the blob (the
+        # log was truncated). 0 when the blob does not continue what was
+        # seen.
+        seen = list(self.window)
+        if not seen:
+            return 0
+        offset = min(self._length, len(lines))
+        size = min(len(seen), offset)
+        if size and lines[offset - size : offset] == seen[len(seen) - size :]:
+            return offset
+        for end in range(offset, len(seen) - 1, -1):
+            if lines[end - 1] == seen[-1] and lines[end - len(seen) : end] == seen:
+                return end
+        for end in range(min(len(seen) - 1, len(lines)), 0, -1):
+            if lines[:end] == seen[len(seen) - end :]:
+                return end
+        return 0
+
+
+def tail_logs(
+    fetch: Callable[[], str],
+    follow: bool = False,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    window: int = DEFAULT_WINDOW,
+    timeout: float = None,
+) -> Iterator[str]:
+    """
+    Yields the lines of a log, then, with follow, new lines as they appear.
+
+    fetch: Returns the current log blob.
+    follow: Keep polling for new lines until timeout or until the caller
+    stops iterating.
+    poll_interval: Seconds between polls while lines keep coming.
+    max_interval: Ceiling of the polling interval while the log is idle.
+    backoff_factor: Growth of the polling interval per idle poll.
+    window: Number of seen lines kept to detect new ones.
+    timeout: Seconds after which following stops, None to follow forever.
+    """
+
+    tailer = LogTailer(fetch, window)
+    start = time.monotonic()
+    interval = poll_interval
+    while True:
+        new = tailer.poll()
+        yield from new
+        if not follow:
+            return
+        interval = (
+            poll_interval if new else min(max_interval, interval * backoff_factor)
+        )
+        if timeout is not None:
+            remaining = timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                return
+            interval = min(interval, remaining)
+        time.sleep(interval)
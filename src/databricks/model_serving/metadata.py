@@ -0,0 +1,157 @@
+import asyncio
+import copy
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+DEFAULT_METADATA_TTL = 30.0
+
+LIST_KEY = ("list",)
+
+
+def endpoint_key(endpoint_name: str) -> Tuple[str, str]:
+    return ("endpoint", endpoint_name)
+
+
+class MetadataCache:
+    """
+    TTL cache for endpoint metadata (get/list responses).
+
+    Concurrent lookups of the same key are collapsed: the first caller
+    fetches, the others wait for its result instead of sending their own
+    request. Callers always receive their own copy of the cached value.
+    A fetch that was in flight when its key got invalidated is not cached.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_METADATA_TTL):
+        """
+        Instantiates a MetadataCache. Parameters.
+
+        ttl: Seconds a cached response is served before it is refetched.
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._async_in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, key: Hashable, fetch: Callable[[], Any], refresh: bool = False
+    ) -> Any:
+        """
+        Returns the cached value of key, calling fetch on a miss.
+
+        refresh: Skip the cached value and fetch (and cache) a fresh one.
+        """
+
+        with self._lock:
+            found, value = (False, None) if refresh else self._lookup(key)
+            if found:
+                return copy.deepcopy(value)
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = Future()
+        if not leader:
+            return copy.deepcopy(call.result())
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                self._finish(key, call)
+            call.set_exception(e)
+            raise
+        with self._lock:
+            self._finish(key, call, value)
+        call.set_result(value)
+        return copy.deepcopy(value)
+
+    async def get_async(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]], refresh: bool = False
+    ) -> Any:
+        """
+        asyncio flavour of get, for use from a single event loop.
+
+        When the caller fetching a key is cancelled, the callers waiting on
+        it are not: one of them fetches the key instead.
+        """
+
+        while True:
+            found, value = (False, None) if refresh else self._lookup(key)
+            if found:
+                return copy.deepcopy(value)
+            call = self._async_in_flight.get(key)
+            if call is None:
+                break
+            # Unlike awaiting the call, wait() does not raise when the
+            # leader was cancelled, only when this caller is.
+            await asyncio.wait([call])
+            if not call.cancelled():
+                return copy.deepcopy(call.result())
+            # The leader was cancelled: look up again, and lead if needed.
+
+        call = self._async_in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            # Only this caller was cancelled, the others retry the lookup.
+            self._finish(key, call, in_flight=self._async_in_flight)
+            call.cancel()
+            raise
+        except BaseException as e:
+            self._finish(key, call, in_flight=self._async_in_flight)
+            call.set_exception(e)
+            # Retrieve the exception so asyncio does not warn when no other
+            # caller was waiting on this lookup.
+            call.exception()
+            raise
+        self._finish(key, call, value, in_flight=self._async_in_flight)
+        call.set_result(value)
+        return copy.deepcopy(value)
+
+    def invalidate(self, endpoint_name: str = None):
+        """
+        Drops the cached metadata of an endpoint (and the cached listing,
+        which includes it), or everything when endpoint_name is None.
+        """
+
+        with self._lock:
+            if endpoint_name is None:
+                keys = list(self._entries) + list(self._in_flight)
+                keys += list(self._async_in_flight)
+            else:
+                keys = [endpoint_key(endpoint_name), LIST_KEY]
+            for key in keys:
+                self._entries.pop(key, None)
+                self._in_flight.pop(key, None)
+                self._async_in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def _finish(
+        self,
+        key: Hashable,
+        call,
+        value: Any = None,
+        in_flight: Dict = None,
+    ):
+        in_flight = self._in_flight if in_flight is None else in_flight
+        if in_flight.get(key) is not call:
+            # The key was invalidated while this fetch was in flight.
+            return
+        del in_flight[key]
+        if value is not None:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] >= time.monotonic():
+            self.hits += 1
+            return True, entry[0]
+        self.misses += 1
+        return False, None
@@ -0,0 +1,271 @@
+import bisect
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+SIZE_BUCKETS = tuple(4**i for i in range(3, 16))  # 64 B to 1 GiB
+PHASES = ("serialize", "connect", "ttfb", "transfer", "deserialize", "total")
+QUANTILES = (0.5, 0.95, 0.99)
+# Response header naming the served model that answered an invocation.
+SERVED_MODEL_HEADER = "served-model-name"
+
+
+@dataclass
+class RequestTiming:
+    """
+    Timings and sizes of a single HTTP request sent by a client.
+
+    serialize: Seconds spent encoding the request body.
+    connect: Seconds spent opening a new connection, 0 when one was reused.
+    ttfb: Seconds from sending the request until the response headers
+    arrived. Includes connect.
+    transfer: Seconds spent reading the response body.
+    deserialize: Seconds spent decoding the response body.
+    total: Seconds spent in the request, from serialization to decoding.
+    error: Name of the exception raised, if any.
+    served_model_name: Served model that answered an invocation, from the
+    served-model-name response header.
+    """
+
+    method: str
+    uri: str
+    endpoint_name: str = ""
+    route: str = ""
+    status_code: Optional[int] = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    serialize: float = 0.0
+    connect: float = 0.0
+    ttfb: float = 0.0
+    transfer: float = 0.0
+    deserialize: float = 0.0
+    total: float = 0.0
+    error: Optional[str] = None
+    served_model_name: Optional[str] = None
+
+    def __post_init__(self):
+        if not self.route:
+            self.endpoint_name, self.route = parse_uri(self.uri)
+
+
+def parse_uri(uri: str) -> Tuple[str, str]:
+    """
+    Splits a REST API uri into (endpoint name, route), e.g.
+    "serving-endpoints/my-model/invocations" -> ("my-model", "invocations").
+    """
+
+    parts = [p for p in uri.split("?")[0].split("/") if p]
+    if parts[:2] == ["api", "2.0"]:
+        parts = parts[2:]
+    if len(parts) < 2:
+        return "", "serving-endpoints"
+    if len(parts) == 2:
+        return parts[1], "serving-endpoint"
+    return parts[1], parts[-1]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram: observing a value is a binary search and an
+    increment, and memory does not grow with the number of observations.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        # The last count is the +Inf bucket.
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates a quantile by linear interpolation inside its bucket.
+        """
+
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def to_dict(self) -> Dict:
+        result = {"count": self.count, "sum": self.sum}
+        if self.count:
+            result["mean"] = self.sum / self.count
+        for q in QUANTILES:
+            result[f"p{int(q * 100)}"] = self.quantile(q)
+        return result
+
+
+class MetricsRegistry:
+    """
+    Aggregates RequestTimings into per-endpoint, per-route histograms.
+
+    A registry is a request hook: pass it in a client's request_hooks.
+    Results are exported with to_dict() or, in Prometheus text exposition
+    format, with to_prometheus().
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+        prefix: str = "model_serving",
+    ):
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.prefix = prefix
+        self._latencies: Dict[Tuple[str, str, str, str], Histogram] = {}
+        self._sizes: Dict[Tuple[str, str, str, str], Histogram] = {}
+        self._statuses: Dict[Tuple[str, str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, timing: RequestTiming):
+        self.observe(timing)
+
+    def observe(self, timing: RequestTiming):
+        labels = (timing.endpoint_name, timing.route, timing.method)
+        status = str(timing.status_code) if timing.status_code else timing.error
+        with self._lock:
+            for phase in PHASES:
+                self._histogram(self._latencies, labels + (phase,), True).observe(
+                    getattr(timing, phase)
+                )
+            for direction in ("request", "response"):
+                self._histogram(self._sizes, labels + (direction,), False).observe(
+                    getattr(timing, f"{direction}_bytes")
+                )
+            key = labels + (status or "unknown",)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+
+    def latency(
+        self, endpoint_name: str, route: str, method: str, phase: str = "total"
+    ) -> Optional[Histogram]:
+        with self._lock:
+            return self._latencies.get((endpoint_name, route, method, phase))
+
+    def reset(self):
+        with self._lock:
+            self._latencies.clear()
+            self._sizes.clear()
+            self._statuses.clear()
+
+    def to_dict(self) -> Dict:
+        """
+        Returns {endpoint: {"METHOD route": {"latency": {phase: stats},
+        "bytes": {...}, "status": {code: count}}}}.
+        """
+
+        result: Dict = {}
+        with self._lock:
+            for (endpoint, route, method, phase), histogram in self._latencies.items():
+                entry = self._entry(result, endpoint, route, method)
+                entry["latency"][phase] = histogram.to_dict()
+            for (endpoint, route, method, direction), histogram in self._sizes.items():
+                entry = self._entry(result, endpoint, route, method)
+                entry["bytes"][direction] = histogram.to_dict()
+            for (endpoint, route, method, status), count in self._statuses.items():
+                entry = self._entry(result, endpoint, route, method)
+                entry["status"][status] = count
+        return result
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+
+        latency = f"{self.prefix}_request_duration_seconds"
+        size = f"{self.prefix}_message_size_bytes"
+        responses = f"{self.prefix}_responses_total"
+        lines = [
+            f"# HELP {latency} Duration of each phase of a request.",
+            f"# TYPE {latency} histogram",
+        ]
+        with self._lock:
+            for (endpoint, route, method, phase), histogram in sorted(
+                self._latencies.items()
+            ):
+                labels = _labels(endpoint, route, method, phase=phase)
+                lines.extend(_histogram_lines(latency, labels, histogram))
+            lines += [
+                f"# HELP {size} Size of request and response bodies.",
+                f"# TYPE {size} histogram",
+            ]
+            for (endpoint, route, method, direction), histogram in sorted(
+                self._sizes.items()
+            ):
+                labels = _labels(endpoint, route, method, direction=direction)
+                lines.extend(_histogram_lines(size, labels, histogram))
+            lines += [
+                f"# HELP {responses} Responses by status code or error.",
+                f"# TYPE {responses} counter",
+            ]
+            for (endpoint, route, method, status), count in sorted(
+                self._statuses.items()
+            ):
+                labels = _labels(endpoint, route, method, status=status)
+                lines.append(f"{responses}{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, histograms: Dict, key: Tuple, latency: bool) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            buckets = self.latency_buckets if latency else self.size_buckets
+            histogram = histograms[key] = Histogram(buckets)
+        return histogram
+
+    @staticmethod
+    def _entry(result: Dict, endpoint: str, route: str, method: str) -> Dict:
+        return result.setdefault(endpoint, {}).setdefault(
+            f"{method} {route}", {"latency": {}, "bytes": {}, "status": {}}
+        )
+
+
+def _labels(endpoint: str, route: str, method: str, **extra) -> str:
+    labels = {"endpoint": endpoint, "route": route, "method": method, **extra}
+    return ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram):
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+    yield f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+    yield f"{name}_sum{{{labels}}} {histogram.sum}"
+    yield f"{name}_count{{{labels}}} {histogram.count}"
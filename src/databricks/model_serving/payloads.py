@@ -0,0 +1,145 @@
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+ArrayLike = Union[np.ndarray, List]
+
+
+def dataframe_split(df, float_precision: int = None) -> Dict:
+    """
+    Builds a `dataframe_split` payload from a pandas DataFrame.
+
+    Unlike `dataframe_records`, column names are sent once and every row is
+    a plain list, so no per-row dict is ever built.
+
+    df: pandas DataFrame to send.
+    float_precision: Optional number of decimals floats are rounded to.
+    """
+
+    columns = [
+        _to_json_values(df[column].to_numpy(), float_precision) for column in df.columns
+    ]
+    return {
+        "dataframe_split": {
+            "columns": [str(column) for column in df.columns],
+            "data": [list(row) for row in zip(*columns)],
+        }
+    }
+
+
+def tensor_inputs(
+    tensors: Union[ArrayLike, Dict[str, ArrayLike]], float_precision: int = None
+) -> Dict:
+    """
+    Builds a columnar `inputs` tensor payload from NumPy arrays.
+
+    tensors: A single array, or a dict mapping input names to arrays.
+    float_precision: Optional number of decimals floats are rounded to.
+    """
+
+    return {"inputs": _to_tensor_values(tensors, float_precision)}
+
+
+def tensor_instances(
+    tensors: Union[ArrayLike, Dict[str, ArrayLike]], float_precision: int = None
+) -> Dict:
+    """
+    Builds a row-based `instances` tensor payload from NumPy arrays.
+
+    tensors: A single array, or a dict mapping input names to arrays whose
+    first dimension is the batch size.
+    float_precision: Optional number of decimals floats are rounded to.
+    """
+
+    if not isinstance(tensors, dict):
+        return {"instances": _to_json_values(np.asarray(tensors), float_precision)}
+    names = list(tensors)
+    values = [_to_json_values(np.asarray(tensors[n]), float_precision) for n in names]
+    return {"instances": [dict(zip(names, row)) for row in zip(*values)]}
+
+
+def _to_tensor_values(tensors, float_precision: int) -> Any:
+    if isinstance(tensors, dict):
+        return {
+            name: _to_json_values(np.asarray(values), float_precision)
+            for name, values in tensors.items()
+        }
+    return _to_json_values(np.asarray(tensors), float_precision)
+
+
+def _to_json_values(values: np.ndarray, float_precision: int) -> List:
+    """
+    Converts an array to (nested) lists of JSON-native Python values.
+
+    Floats narrower than float64 are formatted with their own shortest
+    representation (float32 0.1 becomes 0.1 rather than 0.10000000149011612),
+    NaN and infinities become None, and datetimes become ISO-8601 strings.
+    """
+
+    kind = values.dtype.kind
+    if kind == "f":
+        if float_precision is not None:
+            # Rounded in float64: float32 0.123 is 0.12300000339746475.
+            values = np.round(values.astype(np.float64), float_precision)
+        elif values.dtype.itemsize < 8:
+            values = _shortest_floats(values)
+        finite = np.isfinite(values)
+        if not finite.all():
+            values = values.astype(object)
+            values[~finite] = None
+        return values.tolist()
+    if kind == "M":
+        strings = np.datetime_as_string(values).astype(object)
+        strings[np.isnat(values)] = None
+        return strings.tolist()
+    if kind == "O":
+        return [_object_to_json(v) for v in values.tolist()]
+    return values.tolist()
+
+
+def _shortest_floats(values: np.ndarray) -> np.ndarray:
+    """
+    Widens a float16/float32 array to float64 values with the shortest decimal
+    representation that still round-trips to the original narrow value.
+
+    Each element is rounded to increasingly many significant digits, from the
+    dtype's guaranteed precision up to the digits needed for an exact
+    round-trip, which keeps the whole conversion vectorised.
+    """
+
+    finfo = np.finfo(values.dtype)
+    max_digits = int(np.ceil(1 + (finfo.nmant + 1) * np.log10(2)))
+    wide = values.astype(np.float64)
+    result = wide.copy()
+    pending = np.isfinite(wide) & (wide != 0)
+    exponent = np.zeros(wide.shape)
+    exponent[pending] = np.floor(np.log10(np.abs(wide[pending])))
+    for digits in range(finfo.precision, max_digits + 1):
+        index = np.nonzero(pending)
+        if not index[0].size:
+            break
+        power = digits - 1 - exponent[index]
+        scale = np.power(10.0, np.abs(power))
+        x = wide[index]
+        rounded = np.where(
+            power >= 0, np.round(x * scale) / scale, np.round(x / scale) * scale
+        )
+        done = rounded.astype(values.dtype) == values[index]
+        if digits == max_digits:
+            done[:] = True
+        resolved = tuple(axis[done] for axis in index)
+        result[resolved] = rounded[done]
+        pending[resolved] = False
+    return result
+
+
+def _object_to_json(value: Any) -> Any:
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    if hasattr(value, "isoformat"):
+        # NaT, timezone-aware ones included, is the only datetime unequal
+        # to itself.
+        return None if value != value else value.isoformat()
+    return value
@@ -0,0 +1,199 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from databricks.model_serving.fleet import (
+    CREATE,
+    UPDATE,
+    EndpointOperation,
+    FleetResult,
+)
+
+UNCHANGED = "unchanged"
+
+
+@dataclass
+class EndpointChange:
+    """
+    Planned change of one endpoint.
+
+    action: CREATE, UPDATE or UNCHANGED.
+    config: Desired config ({"served_models": ..., "traffic_config": ...}).
+    differences: Human-readable differences with the current config.
+    """
+
+    endpoint_name: str
+    action: str
+    config: Dict
+    differences: List[str] = field(default_factory=list)
+
+    def operation(self) -> EndpointOperation:
+        return EndpointOperation(
+            self.action,
+            self.endpoint_name,
+            self.config["served_models"],
+            self.config.get("traffic_config"),
+        )
+
+
+@dataclass
+class ReconcilePlan:
+    """
+    Changes needed to bring endpoints to a desired state, and the
+    FleetResult of applying them (None for a dry run).
+    """
+
+    changes: List[EndpointChange] = field(default_factory=list)
+    result: Optional[FleetResult] = None
+
+    @property
+    def pending(self) -> List[EndpointChange]:
+        return [c for c in self.changes if c.action != UNCHANGED]
+
+    def operations(self) -> List[EndpointOperation]:
+        return [change.operation() for change in self.pending]
+
+    def to_dict(self) -> Dict:
+        return {
+            change.endpoint_name: {
+                "action": change.action,
+                "differences": change.differences,
+            }
+            for change in self.changes
+        }
+
+    def format(self) -> str:
+        """
+        Returns the plan as text, one line per endpoint and difference.
+        """
+
+        lines = []
+        for change in self.changes:
+            lines.append(f"{change.action:<9} {change.endpoint_name}")
+            lines.extend(f"          {difference}" for difference in change.differences)
+        unchanged = len(self.changes) - len(self.pending)
+        lines.append(f"{len(self.pending)} to change, {unchanged} unchanged")
+        return "\n".join(lines)
+
+
+def plan_reconcile(
+    desired: Dict[str, Dict],
+    endpoints: List[Dict],
+    fetch: Callable[[str], Dict] = None,
+) -> ReconcilePlan:
+    """
+    Compares a desired state with the current endpoints and plans the
+    creates and updates needed.
+
+    desired: Desired config of each endpoint, by name, with served_models
+    and optionally traffic_config. Endpoints absent from it are left alone.
+    endpoints: Current endpoints, as listed by list_inference_endpoints.
+    fetch: Returns the full endpoint, as get_inference_endpoint does. The
+    listing may leave out fields: an endpoint that seems to differ while
+    some desired fields are absent from its listing is fetched and compared
+    again. Without fetch, absent fields count as differences.
+
+    Only the served model fields present in the desired config are compared,
+    so fields filled in by the service (state, creator, ...) never cause an
+    update, and numbers compare equal to their string form. Without a
+    traffic_config the service's default split is accepted. An update in
+    progress is compared through its pending config.
+    """
+
+    current = {endpoint.get("name"): endpoint for endpoint in endpoints}
+    plan = ReconcilePlan()
+    for name, config in desired.items():
+        if "served_models" not in config:
+            raise ValueError(f"Desired config of {name} has no served_models")
+        endpoint = current.get(name)
+        if endpoint is None:
+            plan.changes.append(EndpointChange(name, CREATE, config, ["new endpoint"]))
+            continue
+        actual = endpoint.get("pending_config") or endpoint.get("config") or {}
+        differences = _diff(config, actual)
+        if differences and fetch is not None and _unlisted(config, actual):
+            endpoint = fetch(name)
+            actual = endpoint.get("pending_config") or endpoint.get("config") or {}
+            differences = _diff(config, actual)
+        action = UPDATE if differences else UNCHANGED
+        plan.changes.append(EndpointChange(name, action, config, differences))
+    return plan
+
+
+def _diff(desired: Dict, actual: Dict) -> List[str]:
+    differences = []
+    remaining = list(actual.get("served_models") or [])
+    for served_model in desired["served_models"]:
+        match = _match(served_model, remaining)
+        label = served_model.get("name") or served_model.get("model_name")
+        if match is None:
+            differences.append(f"served model {label} added")
+            continue
+        remaining.remove(match)
+        for key, value in served_model.items():
+            if _normalize(value) != _normalize(match.get(key)):
+                differences.append(
+                    f"served model {label}: {key} {_show(match.get(key))} -> "
+                    f"{_show(value)}"
+                )
+    for served_model in remaining:
+        differences.append(f"served model {served_model.get('name')} removed")
+
+    traffic_config = desired.get("traffic_config")
+    if traffic_config is not None:
+        if _routes(traffic_config) != _routes(actual.get("traffic_config")):
+            differences.append(
+                f"traffic_config {_show(actual.get('traffic_config'))} -> "
+                f"{_show(traffic_config)}"
+            )
+    return differences
+
+
+def _unlisted(desired: Dict, actual: Dict) -> bool:
+    # Whether desired fields are absent from the listed config.
+    remaining = list(actual.get("served_models") or [])
+    for served_model in desired["served_models"]:
+        match = _match(served_model, remaining)
+        if match is not None:
+            remaining.remove(match)
+            if any(key not in match for key in served_model):
+                return True
+    return (
+        desired.get("traffic_config") is not None
+        and actual.get("traffic_config") is None
+    )
+
+
+def _match(served_model: Dict, candidates: List[Dict]) -> Optional[Dict]:
+    # Named served models match by name, others by model name, so that a new
+    # version of a model reads as a version change.
+    if served_model.get("name") is not None:
+        key, value = "name", served_model["name"]
+    else:
+        key, value = "model_name", served_model.get("model_name")
+    for candidate in candidates:
+        if candidate.get(key) == value:
+            return candidate
+    return None
+
+
+def _routes(traffic_config: Optional[Dict]):
+    routes = (traffic_config or {}).get("routes") or []
+    return sorted(
+        (route.get("served_model_name"), float(route.get("traffic_percentage", 0)))
+        for route in routes
+    )
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if value is None or isinstance(value, bool):
+        return value
+    return str(value)
+
+
+def _show(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
@@ -0,0 +1,246 @@
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import requests
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.exceptions import (
+    CircuitOpenError,
+    ServerError,
+    ThrottledError,
+)
+
+DEFAULT_DECAY = 10.0
+DEFAULT_COOLDOWN = 5.0
+DEFAULT_PROBE_INTERVAL = 30.0
+
+# Errors after which the call is retried on another replica.
+FAILOVER_ERRORS = (
+    ThrottledError,
+    ServerError,
+    requests.ConnectionError,
+    requests.Timeout,
+)
+
+
+@dataclass(frozen=True)
+class Replica:
+    """
+    One copy of a model: an endpoint in a workspace.
+    """
+
+    base_url: str
+    token: str
+    endpoint_name: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.base_url.rstrip('/')}/{self.endpoint_name}"
+
+
+class ReplicaState:
+    """
+    Load and recent latency of a replica.
+
+    The latency is an exponentially weighted moving average whose weights
+    decay with time (`decay` seconds), so it follows a replica that slows
+    down or recovers within seconds whatever the request rate.
+    """
+
+    def __init__(self, replica: Replica, decay: float = DEFAULT_DECAY):
+        self.replica = replica
+        self.decay = decay
+        self.ewma: Optional[float] = None
+        self.updated = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.cooldown_until = 0.0
+
+    def observe(self, latency: float, now: float):
+        if self.ewma is None:
+            self.ewma = latency
+        else:
+            weight = math.exp(-(now - self.updated) / self.decay)
+            self.ewma = weight * self.ewma + (1 - weight) * latency
+        self.updated = now
+
+    def score(self, now: float, probe_interval: float) -> float:
+        # Expected wait: latency times the requests queued on the replica.
+        # Replicas never measured, or not for probe_interval, score 0 so
+        # that they are tried and their latency refreshed.
+        if self.ewma is None or now - self.updated > probe_interval:
+            return 0.0
+        return self.ewma * (self.in_flight + 1)
+
+    def snapshot(self, now: float) -> Dict:
+        return {
+            "ewma": self.ewma,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "cooling_down": self.cooldown_until > now,
+        }
+
+
+class ReplicatedEndpointClient:
+    """
+    Queries a model deployed to several endpoints, possibly in different
+    workspaces or regions.
+
+    Each call goes to the better of two randomly picked replicas (power of
+    two choices), ranked by their latency EWMA times their in-flight calls.
+    This favours fast replicas while spreading load over all of them, so
+    throughput grows with the number of replicas. A replica answering with
+    throttling, a 5xx or a connection error is skipped for a cooldown, and
+    the call fails over to the next best replica.
+
+    With a circuit_breaker in the client options, a replica whose breaker
+    is open is failed over too. The breaker's fallback only answers once
+    every replica tried had its breaker open.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[Union[Replica, Tuple[str, str, str]]],
+        decay: float = DEFAULT_DECAY,
+        cooldown: float = DEFAULT_COOLDOWN,
+        probe_interval: float = DEFAULT_PROBE_INTERVAL,
+        max_attempts: int = None,
+        seed: int = None,
+        **client_options,
+    ):
+        """
+        Instantiates a ReplicatedEndpointClient. Parameters.
+
+        replicas: Replicas, or (base_url, token, endpoint_name) tuples.
+        decay: Seconds over which the weight of a latency sample decays.
+        cooldown: Seconds a failing replica is skipped. Throttled replicas
+        are skipped for their Retry-After instead, when sent, and replicas
+        whose circuit breaker is open until it lets calls through again.
+        probe_interval: Seconds after which a replica not queried since is
+        tried again.
+        max_attempts: Replicas tried per call, all of them by default.
+        seed: Seed of the replica sampling, for tests.
+        client_options: EndpointClient parameters shared by the replicas'
+        clients, e.g. pool_maxsize or read_timeout.
+        """
+        if not replicas:
+            raise ValueError("At least one replica is required")
+        self.replicas = [r if isinstance(r, Replica) else Replica(*r) for r in replicas]
+        breaker = client_options.get("circuit_breaker")
+        self.fallback = breaker.fallback if breaker is not None else None
+        if self.fallback is not None:
+            # Answered by the replica's client, it would prevent failover.
+            client_options["circuit_breaker"] = replace(breaker, fallback=None)
+        self.clients = [
+            EndpointClient(r.base_url, r.token, **client_options) for r in self.replicas
+        ]
+        self.states = [ReplicaState(r, decay) for r in self.replicas]
+        self.cooldown = cooldown
+        self.probe_interval = probe_interval
+        self.max_attempts = min(max_attempts or len(self.replicas), len(self.replicas))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def close(self):
+        for client in self.clients:
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def query_inference_endpoint(self, data: Dict) -> Dict:
+        """
+        Queries the best replica, failing over to the others on throttling
+        and server or connection errors.
+
+        data: Payload containing the data expected by the model.
+        """
+
+        tried: List[int] = []
+        open_breakers: List[bool] = []
+        while True:
+            index = self._pick(tried)
+            tried.append(index)
+            state = self.states[index]
+            start = time.monotonic()
+            try:
+                response = self.clients[index].query_inference_endpoint(
+                    state.replica.endpoint_name, data
+                )
+            except FAILOVER_ERRORS as e:
+                self._failed(state, e)
+                open_breakers.append(isinstance(e, CircuitOpenError))
+                if len(tried) < self.max_attempts:
+                    continue
+                if self.fallback is not None and all(open_breakers):
+                    return self.fallback(state.replica.endpoint_name, data, e)
+                raise
+            except BaseException:
+                self._release(state)
+                raise
+            self._succeeded(state, time.monotonic() - start)
+            return response
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Returns the latency EWMA, in-flight, request, error and throttled
+        counts of every replica, and whether it is cooling down.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            return {s.replica.name: s.snapshot(now) for s in self.states}
+
+    def _pick(self, tried: List[int]) -> int:
+        now = time.monotonic()
+        with self._lock:
+            candidates = [i for i in range(len(self.states)) if i not in tried]
+            ready = [i for i in candidates if self.states[i].cooldown_until <= now]
+            # When every replica is cooling down, the least recently failed
+            # one is still better than failing the call.
+            if not ready:
+                ready = [min(candidates, key=lambda i: self.states[i].cooldown_until)]
+            if len(ready) > 1:
+                ready = self._random.sample(ready, 2)
+            index = min(
+                ready, key=lambda i: self.states[i].score(now, self.probe_interval)
+            )
+            state = self.states[index]
+            state.in_flight += 1
+            state.requests += 1
+            return index
+
+    def _succeeded(self, state: ReplicaState, latency: float):
+        with self._lock:
+            state.in_flight -= 1
+            state.observe(latency, time.monotonic())
+
+    def _failed(self, state: ReplicaState, error: Exception):
+        now = time.monotonic()
+        cooldown = self.cooldown
+        with self._lock:
+            state.in_flight -= 1
+            if isinstance(error, ThrottledError):
+                state.throttled += 1
+            else:
+                state.errors += 1
+            # An open circuit breaker knows when it lets calls through again.
+            if isinstance(error, (ThrottledError, CircuitOpenError)):
+                if error.retry_after is not None:
+                    cooldown = error.retry_after
+            state.cooldown_until = max(state.cooldown_until, now + cooldown)
+
+    def _release(self, state: ReplicaState):
+        with self._lock:
+            state.in_flight -= 1
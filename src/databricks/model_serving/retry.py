@@ -0,0 +1,74 @@
+import random
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+from databricks.model_serving.exceptions import EndpointClientError
+
+IDEMPOTENT_METHODS = frozenset({"GET", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Decides whether, and after how long, a failed request is retried.
+
+    max_attempts: Total number of attempts, including the first one.
+    backoff_base: Backoff ceiling of the first retry, in seconds.
+    backoff_max: Upper bound of the exponential backoff ceiling.
+    deadline: Total seconds budget for a call, across all its attempts.
+    retry_methods: HTTP methods retried by default (idempotent ones).
+    retry_invocations: Whether query_inference_endpoint calls are retried.
+    Only enable this when scoring the same payload twice is harmless.
+    retry_status_codes: HTTP status codes considered transient.
+
+    Delays use exponential backoff with full jitter, i.e. a uniformly random
+    delay in [0, min(backoff_max, backoff_base * 2 ** attempt)], unless the
+    server sent a Retry-After header, which takes precedence.
+    """
+
+    max_attempts: int = 5
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    deadline: Optional[float] = 120.0
+    retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS
+    retry_invocations: bool = False
+    retry_status_codes: FrozenSet[int] = RETRYABLE_STATUS_CODES
+
+    def retries(self, method: str) -> bool:
+        return method.upper() in self.retry_methods
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Whether an API error is transient. Transport errors (connection
+        resets, timeouts) are classified by the client that raised them.
+        """
+
+        if isinstance(error, EndpointClientError):
+            return error.status_code in self.retry_status_codes
+        return False
+
+    def backoff(self, attempt: int) -> float:
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    def delay(
+        self, attempt: int, elapsed: float, retry_after: float = None
+    ) -> Optional[float]:
+        """
+        Returns the delay before the next attempt, or None to give up.
+
+        attempt: Zero-based index of the attempt that just failed.
+        elapsed: Seconds spent on the call so far.
+        retry_after: Delay requested by the server, if any.
+        """
+
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = retry_after if retry_after is not None else self.backoff(attempt)
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
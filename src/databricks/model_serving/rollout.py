@@ -0,0 +1,330 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from databricks.model_serving.metrics import Histogram, RequestTiming
+from databricks.model_serving.waiter import DEFAULT_WAIT_TIMEOUT
+
+DEFAULT_SCHEDULE = (1, 5, 25, 50, 100)
+DEFAULT_STEP_DURATION = 300.0
+DEFAULT_CHECK_INTERVAL = 10.0
+
+COMPLETED = "completed"
+ROLLED_BACK = "rolled_back"
+ROLLBACK_FAILED = "rollback_failed"
+
+# Fields of a served model set by the service, not accepted in updates.
+READ_ONLY_FIELDS = ("state", "creator", "creation_timestamp")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RolloutSLO:
+    """
+    Service level objective gating each rollout step, as observed by the
+    client on the candidate served model.
+
+    max_p99: Highest acceptable p99 latency, in seconds. None to ignore.
+    max_error_rate: Highest acceptable fraction of 5xx answers. None to
+    ignore.
+    min_requests: Candidate invocations needed before a step is judged.
+
+    Only answered invocations are judged: connection errors and timeouts
+    have no served-model-name header to attribute them to the candidate.
+    """
+
+    max_p99: Optional[float] = None
+    max_error_rate: Optional[float] = 0.01
+    min_requests: int = 100
+
+    def breach(self, requests: int, errors: int, p99: Optional[float]) -> str:
+        """
+        Returns why the observations breach the SLO, None if they do not.
+        """
+
+        if self.max_error_rate is not None and requests:
+            error_rate = errors / requests
+            if error_rate > self.max_error_rate:
+                return f"error rate {error_rate:.2%} > {self.max_error_rate:.2%}"
+        if self.max_p99 is not None and p99 is not None and p99 > self.max_p99:
+            return f"p99 {p99 * 1000:.1f}ms > {self.max_p99 * 1000:.1f}ms"
+        return None
+
+
+@dataclass
+class RolloutStep:
+    """
+    Observations of the candidate while it got `percentage` of the traffic.
+
+    breach: Why the step failed, None when it passed.
+    """
+
+    percentage: int
+    requests: int = 0
+    errors: int = 0
+    p99: Optional[float] = None
+    elapsed: float = 0.0
+    breach: Optional[str] = None
+
+
+@dataclass
+class RolloutResult:
+    """
+    COMPLETED, ROLLED_BACK to the original traffic_config with a reason, or
+    ROLLBACK_FAILED when restoring it failed too, the candidate keeping
+    the traffic of the failed step.
+    """
+
+    status: str
+    steps: List[RolloutStep] = field(default_factory=list)
+    reason: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == COMPLETED
+
+
+class RolloutController:
+    """
+    Shifts an endpoint's traffic to a candidate served model step by step.
+
+    At each step of the schedule the candidate's traffic_percentage is
+    raised, the rest being split between the other served models in their
+    original proportions. The step then lasts step_duration seconds, during
+    which the candidate's latency and error rate are observed on the
+    invocations sent through the client. The served model answering each
+    invocation is read from the served-model-name response header. When the
+    SLO is breached, or a config update fails, the original traffic_config
+    is restored.
+
+    The controller only observes traffic: the application keeps querying
+    the endpoint with the same client while run() is in progress.
+    """
+
+    def __init__(
+        self,
+        client,
+        endpoint_name: str,
+        candidate: str,
+        slo: RolloutSLO = None,
+        schedule: Sequence[int] = DEFAULT_SCHEDULE,
+        step_duration: float = DEFAULT_STEP_DURATION,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+        max_step_duration: float = None,
+        update_timeout: float = DEFAULT_WAIT_TIMEOUT,
+        on_step: Callable[[RolloutStep], None] = None,
+    ):
+        """
+        Instantiates a RolloutController. Parameters.
+
+        client: EndpointClient used to update the endpoint and whose
+        invocations are observed.
+        endpoint_name: Serving endpoint name.
+        candidate: Served model name receiving more and more traffic.
+        slo: RolloutSLO gating each step. Defaults to a 1% error rate.
+        schedule: Candidate traffic percentages, in order.
+        step_duration: Seconds each step is observed before the next one.
+        check_interval: Seconds between SLO checks within a step.
+        max_step_duration: Seconds a step may wait for slo.min_requests
+        candidate invocations before rolling back. Defaults to three times
+        step_duration.
+        update_timeout: Seconds to wait for each config update.
+        on_step: Callable receiving every finished RolloutStep.
+        """
+        self.client = client
+        self.endpoint_name = endpoint_name
+        self.candidate = candidate
+        self.slo = slo if slo is not None else RolloutSLO()
+        self.schedule = list(schedule)
+        self.step_duration = step_duration
+        self.check_interval = check_interval
+        self.max_step_duration = (
+            max_step_duration if max_step_duration is not None else 3 * step_duration
+        )
+        self.update_timeout = update_timeout
+        self.on_step = on_step
+        self._latency = Histogram()
+        self._requests = 0
+        self._errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, timing: RequestTiming):
+        """
+        Request hook recording the candidate's invocations.
+        """
+
+        if (
+            timing.route != "invocations"
+            or timing.endpoint_name != self.endpoint_name
+            or timing.served_model_name != self.candidate
+        ):
+            return
+        with self._lock:
+            self._requests += 1
+            if timing.status_code >= 500:
+                self._errors += 1
+            else:
+                self._latency.observe(timing.total)
+
+    def run(self) -> RolloutResult:
+        """
+        Runs the rollout until the candidate gets the last percentage of
+        the schedule, or until it is rolled back.
+
+        An exception raised mid-rollout, e.g. KeyboardInterrupt, restores
+        the original traffic_config before being re-raised.
+        """
+
+        endpoint = self.client.get_inference_endpoint(self.endpoint_name, refresh=True)
+        config = endpoint.get("config", {})
+        served_models = [
+            {k: v for k, v in served_model.items() if k not in READ_ONLY_FIELDS}
+            for served_model in config.get("served_models", [])
+        ]
+        original = config.get("traffic_config")
+        weights = self._baseline_weights(served_models, original)
+
+        result = RolloutResult(COMPLETED)
+        self.client.request_hooks.append(self.observe)
+        try:
+            for percentage in self.schedule:
+                step = RolloutStep(percentage)
+                result.steps.append(step)
+                routes = self._routes(percentage, weights)
+                try:
+                    step.breach = self._update(served_models, {"routes": routes})
+                except BaseException:
+                    self._rollback(result, served_models, original, "interrupted")
+                    raise
+                try:
+                    if step.breach is None:
+                        step.breach = self._watch(step)
+                    logger.info(
+                        "Rollout of %s on %s at %s%%: %s",
+                        self.candidate,
+                        self.endpoint_name,
+                        percentage,
+                        step.breach or "passed",
+                    )
+                    if self.on_step is not None:
+                        self.on_step(step)
+                except BaseException:
+                    self._rollback(
+                        result, served_models, original, f"{percentage}%: interrupted"
+                    )
+                    raise
+                if step.breach is not None:
+                    self._rollback(
+                        result, served_models, original, f"{percentage}%: {step.breach}"
+                    )
+                    break
+        finally:
+            self.client.request_hooks.remove(self.observe)
+        return result
+
+    def _rollback(
+        self,
+        result: RolloutResult,
+        served_models: List[Dict],
+        original: Optional[Dict],
+        reason: str,
+    ):
+        error = self._update(served_models, original)
+        if error is None:
+            result.status, result.reason = ROLLED_BACK, reason
+            logger.warning(
+                "Rolled back %s on %s: %s", self.candidate, self.endpoint_name, reason
+            )
+        else:
+            result.status = ROLLBACK_FAILED
+            result.reason = f"{reason}; rollback failed: {error}"
+            logger.error(
+                "Rollback of %s on %s failed: %s",
+                self.candidate,
+                self.endpoint_name,
+                error,
+            )
+
+    def _baseline_weights(
+        self, served_models: List[Dict], traffic_config: Optional[Dict]
+    ) -> Dict[str, float]:
+        names = [served_model.get("name") for served_model in served_models]
+        if self.candidate not in names:
+            raise ValueError(
+                f"{self.candidate} is not served by {self.endpoint_name}: {names}"
+            )
+        routes = (traffic_config or {}).get("routes") or []
+        weights = {
+            route["served_model_name"]: float(route.get("traffic_percentage", 0))
+            for route in routes
+            if route.get("served_model_name") != self.candidate
+        }
+        if not any(weights.values()):
+            weights = {name: 1.0 for name in names if name != self.candidate}
+        if not weights and any(p < 100 for p in self.schedule):
+            raise ValueError(f"{self.endpoint_name} serves no other model")
+        return weights
+
+    def _routes(self, percentage: int, weights: Dict[str, float]) -> List[Dict]:
+        # Splits the remaining traffic in whole percentages, largest
+        # remainders first, so that the routes always add up to 100.
+        remaining = 100 - percentage
+        total = sum(weights.values())
+        shares = {name: remaining * w / total for name, w in weights.items()}
+        whole = {name: int(share) for name, share in shares.items()}
+        left = remaining - sum(whole.values())
+        for name in sorted(shares, key=lambda n: whole[n] - shares[n])[:left]:
+            whole[name] += 1
+        routes = [
+            {"served_model_name": self.candidate, "traffic_percentage": percentage}
+        ]
+        routes.extend(
+            {"served_model_name": name, "traffic_percentage": share}
+            for name, share in whole.items()
+        )
+        return routes
+
+    def _update(self, served_models: List[Dict], traffic_config: Dict) -> str:
+        try:
+            self.client.update_served_models(
+                self.endpoint_name, served_models, traffic_config
+            )
+            wait = self.client.wait_for_config_update(
+                self.endpoint_name, timeout=self.update_timeout
+            )
+        except Exception as e:
+            return f"config update failed: {e}"
+        if wait.failed:
+            return "config update failed"
+        return None
+
+    def _watch(self, step: RolloutStep) -> str:
+        with self._lock:
+            self._latency = Histogram()
+            self._requests = self._errors = 0
+        start = time.monotonic()
+        while True:
+            remaining = self.step_duration - (time.monotonic() - start)
+            time.sleep(
+                min(self.check_interval, remaining)
+                if remaining > 0
+                else self.check_interval
+            )
+            step.elapsed = time.monotonic() - start
+            with self._lock:
+                step.requests, step.errors = self._requests, self._errors
+                step.p99 = self._latency.quantile(0.99)
+            if step.requests >= self.slo.min_requests:
+                breach = self.slo.breach(step.requests, step.errors, step.p99)
+                if breach is not None:
+                    return breach
+                if step.elapsed >= self.step_duration:
+                    return None
+            if step.elapsed >= self.max_step_duration:
+                return (
+                    f"{step.requests} candidate requests in {step.elapsed:.0f}s, "
+                    f"fewer than {self.slo.min_requests}"
+                )
@@ -0,0 +1,274 @@
+import copy
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from numbers import Number
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from databricks.model_serving.metrics import Histogram
+
+DEFAULT_SAMPLE_RATE = 0.1
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_SHADOW_WORKERS = 2
+DEFAULT_MAX_RECORDS = 10000
+# Seconds between checks of whether an idle worker should stop.
+STOP_CHECK_INTERVAL = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ShadowRecord:
+    """
+    Outcome of one mirrored request.
+
+    primary_latency, candidate_latency: Seconds each invocation took.
+    match: Whether both predictions agree within the tolerance.
+    max_abs_diff: Largest absolute difference between numeric predictions.
+    error: Exception type and message of a failed candidate call.
+    """
+
+    timestamp: float
+    endpoint_name: str
+    candidate_endpoint: str
+    primary_latency: float
+    candidate_latency: Optional[float] = None
+    match: Optional[bool] = None
+    max_abs_diff: Optional[float] = None
+    primary: Any = None
+    candidate: Any = None
+    payload: Any = None
+    error: Optional[str] = None
+
+
+def compare_predictions(
+    primary: Any, candidate: Any, tolerance: float = 1e-6
+) -> Tuple[bool, Optional[float]]:
+    """
+    Compares two responses (or their "predictions") element by element.
+
+    Returns whether they match, numbers being equal within tolerance, and
+    the largest absolute difference between numbers (None without any).
+    """
+
+    left = _flatten(_predictions(primary))
+    right = _flatten(_predictions(candidate))
+    if len(left) != len(right):
+        return False, None
+    match = True
+    max_diff = None
+    for a, b in zip(left, right):
+        if _is_number(a) and _is_number(b):
+            diff = abs(a - b)
+            max_diff = diff if max_diff is None else max(max_diff, diff)
+            match &= diff <= tolerance
+        else:
+            match &= a == b
+    return match, max_diff
+
+
+def _predictions(response: Any) -> Any:
+    if isinstance(response, dict) and "predictions" in response:
+        return response["predictions"]
+    return response
+
+
+def _flatten(value: Any) -> List:
+    if isinstance(value, dict):
+        return [x for key in sorted(value) for x in _flatten(value[key])]
+    if isinstance(value, (list, tuple)):
+        return [x for item in value for x in _flatten(item)]
+    return [value]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, Number) and not isinstance(value, bool)
+
+
+class ShadowMirror:
+    """
+    Mirrors a sample of an endpoint's invocations to a candidate endpoint.
+
+    Mirrored payloads go through a bounded queue served by background
+    threads. When the queue is full the payload is dropped, so mirroring
+    never slows down or fails the primary call. Each mirrored call is
+    compared with the primary response and kept as a ShadowRecord.
+    """
+
+    def __init__(
+        self,
+        client,
+        endpoint_name: str,
+        candidate_endpoint: str,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        workers: int = DEFAULT_SHADOW_WORKERS,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        tolerance: float = 1e-6,
+        keep_payloads: bool = False,
+        sink: Callable[[ShadowRecord], None] = None,
+    ):
+        """
+        Instantiates a ShadowMirror. Parameters.
+
+        client: EndpointClient used for the candidate calls.
+        endpoint_name: Primary serving endpoint name.
+        candidate_endpoint: Endpoint receiving the mirrored payloads.
+        sample_rate: Fraction of primary invocations mirrored.
+        queue_size: Mirrored payloads waiting at most; more are dropped.
+        workers: Threads sending mirrored payloads.
+        max_records: Most recent ShadowRecords kept in memory.
+        tolerance: Largest numeric difference still counted as a match.
+        keep_payloads: Store the payloads in the records, for replay.
+        sink: Optional callable receiving every ShadowRecord, e.g. to write
+        them to a file for offline comparison.
+        """
+        self.client = client
+        self.endpoint_name = endpoint_name
+        self.candidate_endpoint = candidate_endpoint
+        self.sample_rate = sample_rate
+        self.tolerance = tolerance
+        self.keep_payloads = keep_payloads
+        self.sink = sink
+        self.records: Deque[ShadowRecord] = deque(maxlen=max_records)
+        self.counts = {
+            "offered": 0,
+            "mirrored": 0,
+            "dropped": 0,
+            "errors": 0,
+            "matches": 0,
+            "mismatches": 0,
+        }
+        self.primary_latency = Histogram()
+        self.candidate_latency = Histogram()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(
+                target=self._run, name=f"shadow-{candidate_endpoint}", daemon=True
+            )
+            for _ in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def offer(self, data: Dict, response: Any, latency: float) -> bool:
+        """
+        Called after a successful primary invocation. Queues it for
+        mirroring if it is sampled and the queue has room, without blocking.
+        Sampled payloads and responses are copied, so that callers may
+        modify theirs once the call returns.
+        """
+
+        with self._lock:
+            self.counts["offered"] += 1
+            if self._random.random() >= self.sample_rate:
+                return False
+        item = (time.time(), copy.deepcopy(data), copy.deepcopy(response), latency)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.counts["dropped"] += 1
+            return False
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self.counts,
+                "queued": self._queue.qsize(),
+                "primary_latency": self.primary_latency.to_dict(),
+                "candidate_latency": self.candidate_latency.to_dict(),
+            }
+
+    def write_jsonl(self, path: str):
+        """
+        Writes the kept ShadowRecords to a JSON Lines file.
+        """
+
+        with self._lock:
+            records = list(self.records)
+        with open(path, "w") as f:
+            for record in records:
+                f.write(json.dumps(asdict(record), default=str) + "\n")
+
+    def close(self, wait: bool = True, timeout: float = None):
+        """
+        Stops the workers. wait: Mirror the queued payloads first, otherwise
+        they are discarded. timeout: Seconds to wait for each worker.
+
+        Never blocks on a full queue: workers stop once it is empty.
+        """
+
+        if not wait:
+            try:
+                while True:
+                    self._queue.get_nowait()
+            except queue.Empty:
+                pass
+        self._stop.set()
+        # Wakes idle workers at once; busy ones see the stop event later.
+        try:
+            for _ in self._threads:
+                self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=STOP_CHECK_INTERVAL)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            if item is None:
+                return
+            try:
+                self._mirror(*item)
+            except Exception:
+                logger.exception(
+                    "Shadow mirroring to %s failed", self.candidate_endpoint
+                )
+
+    def _mirror(self, timestamp: float, data: Dict, response: Any, latency: float):
+        record = ShadowRecord(
+            timestamp,
+            self.endpoint_name,
+            self.candidate_endpoint,
+            latency,
+            primary=_predictions(response),
+            payload=data if self.keep_payloads else None,
+        )
+        start = time.monotonic()
+        try:
+            candidate = self.client._invoke(self.candidate_endpoint, data)
+        except Exception as e:
+            record.error = f"{type(e).__name__}: {e}"
+        else:
+            record.candidate_latency = time.monotonic() - start
+            record.candidate = _predictions(candidate)
+            record.match, record.max_abs_diff = compare_predictions(
+                response, candidate, self.tolerance
+            )
+        with self._lock:
+            self.counts["mirrored"] += 1
+            self.primary_latency.observe(latency)
+            if record.error is not None:
+                self.counts["errors"] += 1
+            else:
+                self.candidate_latency.observe(record.candidate_latency)
+                self.counts["matches" if record.match else "mismatches"] += 1
+            self.records.append(record)
+        if self.sink is not None:
+            self.sink(record)
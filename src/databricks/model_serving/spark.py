@@ -0,0 +1,133 @@
+import threading
+from typing import Dict, Iterator, List, Tuple
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.payloads import dataframe_split
+from databricks.model_serving.retry import RetryPolicy
+
+DEFAULT_MAX_ROWS = 1000
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# One pooled client per (workspace, token, pool size) and Python worker
+# process, reused by every task the worker runs.
+_CLIENTS: Dict[Tuple, EndpointClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def score_dataframe(
+    df,
+    endpoint_name: str,
+    base_url: str,
+    token: str,
+    feature_columns: List[str] = None,
+    output_col: str = "prediction",
+    result_type: str = "double",
+    error_col: str = None,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    retry_policy: RetryPolicy = None,
+):
+    """
+    Scores a Spark DataFrame through a serving endpoint with mapInPandas.
+
+    df: Spark DataFrame to score.
+    endpoint_name: Serving endpoint name.
+    base_url: A string pointing to your workspace URL.
+    token: Access Token for interacting with your Databricks Workspace.
+    feature_columns: Columns sent to the model, all columns by default.
+    output_col: Name of the predictions column added to df.
+    result_type: Spark type of the predictions column, as a DDL string.
+    error_col: Optional string column receiving the error of rows whose
+    request failed after retries. Without it, such rows get null predictions.
+    max_rows: Maximum number of rows sent per request.
+    max_in_flight: Maximum concurrent requests per partition.
+    retry_policy: Retry behaviour of the executor clients. Defaults to a
+    policy that also retries invocations.
+
+    Each Arrow batch is sent as dataframe_split chunks of up to max_rows
+    rows through a pooled EndpointClient shared by all tasks of a Python
+    worker.
+    """
+
+    from pyspark.sql.types import StringType, StructType
+
+    columns = list(feature_columns or df.columns)
+    schema = StructType(list(df.schema.fields)).add(output_col, result_type)
+    if error_col is not None:
+        schema = schema.add(error_col, StringType())
+    if retry_policy is None:
+        retry_policy = RetryPolicy(retry_invocations=True)
+
+    def score_partition(batches):
+        client = _executor_client(base_url, token, max_in_flight, retry_policy)
+        return score_batches(
+            client,
+            batches,
+            endpoint_name,
+            columns,
+            output_col=output_col,
+            error_col=error_col,
+            max_rows=max_rows,
+            max_in_flight=max_in_flight,
+        )
+
+    return df.mapInPandas(score_partition, schema)
+
+
+def score_batches(
+    client: EndpointClient,
+    batches: Iterator,
+    endpoint_name: str,
+    feature_columns: List[str],
+    output_col: str = "prediction",
+    error_col: str = None,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+) -> Iterator:
+    """
+    Adds a predictions column to each pandas DataFrame of an iterator.
+
+    This is the per-partition function behind score_dataframe, usable on its
+    own with any iterator of pandas DataFrames.
+    """
+
+    columns = [str(column) for column in feature_columns]
+
+    def build_payload(rows):
+        return {"dataframe_split": {"columns": columns, "data": rows}}
+
+    for batch in batches:
+        rows = dataframe_split(batch[feature_columns])["dataframe_split"]["data"]
+        result = client.query_inference_endpoint_bulk(
+            endpoint_name,
+            rows,
+            max_rows=max_rows,
+            max_workers=max_in_flight,
+            input_key="dataframe_split:" + ",".join(columns),
+            build_payload=build_payload,
+        )
+        batch = batch.copy()
+        batch[output_col] = result.predictions
+        if error_col is not None:
+            errors = [None] * len(batch)
+            for failure in result.failures:
+                for row in failure.rows:
+                    errors[row] = str(failure.error)
+            batch[error_col] = errors
+        yield batch
+
+
+def _executor_client(
+    base_url: str, token: str, max_in_flight: int, retry_policy: RetryPolicy
+) -> EndpointClient:
+    key = (base_url, token, max_in_flight, retry_policy)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = _CLIENTS[key] = EndpointClient(
+                base_url,
+                token,
+                pool_maxsize=max_in_flight,
+                retry_policy=retry_policy,
+            )
+        return client
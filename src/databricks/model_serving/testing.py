@@ -0,0 +1,602 @@
+"""
+A local stand-in for the model serving REST API, for tests and benchmarks.
+
+    with LocalServingServer(latency=lognormal(0.02, 0.5)) as server:
+        client = EndpointClient(server.base_url, "token")
+        client.create_inference_endpoint("my-endpoint", [{"model_name": "m"}])
+
+It implements the routes of databricks.model_serving.endpoint.Endpoint with
+in-memory endpoints, and can add latency, throttling and errors to them.
+"""
+
+import gzip
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from databricks.model_serving.compression import GZIP, decoder
+from databricks.model_serving.metrics import SERVED_MODEL_HEADER, parse_uri
+from databricks.model_serving.waiter import (
+    CONFIG_UPDATE_FAILED,
+    CONFIG_UPDATE_IN_PROGRESS,
+    NOT_READY,
+    READY,
+)
+
+NOT_UPDATING = "NOT_UPDATING"
+
+Latency = Union[float, Callable[[], float]]
+
+
+def constant(seconds: float) -> Callable[[], float]:
+    return lambda: seconds
+
+
+def uniform(low: float, high: float, rng: random.Random = None) -> Callable:
+    rng = rng or random.Random()
+    return lambda: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float, rng: random.Random = None) -> Callable:
+    """
+    Log-normal latencies: mostly close to median, with a long right tail
+    whose weight grows with sigma.
+    """
+
+    rng = rng or random.Random()
+    mu = math.log(median)
+    return lambda: rng.lognormvariate(mu, sigma)
+
+
+def with_tail(
+    latency: Latency, tail: Latency, probability: float, rng: random.Random = None
+) -> Callable:
+    """
+    Draws from tail with the given probability, from latency otherwise.
+    """
+
+    rng = rng or random.Random()
+    return lambda: _draw(tail if rng.random() < probability else latency)
+
+
+def _draw(latency: Latency) -> float:
+    return latency() if callable(latency) else latency
+
+
+@dataclass
+class Behavior:
+    """
+    How invocations of an endpoint are answered.
+
+    latency: Seconds (or a callable returning seconds) added to each
+    invocation.
+    concurrency_limit: Invocations in flight beyond this get a 429.
+    throttle_rate: Probability of answering an invocation with a 429.
+    error_rate: Probability of answering an invocation with error_status.
+    retry_after: Retry-After header value sent with 429 and 503 responses.
+    """
+
+    latency: Latency = 0.0
+    concurrency_limit: Optional[int] = None
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    retry_after: Optional[str] = None
+
+
+@dataclass
+class RecordedRequest:
+    method: str
+    path: str
+    body: Any
+    headers: Dict[str, str] = field(default_factory=dict)
+    timestamp: float = 0.0
+    size: int = 0
+
+
+@dataclass
+class _InjectedError:
+    status: int
+    count: int
+    route: Optional[str]
+    endpoint_name: Optional[str]
+    retry_after: Optional[str]
+
+
+def echo_predictions(endpoint_name: str, body: Any) -> Dict:
+    """
+    Default model: echoes "inputs"/"instances", sums the values of each
+    dataframe_split or dataframe_records row.
+    """
+
+    if not isinstance(body, dict):
+        return {"predictions": []}
+    if "inputs" in body:
+        return {"predictions": body["inputs"]}
+    if "instances" in body:
+        return {"predictions": body["instances"]}
+    if "dataframe_split" in body:
+        rows = body["dataframe_split"]["data"]
+        return {"predictions": [sum(row) for row in rows]}
+    if "dataframe_records" in body:
+        rows = body["dataframe_records"]
+        return {"predictions": [sum(row.values()) for row in rows]}
+    return {"predictions": []}
+
+
+class LocalServingServer:
+    """
+    Threaded HTTP server answering the serving endpoints REST API from
+    memory.
+
+    Endpoints created (or updated) through the API stay IN_PROGRESS for
+    config_update_delay seconds, then become READY with the new config, or
+    UPDATE_FAILED for endpoints passed to fail_config_updates(). Every
+    request is recorded in `requests`. Invocations of an endpoint are spread
+    over its served models following its traffic_config, and answered with
+    a served-model-name header.
+    """
+
+    def __init__(
+        self,
+        latency: Latency = 0.0,
+        concurrency_limit: int = None,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        retry_after: str = None,
+        api_latency: Latency = 0.0,
+        config_update_delay: float = 0.0,
+        predict: Callable[[str, Any], Dict] = echo_predictions,
+        strict: bool = False,
+        compress_responses: int = None,
+        seed: int = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Instantiates a LocalServingServer. Parameters.
+
+        latency, concurrency_limit, throttle_rate, error_rate, error_status,
+        retry_after: Default Behavior of invocations, see Behavior.
+        api_latency: Seconds added to every other (REST API) request.
+        config_update_delay: Seconds a config update stays IN_PROGRESS.
+        predict: Model answering invocations, from (endpoint name, body).
+        strict: Answer invocations of unknown endpoints with a 404. By
+        default any endpoint name can be invoked without creating it first.
+        compress_responses: Gzip responses of at least this many bytes to
+        clients accepting gzip. Responses are not compressed by default.
+        seed: Seed of the random draws (throttling, errors, traffic split).
+        """
+        self.behavior = Behavior(
+            latency,
+            concurrency_limit,
+            throttle_rate,
+            error_rate,
+            error_status,
+            retry_after,
+        )
+        self.behaviors: Dict[str, Behavior] = {}
+        self.api_latency = api_latency
+        self.config_update_delay = config_update_delay
+        self.predict = predict
+        self.strict = strict
+        self.compress_responses = compress_responses
+        self.requests: List[RecordedRequest] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._endpoints: Dict[str, Dict] = {}
+        self._updates: Dict[str, Tuple[float, bool]] = {}
+        self._failing: set = set()
+        self._events: Dict[str, List[Dict]] = {}
+        self._logs: Dict[Tuple[str, str], List[str]] = {}
+        self._errors: List[_InjectedError] = []
+        self._endpoint_in_flight: Dict[str, int] = {}
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalServingServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # Test controls
+
+    def add_endpoint(
+        self, name: str, served_models: List[Dict] = None, ready: bool = True
+    ) -> Dict:
+        """
+        Creates an endpoint directly, READY (or still updating) right away.
+        """
+
+        served_models = served_models or [{"model_name": name, "model_version": "1"}]
+        with self.lock:
+            self._create(name, {"served_models": served_models})
+            if ready:
+                self._updates[name] = (0.0, False)
+                self._advance(name)
+            return json.loads(json.dumps(self._endpoints[name]))
+
+    def set_behavior(self, endpoint_name: str, **changes) -> Behavior:
+        """
+        Overrides the default Behavior fields for one endpoint, or for one
+        of its served models with "endpoint_name/served_model_name".
+        """
+
+        with self.lock:
+            current = self.behaviors.get(endpoint_name, self.behavior)
+            behavior = self.behaviors[endpoint_name] = replace(current, **changes)
+            return behavior
+
+    def inject_errors(
+        self,
+        status: int,
+        count: int = 1,
+        route: str = "invocations",
+        endpoint_name: str = None,
+        retry_after: str = None,
+    ):
+        """
+        Answers the next count requests matching route (a route name as
+        returned by metrics.parse_uri, None for any) and endpoint_name with
+        an error status.
+        """
+
+        with self.lock:
+            self._errors.append(
+                _InjectedError(status, count, route, endpoint_name, retry_after)
+            )
+
+    def fail_config_updates(self, endpoint_name: str, fail: bool = True):
+        """
+        Makes the following config updates of an endpoint end in
+        UPDATE_FAILED, keeping its previous config.
+        """
+
+        with self.lock:
+            if fail:
+                self._failing.add(endpoint_name)
+            else:
+                self._failing.discard(endpoint_name)
+
+    def add_event(
+        self,
+        endpoint_name: str,
+        message: str,
+        event_type: str = "SERVED_MODEL_CONTAINER_EVENT",
+        served_model_name: str = None,
+    ):
+        with self.lock:
+            self._event(endpoint_name, message, event_type, served_model_name)
+
+    def append_logs(self, endpoint_name: str, served_model_name: str, *lines: str):
+        with self.lock:
+            key = (endpoint_name, served_model_name)
+            self._logs.setdefault(key, []).extend(lines)
+
+    def endpoint(self, name: str) -> Optional[Dict]:
+        with self.lock:
+            self._advance(name)
+            endpoint = self._endpoints.get(name)
+            return json.loads(json.dumps(endpoint)) if endpoint else None
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests.clear()
+            self.max_in_flight = self.in_flight
+
+    # Request handling
+
+    def handle(self, method: str, path: str, body: Any, headers: Dict, size: int = 0):
+        """
+        Returns (status, response body, extra headers) for a request.
+        """
+
+        with self.lock:
+            self.requests.append(
+                RecordedRequest(method, path, body, headers, time.time(), size)
+            )
+        endpoint_name, route = parse_uri(path)
+        injected = self._injected_error(route, endpoint_name)
+        if injected is not None:
+            return _error(injected.status, "Injected error", injected.retry_after)
+        if route == "invocations":
+            return self._invoke(endpoint_name, body)
+        time.sleep(_draw(self.api_latency))
+        with self.lock:
+            status, reply, headers = self._api(method, path, endpoint_name, route, body)
+            # Copy while locked: the reply may be a live endpoint record.
+            return status, json.loads(json.dumps(reply)), headers
+
+    def _invoke(self, endpoint_name: str, body: Any):
+        with self.lock:
+            self._advance(endpoint_name)
+            endpoint = self._endpoints.get(endpoint_name)
+            if endpoint is None and self.strict:
+                return _not_found(endpoint_name)
+            if endpoint is not None and endpoint["state"]["ready"] != READY:
+                return _error(503, f"Endpoint {endpoint_name} is not ready")
+            served_model_name = self._route(endpoint)
+            behavior = self.behaviors.get(
+                f"{endpoint_name}/{served_model_name}",
+                self.behaviors.get(endpoint_name, self.behavior),
+            )
+            extra = (
+                {SERVED_MODEL_HEADER: served_model_name} if served_model_name else {}
+            )
+            in_flight = self._endpoint_in_flight.get(endpoint_name, 0)
+            limit = behavior.concurrency_limit
+            if (limit is not None and in_flight >= limit) or (
+                self._random.random() < behavior.throttle_rate
+            ):
+                return _with_headers(
+                    _error(429, "Too many requests", behavior.retry_after), extra
+                )
+            failed = self._random.random() < behavior.error_rate
+            self._endpoint_in_flight[endpoint_name] = in_flight + 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(_draw(behavior.latency))
+            if failed:
+                error = _error(
+                    behavior.error_status, "Internal error", behavior.retry_after
+                )
+                return _with_headers(error, extra)
+            return 200, self.predict(endpoint_name, body), extra
+        finally:
+            with self.lock:
+                self._endpoint_in_flight[endpoint_name] -= 1
+                self.in_flight -= 1
+
+    def _route(self, endpoint: Optional[Dict]) -> Optional[str]:
+        # Picks the served model answering an invocation, weighted by the
+        # traffic_config routes. Called with the lock held.
+        if endpoint is None:
+            return None
+        routes = (endpoint.get("config", {}).get("traffic_config") or {}).get(
+            "routes"
+        ) or []
+        weights = [float(route.get("traffic_percentage", 0)) for route in routes]
+        if not routes or sum(weights) <= 0:
+            return None
+        route = self._random.choices(routes, weights)[0]
+        return route.get("served_model_name")
+
+    def _api(self, method: str, path: str, name: str, route: str, body: Any):
+        if route == "serving-endpoints":
+            if method == "GET":
+                for endpoint_name in list(self._endpoints):
+                    self._advance(endpoint_name)
+                return 200, {"endpoints": list(self._endpoints.values())}, {}
+            if method == "POST":
+                name = body.get("name")
+                if name in self._endpoints:
+                    return _error(400, f"Endpoint {name} already exists")
+                self._create(name, body.get("config", {}))
+                return 200, self._endpoints[name], {}
+            return _error(405, f"{method} not allowed")
+
+        self._advance(name)
+        endpoint = self._endpoints.get(name)
+        if endpoint is None:
+            return _not_found(name)
+        if route == "serving-endpoint" and method == "GET":
+            return 200, endpoint, {}
+        if route == "serving-endpoint" and method == "DELETE":
+            del self._endpoints[name]
+            self._updates.pop(name, None)
+            return 200, {}, {}
+        if route == "config" and method == "PUT":
+            if name in self._updates:
+                return _error(409, f"Endpoint {name} has an update in progress")
+            self._start_update(name, body)
+            return 200, endpoint, {}
+        if route == "events" and method == "GET":
+            return 200, {"events": self._events.get(name, [])}, {}
+        if route in ("logs", "build-logs") and method == "GET":
+            served_model_name = path.rstrip("/").split("/")[-2]
+            if route == "build-logs":
+                logs = [f"Building {served_model_name}", "Build succeeded"]
+            else:
+                logs = self._logs.get((name, served_model_name), [])
+            return 200, {"logs": "\n".join(logs)}, {}
+        return _error(404, f"No route for {method} {path}")
+
+    def _create(self, name: str, config: Dict):
+        now = _millis()
+        self._endpoints[name] = {
+            "name": name,
+            "id": uuid.uuid4().hex,
+            "creator": "stand-in",
+            "creation_timestamp": now,
+            "last_updated_timestamp": now,
+            "state": {"ready": NOT_READY, "config_update": NOT_UPDATING},
+        }
+        self._events[name] = []
+        self._start_update(name, config)
+
+    def _start_update(self, name: str, config: Dict):
+        endpoint = self._endpoints[name]
+        version = endpoint.get("config", {}).get("config_version", 0) + 1
+        endpoint["pending_config"] = _served_config(config, version)
+        endpoint["state"]["config_update"] = CONFIG_UPDATE_IN_PROGRESS
+        endpoint["last_updated_timestamp"] = _millis()
+        failed = name in self._failing
+        self._updates[name] = (time.monotonic() + self.config_update_delay, failed)
+        self._event(name, f"Config update to version {version} started")
+
+    def _advance(self, name: str):
+        # Config updates finish lazily, when the endpoint is next looked at.
+        update = self._updates.get(name)
+        if update is None or update[0] > time.monotonic():
+            return
+        del self._updates[name]
+        endpoint = self._endpoints[name]
+        pending = endpoint.pop("pending_config")
+        if update[1]:
+            endpoint["state"]["config_update"] = CONFIG_UPDATE_FAILED
+            self._event(
+                name, f"Config update to version {pending['config_version']} failed"
+            )
+            return
+        for served_model in pending["served_models"]:
+            served_model["state"] = {"deployment": "DEPLOYMENT_READY"}
+        endpoint["config"] = pending
+        endpoint["state"] = {"ready": READY, "config_update": NOT_UPDATING}
+        endpoint["last_updated_timestamp"] = _millis()
+        self._event(name, f"Config version {pending['config_version']} is ready")
+
+    def _event(
+        self,
+        name: str,
+        message: str,
+        event_type: str = "SERVING_ENDPOINT_EVENT",
+        served_model_name: str = None,
+    ):
+        event = {
+            "timestamp": _millis(),
+            "endpoint_name": name,
+            "type": event_type,
+            "message": message,
+        }
+        if served_model_name is not None:
+            event["served_model_name"] = served_model_name
+        self._events.setdefault(name, []).append(event)
+
+    def _injected_error(self, route: str, endpoint_name: str):
+        with self.lock:
+            for injected in self._errors:
+                if injected.route not in (None, route):
+                    continue
+                if injected.endpoint_name not in (None, endpoint_name):
+                    continue
+                injected.count -= 1
+                if injected.count <= 0:
+                    self._errors.remove(injected)
+                return injected
+        return None
+
+
+def _served_config(config: Dict, version: int) -> Dict:
+    served_models = []
+    for served_model in config.get("served_models", []):
+        served_model = dict(served_model)
+        served_model.setdefault(
+            "name",
+            f"{served_model.get('model_name')}-{served_model.get('model_version')}",
+        )
+        served_model["state"] = {"deployment": "DEPLOYMENT_CREATING"}
+        served_models.append(served_model)
+    traffic_config = config.get("traffic_config")
+    if traffic_config is None and served_models:
+        traffic_config = {
+            "routes": [
+                {
+                    "served_model_name": served_model["name"],
+                    "traffic_percentage": 100 // len(served_models),
+                }
+                for served_model in served_models
+            ]
+        }
+    return {
+        "served_models": served_models,
+        "traffic_config": traffic_config,
+        "config_version": version,
+    }
+
+
+def _error(status: int, message: str, retry_after: str = None):
+    codes = {400: "INVALID_PARAMETER_VALUE", 404: "RESOURCE_DOES_NOT_EXIST"}
+    codes.update({409: "RESOURCE_CONFLICT", 429: "REQUEST_LIMIT_EXCEEDED"})
+    body = {"error_code": codes.get(status, "INTERNAL_ERROR"), "message": message}
+    headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+    return status, body, headers
+
+
+def _with_headers(error: Tuple[int, Dict, Dict], headers: Dict):
+    status, body, error_headers = error
+    return status, body, {**error_headers, **headers}
+
+
+def _not_found(name: str):
+    return _error(404, f"Endpoint {name} does not exist")
+
+
+def _millis() -> int:
+    return int(time.time() * 1000)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self):
+        stand_in = self.server.stand_in
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        try:
+            decode = decoder(self.headers.get("Content-Encoding"))
+            body = json.loads(decode(raw) if decode else raw) if raw else None
+        except Exception as e:
+            status, reply, headers = _error(400, f"Malformed body: {e}")
+        else:
+            status, reply, headers = stand_in.handle(
+                self.command, self.path, body, dict(self.headers), len(raw)
+            )
+        payload = json.dumps(reply).encode()
+        threshold = stand_in.compress_responses
+        if (
+            threshold is not None
+            and len(payload) >= threshold
+            and GZIP in self.headers.get("Accept-Encoding", "")
+        ):
+            payload = gzip.compress(payload)
+            headers = {**headers, "Content-Encoding": GZIP}
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        try:
+            self.end_headers()
+            self.wfile.write(payload)
+        except ConnectionError:
+            # The client gave up on the request, e.g. an aborted hedge.
+            self.close_connection = True
+
+    do_GET = do_POST = do_PUT = do_DELETE = _reply
+
+    def log_message(self, *args):
+        pass
@@ -0,0 +1,186 @@
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+import urllib3.response
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 120.0
+
+# urllib3 decodes zstd responses when a zstd module it knows is installed.
+ZSTD_RESPONSES = getattr(urllib3.response, "HAS_ZSTD", False)
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+) -> requests.Session:
+    """
+    Creates a keep-alive requests.Session backed by a connection pool.
+
+    pool_connections: Number of per-host connection pools to keep around.
+    pool_maxsize: Maximum number of connections kept open per host.
+    pool_block: When True, callers wait for a free connection instead of
+    opening (and later discarding) connections beyond pool_maxsize.
+
+    The underlying urllib3 pools are thread-safe, so a single session can be
+    shared by every thread (and every EndpointClient) talking to a workspace.
+    """
+
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_connect_times = threading.local()
+_aborts = threading.local()
+
+
+def reset_connect_time():
+    """
+    Resets the connect time recorded for the current thread.
+    """
+
+    _connect_times.value = 0.0
+
+
+def connect_time() -> float:
+    """
+    Seconds the current thread spent opening connections since the last
+    reset_connect_time(), 0 when pooled connections were reused.
+    """
+
+    return getattr(_connect_times, "value", 0.0)
+
+
+class RequestAborted(Exception):
+    """
+    Raised in the thread whose request was aborted through a RequestAbort.
+    """
+
+
+class RequestAbort:
+    """
+    Aborts the HTTP request sent by the thread bound to it with abortable(),
+    e.g. the loser of a hedged call, from any other thread.
+
+    The socket of the request's connection is shut down, so that a read or
+    write blocked on it fails at once and urllib3 discards the connection
+    instead of returning it to the pool. Only connections of sessions
+    mounting a TimedHTTPAdapter, as created ones do, can be shut down.
+    """
+
+    def __init__(self):
+        self.aborted = False
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def abort(self):
+        with self._lock:
+            self.aborted = True
+            connection = self._connection
+        _shutdown(connection)
+
+    def _attach(self, connection):
+        with self._lock:
+            self._connection = connection
+            aborted = self.aborted
+        if aborted:
+            _shutdown(connection)
+
+
+@contextmanager
+def abortable(handle: RequestAbort):
+    """
+    Binds a RequestAbort to the requests the current thread sends within.
+    """
+
+    _aborts.handle = handle
+    try:
+        yield handle
+    finally:
+        _aborts.handle = None
+
+
+def check_aborted():
+    """
+    Raises RequestAborted if the current thread's requests were aborted.
+    """
+
+    handle = getattr(_aborts, "handle", None)
+    if handle is not None and handle.aborted:
+        raise RequestAborted("Request aborted")
+
+
+def _shutdown(connection):
+    sock = getattr(connection, "sock", None)
+    # socket.socket's own shutdown, as an SSLSocket's would also tear down
+    # the TLS state the blocked thread is reading through.
+    if isinstance(sock, socket.socket):
+        try:
+            socket.socket.shutdown(sock, socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _TimedConnectMixin:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            _connect_times.value = connect_time() + time.perf_counter() - start
+            # An abort may have come before this connection had a socket.
+            handle = getattr(_aborts, "handle", None)
+            if handle is not None and handle.aborted:
+                _shutdown(self)
+
+    def request(self, *args, **kwargs):
+        handle = getattr(_aborts, "handle", None)
+        if handle is not None:
+            handle._attach(self)
+        return super().request(*args, **kwargs)
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connections record how long TCP/TLS connects take,
+    readable per thread through connect_time().
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
@@ -0,0 +1,174 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import requests
+
+from databricks.model_serving.exceptions import (
+    NotFoundError,
+    ServerError,
+    ThrottledError,
+)
+
+CONFIG_UPDATE_IN_PROGRESS = "IN_PROGRESS"
+CONFIG_UPDATE_FAILED = "UPDATE_FAILED"
+READY = "READY"
+NOT_READY = "NOT_READY"
+
+UNTIL_CONFIG_UPDATED = "config_update"
+UNTIL_READY = "ready"
+
+DEFAULT_WAIT_TIMEOUT = 1800.0
+DEFAULT_INITIAL_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_BACKOFF_FACTOR = 1.5
+
+# Polling errors retried until the timeout.
+TRANSIENT_ERRORS = (
+    ThrottledError,
+    ServerError,
+    requests.ConnectionError,
+    requests.Timeout,
+)
+
+
+class WaitTimeoutError(TimeoutError):
+    """
+    Raised when endpoints do not settle before the timeout.
+
+    results: WaitResult of every endpoint, finished or not.
+    """
+
+    def __init__(self, message: str, results: Dict[str, "WaitResult"]):
+        super().__init__(message)
+        self.results = results
+
+
+@dataclass
+class StateTransition:
+    """
+    An endpoint state observed while waiting.
+
+    timestamp: Wall-clock time of the observation.
+    elapsed: Seconds since the wait started.
+    state: The endpoint's `state` field, None while it could not be found.
+    """
+
+    timestamp: float
+    elapsed: float
+    state: Optional[Dict]
+
+
+@dataclass
+class WaitResult:
+    """
+    Final state of an endpoint and the state transitions observed on the way.
+    """
+
+    endpoint_name: str
+    endpoint: Optional[Dict] = None
+    timeline: List[StateTransition] = field(default_factory=list)
+    done: bool = False
+    failed: bool = False
+
+    @property
+    def state(self) -> Optional[Dict]:
+        return self.endpoint.get("state") if self.endpoint else None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.done and not self.failed
+
+
+def wait_for_endpoints(
+    client,
+    endpoint_names: Sequence[str],
+    until: str = UNTIL_READY,
+    timeout: float = DEFAULT_WAIT_TIMEOUT,
+    initial_delay: float = DEFAULT_INITIAL_DELAY,
+    max_delay: float = DEFAULT_MAX_DELAY,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+) -> Dict[str, WaitResult]:
+    """
+    Waits until every endpoint has settled and returns their WaitResults.
+
+    client: EndpointClient used to poll.
+    endpoint_names: Endpoints to wait for.
+    until: UNTIL_READY waits for a READY endpoint with no update in
+    progress; UNTIL_CONFIG_UPDATED only for the config update to finish.
+    timeout: Seconds to wait before raising WaitTimeoutError.
+    initial_delay: First polling interval, in seconds.
+    max_delay: Ceiling of the polling interval.
+    backoff_factor: Growth of the polling interval while nothing changes.
+
+    A single endpoint is polled with get_inference_endpoint; several are
+    polled together with one list_inference_endpoints call per round. An
+    endpoint in a failure state (UPDATE_FAILED, or NOT_READY once its update
+    is over) stops being polled immediately and is reported as failed.
+    A poll failing with a transient error (throttling, 5xx, connection error
+    or timeout) is retried with the same backoff until the timeout.
+    """
+
+    if until not in (UNTIL_READY, UNTIL_CONFIG_UPDATED):
+        raise ValueError(f"Unknown wait condition: {until}")
+    results = {name: WaitResult(name) for name in endpoint_names}
+    start = time.monotonic()
+    delay = initial_delay
+    error = None
+    while True:
+        pending = [r for r in results.values() if not r.done]
+        changed = False
+        try:
+            endpoints = _poll(client, pending)
+        except TRANSIENT_ERRORS as e:
+            error = e
+        else:
+            error = None
+            for result, endpoint in zip(pending, endpoints):
+                changed |= _observe(result, endpoint, until, time.monotonic() - start)
+        if all(r.done for r in results.values()):
+            return results
+
+        elapsed = time.monotonic() - start
+        if elapsed >= timeout:
+            waiting = ", ".join(r.endpoint_name for r in results.values() if not r.done)
+            message = f"Timed out after {elapsed:.0f}s waiting for: {waiting}"
+            if error is not None:
+                message += f" (last poll failed: {error})"
+            raise WaitTimeoutError(message, results)
+        # Poll quickly again while states are moving, back off while idle.
+        delay = initial_delay if changed else min(max_delay, delay * backoff_factor)
+        time.sleep(min(delay, timeout - elapsed))
+
+
+def _poll(client, pending: List[WaitResult]) -> List[Optional[Dict]]:
+    if len(pending) == 1:
+        endpoint_name = pending[0].endpoint_name
+        # Like an endpoint missing from the listing, e.g. not created yet.
+        try:
+            return [client.get_inference_endpoint(endpoint_name, refresh=True)]
+        except NotFoundError:
+            return [None]
+    listing = client.list_inference_endpoints(refresh=True)
+    by_name = {e.get("name"): e for e in listing.get("endpoints", [])}
+    return [by_name.get(result.endpoint_name) for result in pending]
+
+
+def _observe(result: WaitResult, endpoint: Optional[Dict], until: str, elapsed: float):
+    result.endpoint = endpoint
+    state = result.state
+    if not result.timeline or result.timeline[-1].state != state:
+        result.timeline.append(StateTransition(time.time(), elapsed, state))
+        changed = True
+    else:
+        changed = False
+    if not state:
+        return changed
+
+    config_update = state.get("config_update")
+    if config_update == CONFIG_UPDATE_FAILED:
+        result.done = result.failed = True
+    elif config_update != CONFIG_UPDATE_IN_PROGRESS:
+        result.done = True
+        result.failed = until == UNTIL_READY and state.get("ready") == NOT_READY
+    return changed
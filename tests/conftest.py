@@ -3,6 +3,8 @@ from typing import List
 import pytest
 from _pytest.nodes import Item
 
+from databricks.model_serving.testing import LocalServingServer
+
 
 def pytest_collection_modifyitems(items: List[Item]):
     for item in items:
@@ -17,3 +19,9 @@ def unit_test_mocks(monkeypatch: None):
     """Include Mocks here to execute all commands offline and fast."""
     pass
 
+
+@pytest.fixture
+def local_server():
+    """A local stand-in serving server answering from memory."""
+    with LocalServingServer() as server:
+        yield server
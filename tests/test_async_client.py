@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from databricks.model_serving.async_client import AsyncEndpointClient
+from databricks.model_serving.concurrency import AIMDConfig
+
+
+def test_async_client_mirrors_rest_methods(local_server):
+
+    async def run():
+        async with AsyncEndpointClient(local_server.base_url, "FAKETOKEN") as client:
+            return [
+                await client.create_inference_endpoint("endpoint", [{"model_name": "mymodel"}]),
+                await client.get_inference_endpoint("endpoint"),
+                await client.list_inference_endpoints(),
+                await client.update_served_models("endpoint", [{"model_name": "mymodel"}]),
+                await client.query_inference_endpoint("endpoint", {"inputs": [1]}),
+                await client.get_inference_endpoint_events("endpoint"),
+                await client.delete_inference_endpoint("endpoint"),
+            ]
+
+    results = asyncio.run(run())
+
+    assert [r.method for r in local_server.requests] == [
+        "POST", "GET", "GET", "PUT", "POST", "GET", "DELETE"
+    ]
+    assert local_server.requests[4].path == "/serving-endpoints/endpoint/invocations"
+    assert local_server.requests[4].body == {"inputs": [1]}
+    assert results[1]["name"] == "endpoint"
+    assert [e["name"] for e in results[2]["endpoints"]] == ["endpoint"]
+    assert results[4] == {"predictions": [1]}
+    assert results[5]["events"]
+
+def test_async_client_bounds_concurrency(local_server):
+    local_server.behavior.latency = 0.05
+
+    async def run():
+        async with AsyncEndpointClient(
+            local_server.base_url, "FAKETOKEN", max_concurrency = 8
+        ) as client:
+            await asyncio.gather(
+                *[client.query_inference_endpoint("endpoint", {"inputs": [i]})
+                  for i in range(40)]
+            )
+
+    asyncio.run(run())
+
+    assert 1 < local_server.max_in_flight <= 8
+
+def test_async_bulk_query_preserves_order(local_server):
+
+    async def run():
+        async with AsyncEndpointClient(local_server.base_url, "FAKETOKEN") as client:
+            return await client.query_inference_endpoint_bulk(
+                "endpoint", [[i] for i in range(10)], max_rows = 3, input_key = "inputs"
+            )
+
+    result = asyncio.run(run())
+
+    assert result.ok
+    assert result.predictions == [[i] for i in range(10)]
+
+def test_async_adaptive_concurrency_caps_in_flight(local_server):
+    local_server.behavior.latency = 0.02
+
+    async def run():
+        async with AsyncEndpointClient(
+            local_server.base_url, "FAKETOKEN",
+            adaptive_concurrency = AIMDConfig(initial_limit = 4, max_limit = 4),
+        ) as client:
+            await asyncio.gather(
+                *[client.query_inference_endpoint("endpoint", {"inputs": [i]})
+                  for i in range(20)]
+            )
+            return client.concurrency_limits()
+
+    limits = asyncio.run(run())
+
+    assert local_server.max_in_flight <= 4
+    assert limits["endpoint"]["limit"] == 4
+    assert limits["endpoint"]["in_flight"] == 0
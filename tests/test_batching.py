@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from databricks.model_serving.batching import chunk_predictions, chunk_records
+
+
+def test_chunk_records_by_rows():
+
+    assert chunk_records(list(range(7)), max_rows = 3) == [(0, 3), (3, 6), (6, 7)]
+    assert chunk_records([], max_rows = 3) == []
+
+def test_chunk_records_by_bytes():
+    records = [{"x": "a" * 10}] * 10
+    record_size = len(json.dumps(records[0])) + 1
+
+    bounds = chunk_records(records, max_rows = 100, max_bytes = 3 * record_size + 2)
+
+    assert bounds == [(0, 3), (3, 6), (6, 9), (9, 10)]
+
+def test_chunk_records_oversized_record_gets_own_chunk():
+
+    bounds = chunk_records([{"x": "a" * 100}, {"x": 1}], max_rows = 10, max_bytes = 10)
+
+    assert bounds == [(0, 1), (1, 2)]
+
+def test_chunk_predictions_validates_length():
+
+    assert chunk_predictions({"predictions": [1, 2]}, 2) == [1, 2]
+    with pytest.raises(ValueError):
+        chunk_predictions({"predictions": [1]}, 2)
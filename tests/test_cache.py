@@ -0,0 +1,86 @@
+import requests_mock
+
+from databricks.model_serving import cache as cache_module
+from databricks.model_serving.cache import PredictionCache
+from databricks.model_serving.client import EndpointClient
+
+
+def test_cache_key_is_canonical():
+    cache = PredictionCache()
+
+    assert cache.key("e", {"a": 1, "b": 2}, 1) == cache.key("e", {"b": 2, "a": 1}, 1)
+    assert cache.key("e", {"a": 1}, 1) != cache.key("e", {"a": 1}, 2)
+
+def test_lru_eviction_and_stats():
+    cache = PredictionCache(max_entries = 2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    cache.get("a")
+    cache.put("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+    assert stats["entries"] == 2
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = PredictionCache(ttl = 10)
+    cache.put("a", b"1")
+
+    now[0] += 11
+
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+def test_memory_bound():
+    cache = PredictionCache(max_bytes = 1000)
+
+    for i in range(10):
+        cache.put(str(i), b"x" * 300)
+
+    assert cache.stats()["bytes"] <= 1000
+    assert cache.get("9") is not None
+
+def _endpoint(version):
+    return {"name": "endpoint", "config": {"config_version": version}}
+
+def test_client_serves_repeated_queries_from_cache():
+    cache = PredictionCache(version_ttl = 0)
+    client = EndpointClient("http://fake.url", "FAKETOKEN", prediction_cache = cache)
+
+    with requests_mock.Mocker() as m:
+        get = m.get(requests_mock.ANY, [{"json": _endpoint(1)}, {"json": _endpoint(1)}, {"json": _endpoint(2)}])
+        post = m.post(requests_mock.ANY, json = {"predictions": [1]})
+        first = client.query_inference_endpoint("endpoint", {"inputs": [1]})
+        second = client.query_inference_endpoint("endpoint", {"inputs": [1]})
+        third = client.query_inference_endpoint("endpoint", {"inputs": [1]})
+
+    assert first == second == third == {"predictions": [1]}
+    assert get.call_count == 3
+    assert post.call_count == 2
+
+def test_bulk_only_sends_cache_misses():
+    client = EndpointClient(
+        "http://fake.url", "FAKETOKEN", prediction_cache = PredictionCache()
+    )
+    sent = []
+
+    def score(request, context):
+        records = request.json()["dataframe_records"]
+        sent.extend(r["x"] for r in records)
+        return {"predictions": [r["x"] * 10 for r in records]}
+
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, json = _endpoint(1))
+        m.post(requests_mock.ANY, json = score)
+        client.query_inference_endpoint_bulk("endpoint", [{"x": i} for i in [1, 3]])
+        result = client.query_inference_endpoint_bulk(
+            "endpoint", [{"x": i} for i in range(5)], max_rows = 2
+        )
+
+    assert result.predictions == [0, 10, 20, 30, 40]
+    assert sent == [1, 3, 0, 2, 4]
+    assert client.prediction_cache.stats()["hits"] == 2
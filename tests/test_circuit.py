@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from databricks.model_serving import circuit
+from databricks.model_serving.async_client import AsyncEndpointClient
+from databricks.model_serving.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerConfig
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.exceptions import BadRequestError, CircuitOpenError, ServerError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit.time, "monotonic", lambda: now[0])
+    return now
+
+def _calls(breaker, count, error = None, latency = 0.0):
+    for _ in range(count):
+        breaker.record(breaker.acquire(), latency, error)
+
+def test_opens_on_failure_rate_and_recovers(clock):
+    transitions = []
+    breaker = CircuitBreaker("e", CircuitBreakerConfig(min_calls = 4, failure_rate = 0.5, open_duration = 10, half_open_calls = 2, on_transition = transitions.append))
+
+    _calls(breaker, 2)
+    _calls(breaker, 1, ServerError("boom", 500, ""))
+    assert breaker.state == CLOSED
+    _calls(breaker, 1, ServerError("boom", 500, ""))
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.acquire()
+    assert raised.value.retry_after == 10
+
+    clock[0] += 10
+    first, second = breaker.acquire(), breaker.acquire()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    breaker.record(first, 0.0)
+    breaker.record(second, 0.0)
+
+    assert breaker.state == CLOSED
+    assert [(t.from_state, t.to_state) for t in transitions] == [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)]
+    assert breaker.snapshot()["rejected"] == 2
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker("e", CircuitBreakerConfig(min_calls = 1, open_duration = 1))
+    _calls(breaker, 1, ServerError("boom", 500, ""))
+    clock[0] += 1
+
+    _calls(breaker, 1, ServerError("boom", 500, ""))
+
+    assert breaker.state == OPEN
+    assert breaker.transitions[-1].reason == "trial call failed"
+
+def test_slow_calls_open(clock):
+    breaker = CircuitBreaker("e", CircuitBreakerConfig(min_calls = 3, slow_call_duration = 1.0, slow_call_rate = 0.6))
+
+    _calls(breaker, 1, latency = 0.1)
+    _calls(breaker, 2, latency = 5.0)
+
+    assert breaker.state == OPEN
+    assert "slower than 1.0s" in breaker.transitions[-1].reason
+
+def test_window_forgets_old_calls(clock):
+    breaker = CircuitBreaker("e", CircuitBreakerConfig(window = 10, min_calls = 4))
+
+    _calls(breaker, 3, ServerError("boom", 500, ""))
+    clock[0] += 11
+    _calls(breaker, 3)
+
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["calls"] == 3
+
+def test_client_errors_and_cancellations_are_not_failures(clock):
+    breaker = CircuitBreaker("e", CircuitBreakerConfig(min_calls = 1))
+
+    _calls(breaker, 3, BadRequestError("bad", 400, ""))
+    _calls(breaker, 3, KeyboardInterrupt())
+
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["calls"] == 3 and breaker.snapshot()["failures"] == 0
+
+def test_client_fails_fast_then_uses_fallback(local_server):
+    local_server.behavior.error_rate = 1.0
+    config = CircuitBreakerConfig(min_calls = 3, open_duration = 60)
+    client = EndpointClient(local_server.base_url, "FAKETOKEN", circuit_breaker = config)
+
+    for _ in range(3):
+        with pytest.raises(ServerError):
+            client.query_inference_endpoint("e", {"inputs": [1]})
+    with pytest.raises(CircuitOpenError):
+        client.query_inference_endpoint("e", {"inputs": [1]})
+    client.circuit_breaker = CircuitBreakerConfig(fallback = lambda name, data, error: {"predictions": [], "fallback": name})
+    fallback = client.query_inference_endpoint("e", {"inputs": [1]})
+    breakers = client.circuit_breakers()
+
+    assert len(local_server.requests) == 3
+    assert fallback == {"predictions": [], "fallback": "e"}
+    assert breakers["e"]["state"] == OPEN
+    assert breakers["e"]["transitions"][0]["name"] == f"{local_server.base_url}/e"
+
+def test_async_client_breaker(local_server):
+    local_server.behavior.error_rate = 1.0
+
+    async def run():
+        async with AsyncEndpointClient(local_server.base_url, "FAKETOKEN", circuit_breaker = CircuitBreakerConfig(min_calls = 2)) as client:
+            for _ in range(2):
+                with pytest.raises(ServerError):
+                    await client.query_inference_endpoint("e", {"inputs": [1]})
+            with pytest.raises(CircuitOpenError):
+                await client.query_inference_endpoint("e", {"inputs": [1]})
+            return client.circuit_breakers()
+
+    assert asyncio.run(run())["e"]["state"] == OPEN
+    assert len(local_server.requests) == 2
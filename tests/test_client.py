@@ -1,4 +1,5 @@
 from databricks.model_serving.client import EndpointClient
+import requests
 import pytest
 import requests_mock
 
@@ -67,4 +68,49 @@ def test_update_served_models(response, client):
             traffic_config = {"model_a": 0.5, "model_b": 0.5}
         )
     
-    assert result is not None
\ No newline at end of file
+    assert result is not None
+
+def test_client_reuses_pooled_session(response, client):
+
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, text = response)
+        client.list_inference_endpoints()
+        client.get_inference_endpoint(endpoint_name = "endpoint")
+
+    assert m.call_count == 2
+    assert m.request_history[0].timeout == client.timeout
+    assert client.session.get_adapter("http://fake.url/").poolmanager.connection_pool_kw["maxsize"] == 10
+    sized = EndpointClient(base_url = "http://fake.url", token = "FAKETOKEN", pool_maxsize = 4)
+    assert sized.session.get_adapter("http://fake.url/").poolmanager.connection_pool_kw["maxsize"] == 4
+
+def test_client_shared_session_is_not_closed(url, mocker):
+
+    session = requests.Session()
+    close = mocker.spy(session, "close")
+    with EndpointClient(base_url = url, token = "FAKETOKEN", session = session) as c:
+        assert c.session is session
+
+    assert close.call_count == 0
+
+def test_query_inference_endpoint_bulk_preserves_order(client):
+
+    def score(request, context):
+        records = request.json()["dataframe_records"]
+        if records[0]["x"] == 4:
+            context.status_code = 500
+            return {"error": "boom"}
+        return {"predictions": [r["x"] * 10 for r in records]}
+
+    with requests_mock.Mocker() as m:
+        m.post(requests_mock.ANY, json = score)
+        result = client.query_inference_endpoint_bulk(
+            endpoint_name = "endpoint",
+            records = [{"x": i} for i in range(10)],
+            max_rows = 2,
+            max_workers = 3,
+        )
+
+    assert m.call_count == 5
+    assert result.predictions == [0, 10, 20, 30, None, None, 60, 70, 80, 90]
+    assert [(f.index, f.start, f.stop) for f in result.failures] == [(2, 4, 6)]
+    assert not result.ok
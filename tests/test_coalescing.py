@@ -0,0 +1,82 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.coalescing import MicroBatcher
+from databricks.model_serving.exceptions import ServerError
+
+
+def test_concurrent_records_share_invocations(local_server):
+    local_server.behavior.latency = 0.02
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    with MicroBatcher(client, max_batch_size = 8, max_delay = 0.05) as batcher:
+        with ThreadPoolExecutor(32) as pool:
+            predictions = list(pool.map(lambda i: batcher.predict("e", {"x": i, "y": 1}), range(32)))
+        stats = batcher.stats()
+
+    assert predictions == [i + 1 for i in range(32)]
+    assert len(local_server.requests) == stats["batches"] < 32
+    assert stats["records"] == 32
+    assert stats["batch_size"]["mean"] > 1
+    assert stats["queue_delay"]["count"] == 32
+
+def test_batch_is_sent_after_max_delay(local_server):
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    with MicroBatcher(client, max_batch_size = 100, max_delay = 0.01) as batcher:
+        assert batcher.predict("e", {"x": 2}, timeout = 5) == 2
+        stats = batcher.stats()
+
+    assert stats["batches"] == 1
+    assert 0.005 < stats["queue_delay"]["sum"] < 1
+
+def test_records_queue_while_every_slot_is_busy(local_server):
+    local_server.behavior.latency = 0.1
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    with MicroBatcher(client, max_delay = 0.001, max_concurrent_batches = 1) as batcher:
+        first = batcher.submit("e", {"x": 0})
+        time.sleep(0.02)
+        futures = [batcher.submit("e", {"x": i}) for i in range(1, 11)]
+        assert [f.result(timeout = 5) for f in [first] + futures] == list(range(11))
+        stats = batcher.stats()
+
+    assert stats["batches"] == len(local_server.requests) == 2
+    assert stats["batch_size"]["mean"] == 5.5
+    assert stats["queue_delay"]["sum"] > 0.5
+
+def test_endpoints_are_batched_separately(local_server):
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    with MicroBatcher(client, max_delay = 0.05) as batcher:
+        a = batcher.submit("a", {"x": 1})
+        b = batcher.submit("b", {"x": 2})
+        assert (a.result(), b.result()) == (1, 2)
+
+    assert sorted(r.path for r in local_server.requests) == [
+        "/serving-endpoints/a/invocations", "/serving-endpoints/b/invocations"
+    ]
+
+def test_invocation_error_reaches_every_caller(local_server):
+    local_server.inject_errors(500)
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    with MicroBatcher(client, max_delay = 0.05) as batcher:
+        futures = [batcher.submit("e", {"x": i}) for i in range(3)]
+        for future in futures:
+            with pytest.raises(ServerError):
+                future.result()
+
+def test_close_flushes_queue(local_server):
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+    batcher = MicroBatcher(client, max_delay = 60)
+    future = batcher.submit("e", {"x": 3})
+
+    batcher.close()
+
+    assert future.result(timeout = 0) == 3
+    with pytest.raises(RuntimeError):
+        batcher.submit("e", {"x": 1})
@@ -0,0 +1,69 @@
+import pytest
+import requests_mock
+
+from databricks.model_serving import codec as codec_module
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.codec import (
+    JsonCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+    default_codec,
+)
+
+
+def test_stdlib_codec_round_trip():
+    codec = StdlibJsonCodec()
+
+    data = codec.dumps({"dataframe_records": [{"a": 1.5}]})
+
+    assert data == b'{"dataframe_records":[{"a":1.5}]}'
+    assert codec.loads(data) == {"dataframe_records": [{"a": 1.5}]}
+
+def test_orjson_codec_serializes_numpy():
+    pytest.importorskip("orjson")
+    np = pytest.importorskip("numpy")
+    codec = OrjsonCodec()
+
+    data = codec.dumps({"inputs": np.array([[1.0, 2.0]], dtype = np.float32)})
+
+    assert codec.loads(data) == {"inputs": [[1.0, 2.0]]}
+
+def test_default_codec_is_stdlib_even_with_orjson(monkeypatch):
+    assert isinstance(default_codec(), StdlibJsonCodec)
+    assert isinstance(EndpointClient("http://fake.url", "FAKETOKEN").codec, StdlibJsonCodec)
+
+    monkeypatch.setattr(codec_module, "orjson", None)
+    with pytest.raises(ImportError):
+        OrjsonCodec()
+
+def test_codecs_differ_on_nan_and_big_integers():
+    pytest.importorskip("orjson")
+    stdlib, fast = StdlibJsonCodec(), OrjsonCodec()
+
+    assert stdlib.dumps([float("nan"), float("inf")]) == b"[NaN,Infinity]"
+    assert fast.dumps([float("nan"), float("inf")]) == b"[null,null]"
+    assert stdlib.dumps([2 ** 64]) == b"[18446744073709551616]"
+    with pytest.raises(TypeError):
+        fast.dumps([2 ** 64])
+
+def test_codec_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        JsonCodec()
+
+def test_client_sends_codec_bytes():
+
+    class RecordingCodec(StdlibJsonCodec):
+        loaded = []
+
+        def loads(self, data):
+            self.loaded.append(data)
+            return super().loads(data)
+
+    client = EndpointClient("http://fake.url", "FAKETOKEN", codec = RecordingCodec())
+    with requests_mock.Mocker() as m:
+        m.post(requests_mock.ANY, content = b'{"predictions": [1]}')
+        result = client.query_inference_endpoint("endpoint", {"inputs": [1]})
+
+    assert m.last_request.body == b'{"inputs":[1]}'
+    assert RecordingCodec.loaded == [b'{"predictions": [1]}']
+    assert result == {"predictions": [1]}
@@ -0,0 +1,76 @@
+import asyncio
+import gzip
+
+import pytest
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.compression import (
+    GZIP,
+    ZSTD,
+    Compression,
+    zstd_available,
+    zstd_decompress,
+)
+from databricks.model_serving.testing import LocalServingServer
+
+ROWS = [{"age": 0.038, "sex": 0.050, "bmi": 0.061, "bp": 0.021}] * 200
+
+
+def test_small_bodies_are_not_compressed():
+    body = b'{"inputs":[1]}'
+
+    assert Compression(threshold = 100).compress(body) == (body, None)
+
+def test_gzip_round_trip():
+    body = b'{"inputs":[' + b"1.0," * 1000 + b"1.0]}"
+
+    compressed, encoding = Compression(GZIP, threshold = 10).compress(body)
+
+    assert encoding == "gzip"
+    assert gzip.decompress(compressed) == body
+    assert len(compressed) < len(body) / 10
+
+@pytest.mark.skipif(not zstd_available(), reason = "no zstd module")
+def test_zstd_round_trip():
+    body = b'{"inputs":[' + b"1.0," * 1000 + b"1.0]}"
+
+    compressed, encoding = Compression(ZSTD, threshold = 10).compress(body)
+
+    assert encoding == "zstd"
+    assert zstd_decompress(compressed) == body
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        Compression("lz4")
+
+@pytest.mark.parametrize("algorithm", [GZIP, pytest.param(ZSTD, marks = pytest.mark.skipif(not zstd_available(), reason = "no zstd module"))])
+def test_client_sends_compressed_bodies(local_server, algorithm):
+    client = EndpointClient(local_server.base_url, "FAKETOKEN", compression = Compression(algorithm, threshold = 1024))
+
+    response = client.query_inference_endpoint("e", {"dataframe_records": ROWS})
+    client.query_inference_endpoint("e", {"inputs": [1]})
+
+    assert response["predictions"] == [sum(ROWS[0].values())] * 200
+    large, small = local_server.requests
+    assert large.headers["Content-Encoding"] == algorithm
+    assert large.size < len(str(ROWS)) / 5
+    assert "Content-Encoding" not in small.headers
+
+def test_clients_decode_compressed_responses():
+    with LocalServingServer(compress_responses = 100) as server:
+        client = EndpointClient(server.base_url, "FAKETOKEN")
+        response = client.query_inference_endpoint("e", {"inputs": list(range(100))})
+        assert response["predictions"] == list(range(100))
+        assert "gzip" in server.requests[0].headers["Accept-Encoding"]
+
+        pytest.importorskip("aiohttp")
+        from databricks.model_serving.async_client import AsyncEndpointClient
+
+        async def run():
+            async with AsyncEndpointClient(
+                server.base_url, "FAKETOKEN", compression = Compression(threshold = 10)
+            ) as client:
+                return await client.query_inference_endpoint("e", {"inputs": list(range(100))})
+
+        assert asyncio.run(run())["predictions"] == list(range(100))
+        assert server.requests[1].headers["Content-Encoding"] == "gzip"
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+import requests_mock
+
+from databricks.model_serving import concurrency
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.concurrency import AdaptiveLimiter, AIMDConfig
+from databricks.model_serving.exceptions import ThrottledError
+
+
+def test_limit_grows_additively_when_saturated():
+    limiter = AdaptiveLimiter(AIMDConfig(initial_limit = 2, latency_tolerance = None))
+
+    for _ in range(20):
+        starts = [limiter.acquire(), limiter.acquire()]
+        for start in starts:
+            limiter.release(start)
+
+    assert limiter.limit > 2
+    assert limiter.history[-1][1] == limiter.limit
+
+def test_burst_of_throttles_decreases_once():
+    limiter = AdaptiveLimiter(AIMDConfig(initial_limit = 10, decrease_factor = 0.5))
+
+    starts = [limiter.acquire() for _ in range(5)]
+    for start in starts:
+        limiter.release(start, throttled = True)
+
+    assert limiter.limit == 5
+    limiter.release(limiter.acquire(), throttled = True)
+    assert limiter.limit == 2
+
+def test_limit_is_bounded():
+    limiter = AdaptiveLimiter(AIMDConfig(initial_limit = 2, min_limit = 2))
+
+    limiter.release(limiter.acquire(), throttled = True)
+
+    assert limiter.limit == 2
+
+def test_slow_responses_count_as_overload():
+    limiter = AdaptiveLimiter(AIMDConfig(initial_limit = 4, latency_threshold = 0.01))
+
+    start = limiter.acquire()
+    time.sleep(0.02)
+    limiter.release(start)
+
+    assert limiter.limit == 2
+
+def test_baseline_follows_a_lasting_latency_change(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(concurrency.time, "monotonic", lambda: clock[0])
+    limiter = AdaptiveLimiter(AIMDConfig(initial_limit = 32, baseline_window = 50))
+
+    def call(latency):
+        starts = [limiter.acquire() for _ in range(limiter.limit)]
+        clock[0] += latency
+        for start in starts:
+            limiter.release(start)
+
+    call(0.01)
+    for _ in range(10):
+        call(0.05)
+    lowest = limiter.limit
+    for _ in range(50):
+        call(0.05)
+
+    assert lowest < 32
+    assert limiter.limit > lowest
+
+def test_acquire_blocks_at_limit():
+    limiter = AdaptiveLimiter(AIMDConfig(initial_limit = 1))
+    start = limiter.acquire()
+    acquired = threading.Event()
+
+    def worker():
+        limiter.release(limiter.acquire())
+        acquired.set()
+
+    thread = threading.Thread(target = worker)
+    thread.start()
+    assert not acquired.wait(0.05)
+    limiter.release(start)
+    assert acquired.wait(1)
+    thread.join()
+
+def test_client_limits_invocations_per_endpoint():
+    client = EndpointClient(
+        "http://fake.url", "FAKETOKEN",
+        adaptive_concurrency = AIMDConfig(initial_limit = 8, decrease_factor = 0.5),
+    )
+
+    with requests_mock.Mocker() as m:
+        m.post(requests_mock.ANY, [
+            {"status_code": 429, "text": "slow down"},
+            {"status_code": 200, "json": {"predictions": [1]}},
+        ])
+        with pytest.raises(ThrottledError):
+            client.query_inference_endpoint("endpoint", {"inputs": [1]})
+        client.query_inference_endpoint("endpoint", {"inputs": [1]})
+
+    limits = client.concurrency_limits()
+    assert limits["endpoint"]["limit"] == 4
+    assert limits["endpoint"]["in_flight"] == 0
+    assert [limit for _, limit in limits["endpoint"]["history"]] == [8, 4]
@@ -0,0 +1,104 @@
+import pytest
+
+from databricks.model_serving import events as events_module
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.events import EventStream, watch_events
+from databricks.model_serving.exceptions import NotFoundError, ServerError, UnauthorizedError
+
+
+def _event(timestamp, message, served_model_name = "m-1", event_type = "SERVED_MODEL_CONTAINER_EVENT"):
+    return {"timestamp": timestamp, "message": message, "served_model_name": served_model_name, "type": event_type}
+
+def test_stream_yields_each_event_once():
+    stream = EventStream("e")
+    first = [_event(1, "a"), _event(2, "b")]
+
+    assert [e["message"] for e in stream.update(first)] == ["a", "b"]
+    assert stream.update(first) == []
+    assert [e["message"] for e in stream.update(first + [_event(2, "c")])] == ["c"]
+    assert stream.update(first + [_event(2, "c")])[:1] == []
+
+def test_stream_filters_and_since():
+    stream = EventStream("e", served_model_names = ["m-2"], since = 1)
+    events = [_event(1, "old", "m-2"), _event(2, "other"), _event(3, "mine", "m-2")]
+
+    new = stream.update(events)
+
+    assert [e["message"] for e in new] == ["mine"]
+    assert new[0]["endpoint_name"] == "e"
+
+def test_stream_drops_events_older_than_lookback():
+    stream = EventStream("e", lookback = 1)
+    stream.update([_event(10_000, "a")])
+
+    assert stream.update([_event(5_000, "late"), _event(9_500, "recent")])[0]["message"] == "recent"
+
+def test_stream_bounds_seen_ids():
+    stream = EventStream("e", max_seen = 2)
+    stream.update([_event(i, str(i)) for i in range(5)])
+
+    assert len(stream._seen) == 2
+
+def test_single_scheduler_backs_off_idle_endpoints(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(events_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(events_module.time, "sleep", lambda s: clock.__setitem__(0, clock[0] + s))
+    polls = []
+    busy = []
+
+    def fetch(name):
+        polls.append((clock[0], name))
+        if name == "busy":
+            busy.append(_event(len(busy), f"event {len(busy)}"))
+            return list(busy)
+        return []
+
+    watched = list(watch_events(fetch, ["busy", "idle"], poll_interval = 1, max_interval = 8, timeout = 20))
+
+    assert len(watched) == sum(1 for _, name in polls if name == "busy")
+    assert [t for t, name in polls if name == "idle"] == [0, 2, 6, 14]
+    assert [t for t, name in polls if name == "busy"][:3] == [0, 1, 2]
+
+def test_failing_endpoint_does_not_stop_the_others(monkeypatch, caplog):
+    clock = [0.0]
+    monkeypatch.setattr(events_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(events_module.time, "sleep", lambda s: clock.__setitem__(0, clock[0] + s))
+    polls = []
+
+    def fetch(name):
+        polls.append(name)
+        if name == "flaky" and len(polls) < 4:
+            raise ServerError("boom", 503, "")
+        if name == "deleted":
+            raise NotFoundError("gone", 404, "")
+        return [_event(1, name)]
+
+    watched = list(watch_events(fetch, ["ok", "flaky", "deleted"], poll_interval = 1, timeout = 10))
+
+    assert sorted(e["message"] for e in watched) == ["flaky", "ok"]
+    assert polls.count("deleted") == 1
+    assert polls.count("flaky") > 1
+    assert "Fetching the events of flaky failed" in caplog.text
+
+def test_auth_errors_are_raised():
+    def fetch(name):
+        if name == "b":
+            raise UnauthorizedError("bad token", 401, "")
+        return [_event(1, name)]
+
+    with pytest.raises(UnauthorizedError):
+        list(watch_events(fetch, ["a", "b"], follow = False))
+
+def test_client_watches_endpoints(local_server):
+    local_server.add_endpoint("a")
+    local_server.add_endpoint("b")
+    local_server.add_event("b", "container started", served_model_name = "b-1")
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    events = list(client.watch_inference_endpoint_events(["a", "b"], follow = False))
+    containers = list(client.watch_inference_endpoint_events(
+        "b", event_types = ["SERVED_MODEL_CONTAINER_EVENT"], follow = False
+    ))
+
+    assert {e["endpoint_name"] for e in events} == {"a", "b"}
+    assert [e["message"] for e in containers] == ["container started"]
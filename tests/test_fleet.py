@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from databricks.model_serving import fleet as fleet_module
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.exceptions import EndpointClientError
+from databricks.model_serving.fleet import CREATE, DELETE, UPDATE, EndpointOperation, RateLimiter, run_operations
+from databricks.model_serving.retry import RetryPolicy
+from databricks.model_serving.testing import LocalServingServer
+from databricks.model_serving.waiter import WaitTimeoutError
+
+
+def _models(version):
+    return [{"model_name": "m", "model_version": version}]
+
+def test_operation_validation():
+    with pytest.raises(ValueError):
+        EndpointOperation("rename", "e")
+    with pytest.raises(ValueError):
+        EndpointOperation(UPDATE, "e")
+    EndpointOperation(DELETE, "e")
+
+def test_operations_run_concurrently():
+    with LocalServingServer(api_latency = 0.1) as server:
+        client = EndpointClient(server.base_url, "FAKETOKEN")
+        operations = [EndpointOperation(CREATE, f"e-{i}", _models("1")) for i in range(8)]
+
+        start = time.monotonic()
+        result = client.run_endpoint_operations(operations, max_concurrency = 4)
+        elapsed = time.monotonic() - start
+
+    assert sorted(result.succeeded) == [f"e-{i}" for i in range(8)]
+    assert result["e-0"].response["name"] == "e-0"
+    assert result["e-0"].wait is None
+    assert 0.2 <= elapsed < 8 * 0.1
+
+def test_created_endpoints_are_waited_for_together():
+    with LocalServingServer(config_update_delay = 0.2) as server:
+        client = EndpointClient(server.base_url, "FAKETOKEN")
+        operations = [EndpointOperation(CREATE, f"e-{i}", _models("1")) for i in range(3)]
+
+        result = client.run_endpoint_operations(operations, wait = True, max_delay = 0.05)
+        lists = [r for r in server.requests if r.method == "GET" and r.path.endswith("serving-endpoints")]
+
+    assert all(result[f"e-{i}"].wait.state["ready"] == "READY" for i in range(3))
+    assert result.failed == []
+    assert len(lists) == len([r for r in server.requests if r.method == "GET"])
+
+def test_partial_failures_do_not_abort_the_batch(local_server):
+    local_server.add_endpoint("a")
+    local_server.add_endpoint("b")
+    local_server.fail_config_updates("b")
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    result = client.run_endpoint_operations([
+        EndpointOperation(UPDATE, "a", _models("2")),
+        EndpointOperation(UPDATE, "b", _models("2")),
+        EndpointOperation(UPDATE, "missing", _models("2")),
+        EndpointOperation(DELETE, "a-gone"),
+    ], wait = True, max_delay = 0.05)
+
+    assert result.succeeded == ["a"]
+    assert sorted(result.failed) == ["a-gone", "b", "missing"]
+    assert result["b"].wait.failed
+    assert isinstance(result["missing"].error, EndpointClientError)
+    assert result["missing"].wait is None
+
+def test_wait_timeout_is_recorded_per_endpoint():
+    with LocalServingServer(config_update_delay = 10) as server:
+        client = EndpointClient(server.base_url, "FAKETOKEN")
+
+        result = run_operations(client, [EndpointOperation(CREATE, "slow", _models("1"))], wait = True, timeout = 0.1, max_delay = 0.05)
+
+    assert isinstance(result["slow"].error, WaitTimeoutError)
+    assert not result["slow"].wait.done
+
+def test_failed_polls_are_retried_until_the_deadline():
+    with LocalServingServer(config_update_delay = 0.2) as server:
+        for name in ("a", "b"):
+            server.add_endpoint(name)
+        client = EndpointClient(server.base_url, "FAKETOKEN", retry_policy = RetryPolicy(max_attempts = 1))
+        server.inject_errors(503, count = 2, route = "serving-endpoints")
+        operations = [EndpointOperation(UPDATE, name, _models("2")) for name in ("a", "b")]
+
+        result = run_operations(client, operations, wait = True, max_delay = 0.05)
+
+    assert sorted(result.succeeded) == ["a", "b"]
+
+def test_polls_failing_until_the_deadline_time_out():
+    with LocalServingServer() as server:
+        for name in ("a", "b"):
+            server.add_endpoint(name)
+        client = EndpointClient(server.base_url, "FAKETOKEN", retry_policy = RetryPolicy(max_attempts = 1))
+        server.inject_errors(503, count = 1000, route = "serving-endpoints")
+        operations = [EndpointOperation(UPDATE, name, _models("2")) for name in ("a", "b")]
+
+        result = run_operations(client, operations, wait = True, timeout = 0.2, max_delay = 0.05)
+
+    assert all(isinstance(result[name].error, WaitTimeoutError) for name in ("a", "b"))
+    assert "last poll failed" in str(result["a"].error)
+
+def test_duplicate_endpoints_are_rejected(local_server):
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    with pytest.raises(ValueError):
+        client.run_endpoint_operations([EndpointOperation(DELETE, "e"), EndpointOperation(DELETE, "e")])
+
+def test_rate_limiter_spaces_calls(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(fleet_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(fleet_module.time, "sleep", lambda s: clock.__setitem__(0, clock[0] + s))
+    limiter = RateLimiter(rate = 4)
+
+    starts = []
+    for _ in range(3):
+        limiter.acquire()
+        starts.append(clock[0])
+
+    assert starts == [0, 0.25, 0.5]
@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+import threading
+import time
+
+import pytest
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.hedging import Hedger, HedgingConfig
+
+
+def _slow_once(slow, fast = 0.001):
+    calls = itertools.count()
+    return lambda: slow if next(calls) == 0 else fast
+
+def test_hedger_waits_for_samples_and_uses_quantile():
+    hedger = Hedger(HedgingConfig(quantile = 0.9, min_samples = 10, min_delay = 0))
+    for latency in range(1, 10):
+        hedger.observe(latency / 100)
+    assert hedger.start() is None
+
+    hedger.observe(0.1)
+
+    assert hedger.start() == 0.09
+
+def test_hedger_budget_caps_hedges():
+    hedger = Hedger(HedgingConfig(budget = 0.1, burst = 2))
+    for _ in range(100):
+        hedger.start()
+
+    assert [hedger.try_hedge() for _ in range(3)] == [True, True, False]
+    assert hedger.snapshot()["hedges"] == 2
+    assert hedger.snapshot()["denied"] == 1
+
+def test_hedged_request_beats_slow_replica(local_server):
+    client = EndpointClient(
+        local_server.base_url, "FAKETOKEN", hedging = HedgingConfig(min_samples = 5, budget = 1)
+    )
+    for i in range(5):
+        client.query_inference_endpoint("e", {"inputs": [i]})
+    local_server.behavior.latency = _slow_once(1.0)
+
+    start = time.perf_counter()
+    response = client.query_inference_endpoint("e", {"inputs": [42]})
+
+    assert time.perf_counter() - start < 0.5
+    assert response == {"predictions": [42]}
+    stats = client.hedging_stats()["e"]
+    assert (stats["requests"], stats["hedges"], stats["hedge_wins"]) == (6, 1, 1)
+    client.close()
+
+def test_no_hedge_without_budget(local_server):
+    client = EndpointClient(
+        local_server.base_url, "FAKETOKEN", hedging = HedgingConfig(min_samples = 5, budget = 0)
+    )
+    for i in range(5):
+        client.query_inference_endpoint("e", {"inputs": [i]})
+    local_server.behavior.latency = _slow_once(0.3)
+
+    start = time.perf_counter()
+    client.query_inference_endpoint("e", {"inputs": [42]})
+
+    assert time.perf_counter() - start >= 0.3
+    assert client.hedging_stats()["e"]["hedges"] == 0
+    assert len(local_server.requests) == 6
+    client.close()
+
+def test_async_hedged_request_cancels_loser(local_server):
+    pytest.importorskip("aiohttp")
+    from databricks.model_serving.async_client import AsyncEndpointClient
+
+    async def run():
+        async with AsyncEndpointClient(
+            local_server.base_url, "FAKETOKEN", hedging = HedgingConfig(min_samples = 5, budget = 1)
+        ) as client:
+            for i in range(5):
+                await client.query_inference_endpoint("e", {"inputs": [i]})
+            local_server.behavior.latency = _slow_once(1.0)
+            start = time.perf_counter()
+            response = await client.query_inference_endpoint("e", {"inputs": [42]})
+            return response, time.perf_counter() - start, client.hedging_stats()["e"]
+
+    response, elapsed, stats = asyncio.run(run())
+
+    assert response == {"predictions": [42]}
+    assert elapsed < 0.5
+    assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+
+def test_loser_is_aborted_and_first_request_stays_on_caller_thread(local_server):
+    timings = []
+    threads = []
+    client = EndpointClient(
+        local_server.base_url, "FAKETOKEN", hedging = HedgingConfig(min_samples = 5, budget = 1),
+        request_hooks = [lambda timing: (timings.append(timing), threads.append(threading.current_thread()))],
+    )
+    for i in range(5):
+        client.query_inference_endpoint("e", {"inputs": [i]})
+    assert set(threads) == {threading.current_thread()}
+
+    for slow in (0, 1):
+        del timings[:]
+        latencies = iter([1.0, 0.1] if slow == 0 else [0.1, 1.0])
+        local_server.behavior.latency = lambda: next(latencies, 0.001)
+        start = time.perf_counter()
+        assert client.query_inference_endpoint("e", {"inputs": [slow]}) == {"predictions": [slow]}
+        assert time.perf_counter() - start < 0.5
+        deadline = time.monotonic() + 0.5
+        while len(timings) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # The loser fails as soon as it is aborted, not after its latency.
+        aborted = [t for t in timings if t.error is not None]
+        assert len(aborted) == 1 and aborted[0].total < 0.5
+
+    assert client.hedging_stats()["e"]["hedge_wins"] == 1
+    client.close()
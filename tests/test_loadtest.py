@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.loadtest import (
+    LoadTestResult,
+    Sample,
+    correct_coordinated_omission,
+    load_payloads,
+    main,
+    percentile,
+    run_cli,
+    run_load_test,
+)
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 99.9) == 100
+    assert percentile([], 50) is None
+
+def test_coordinated_omission_correction():
+    corrected = correct_coordinated_omission([1, 1, 1, 10], expected_interval = 1)
+
+    assert sorted(corrected) == [1, 1, 1, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+def test_report_counts_errors_and_throttling():
+    samples = [
+        Sample(0, 0, 0.1),
+        Sample(0, 0, 0.1, "ThrottledError", True),
+        Sample(0, 0, 0.1, "ServerError"),
+        Sample(0, 0, 0.1),
+    ]
+    report = LoadTestResult("e", "closed", 2, None, 1.0, samples).to_dict()
+
+    assert (report["requests"], report["successes"], report["throughput"]) == (4, 2, 2.0)
+    assert report["error_rate"] == 0.5
+    assert report["throttle_rate"] == 0.25
+    assert report["errors"] == {"ThrottledError": 1, "ServerError": 1}
+
+def test_closed_loop_sends_requested_count(local_server):
+    with EndpointClient(local_server.base_url, "FAKETOKEN") as client:
+        result = run_load_test(client, "e", [{"inputs": [1]}], concurrency = 4, requests = 40)
+
+    report = result.to_dict()
+    assert report["requests"] == report["successes"] == 40
+    assert report["latency"]["p50"] > 0
+    assert report["phases"]["total"]["count"] == 40
+    assert client.request_hooks == []
+
+def test_open_loop_measures_from_intended_start(local_server):
+    local_server.behavior.latency = 0.05
+    with EndpointClient(local_server.base_url, "FAKETOKEN") as client:
+        result = run_load_test(client, "e", [{"inputs": [1]}], concurrency = 1, rate = 100, requests = 10)
+
+    report = result.to_dict()
+    assert report["mode"] == "open"
+    assert report["requests"] == 10
+    # A single worker falls behind the schedule: queueing shows up in the
+    # corrected latencies only.
+    assert report["corrected_latency"]["max"] > 3 * report["latency"]["max"]
+
+def test_load_payloads_json_and_jsonl(tmp_path):
+    single = tmp_path / "single.json"
+    single.write_text(json.dumps({"inputs": [1]}))
+    lines = tmp_path / "payloads.jsonl"
+    lines.write_text('{"inputs": [1]}\n{"inputs": [2]}\n')
+
+    assert load_payloads(str(single)) == [{"inputs": [1]}]
+    assert load_payloads(str(lines)) == [{"inputs": [1]}, {"inputs": [2]}]
+
+def test_cli_writes_json_report(local_server, tmp_path, capsys):
+    payload = tmp_path / "payload.json"
+    payload.write_text(json.dumps([{"inputs": [1]}, {"inputs": [2]}]))
+    output = tmp_path / "report.json"
+
+    assert main(["e", str(payload), "--host", local_server.base_url, "--token", "FAKETOKEN",
+                 "--requests", "10", "--concurrency", "2", "--output", str(output)]) is None
+
+    assert json.loads(output.read_text())["successes"] == 10
+    assert "throughput" in capsys.readouterr().out
+
+def test_run_cli_returns_report(local_server, tmp_path, capsys):
+    payload = tmp_path / "payload.json"
+    payload.write_text(json.dumps({"inputs": [1]}))
+
+    report = run_cli(["e", str(payload), "--host", local_server.base_url, "--token", "FAKETOKEN", "--requests", "3", "--json"])
+
+    assert report["successes"] == 3
+    assert json.loads(capsys.readouterr().out) == report
+
+def test_cli_requires_credentials(monkeypatch):
+    monkeypatch.delenv("DATABRICKS_HOST", raising = False)
+    monkeypatch.delenv("DATABRICKS_TOKEN", raising = False)
+
+    with pytest.raises(SystemExit):
+        main(["e", "payload.json"])
@@ -0,0 +1,82 @@
+import requests_mock
+
+from databricks.model_serving import logs
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.logs import BUILD_LOGS, LogTailer, tail_logs
+
+
+def _tailer(blobs, window = 1000):
+    blobs = iter(blobs)
+    return LogTailer(lambda: next(blobs), window)
+
+def test_poll_returns_only_new_lines():
+    tailer = _tailer(["a\nb", "a\nb\nc\nd", "a\nb\nc\nd", "a\nb\nc\nd\ne"])
+
+    assert [tailer.poll() for _ in range(4)] == [["a", "b"], ["c", "d"], [], ["e"]]
+
+def test_repeated_lines_are_not_lost():
+    tailer = _tailer(["ping", "ping\nping\nping"])
+
+    assert tailer.poll() == ["ping"]
+    assert tailer.poll() == ["ping", "ping"]
+
+def test_whole_window_is_matched_before_its_suffixes():
+    tailer = _tailer(["ok\nok", "ok\nok\nok"])
+
+    assert tailer.poll() == ["ok", "ok"]
+    assert tailer.poll() == ["ok"]
+
+def test_repeating_log_is_aligned_where_the_last_blob_ended():
+    tailer = _tailer(["a\nb\nc\na\nb\nc", "a\nb\nc\na\nb\nc\nd", "b\nc\nd\na\nb\nc\nd\ne"], window = 3)
+
+    assert tailer.poll() == ["a", "b", "c", "a", "b", "c"]
+    assert tailer.poll() == ["d"]
+    assert tailer.poll() == ["e"]
+
+def test_truncated_log_is_aligned_on_window():
+    tailer = _tailer(["a\nb\nc\nd", "c\nd\ne"], window = 3)
+
+    tailer.poll()
+
+    assert tailer.poll() == ["e"]
+    assert list(tailer.window) == ["c", "d", "e"]
+
+def test_rotated_log_is_returned_whole():
+    tailer = _tailer(["a\nb", "x\ny"])
+    tailer.poll()
+
+    assert tailer.poll() == ["x", "y"]
+
+def test_follow_backs_off_while_idle(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(logs.time, "sleep", sleeps.append)
+    blobs = ["a", "a", "a", "a\nb", "a\nb"]
+    fetch = lambda: blobs.pop(0) if len(blobs) > 1 else blobs[0]
+    lines = tail_logs(fetch, follow = True, poll_interval = 1, max_interval = 3)
+
+    assert [next(lines), next(lines)] == ["a", "b"]
+    assert sleeps == [1, 2, 3]
+
+def test_follow_stops_at_timeout():
+    lines = list(tail_logs(lambda: "a", follow = True, poll_interval = 0.01, timeout = 0.05))
+
+    assert lines == ["a"]
+
+def test_client_tails_server_logs(local_server):
+    local_server.add_endpoint("e", [{"name": "m-1", "model_name": "m", "model_version": "1"}])
+    local_server.append_logs("e", "m-1", "started")
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    lines = client.tail_served_model_logs("e", "m-1", follow = True, poll_interval = 0.01, timeout = 5)
+    assert next(lines) == "started"
+    local_server.append_logs("e", "m-1", "ready")
+    assert next(lines) == "ready"
+    lines.close()
+
+    assert list(client.tail_served_model_logs("e", "m-1", logs = BUILD_LOGS))[-1] == "Build succeeded"
+
+def test_server_logs_use_logs_route():
+    client = EndpointClient("https://test.com", "FAKETOKEN")
+    with requests_mock.Mocker() as m:
+        m.get("https://test.com/api/2.0/serving-endpoints/e/served-models/m/logs", json = {"logs": "x"})
+        assert client.get_served_model_server_logs("e", "m") == {"logs": "x"}
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests_mock
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.metadata import MetadataCache
+
+
+@pytest.fixture
+def client():
+    return EndpointClient(
+        "http://fake.url", "FAKETOKEN", metadata_cache = MetadataCache(ttl = 60)
+    )
+
+
+def test_get_and_list_are_cached(client):
+
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, json = {"name": "endpoint"})
+        for _ in range(3):
+            client.get_inference_endpoint("endpoint")
+            client.list_inference_endpoints()
+
+    assert m.call_count == 2
+
+def test_cached_values_are_copies(client):
+
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, json = {"name": "endpoint"})
+        client.get_inference_endpoint("endpoint")["name"] = "changed"
+
+        assert client.get_inference_endpoint("endpoint") == {"name": "endpoint"}
+
+def test_mutations_invalidate(client):
+
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, json = {"name": "endpoint"})
+        m.put(requests_mock.ANY, json = {})
+        m.delete(requests_mock.ANY, json = {})
+        client.get_inference_endpoint("endpoint")
+        client.update_served_models("endpoint", ["model"])
+        client.get_inference_endpoint("endpoint")
+        client.delete_inference_endpoint("endpoint")
+        client.list_inference_endpoints()
+
+    assert [r.method for r in m.request_history] == ["GET", "PUT", "GET", "DELETE", "GET"]
+
+def test_concurrent_lookups_are_collapsed():
+    cache = MetadataCache()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return {"name": "endpoint"}
+
+    with ThreadPoolExecutor(8) as executor:
+        futures = [executor.submit(cache.get, "key", fetch) for _ in range(8)]
+        time.sleep(0.05)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert results == [{"name": "endpoint"}] * 8
+
+def test_failures_are_shared_but_not_cached():
+    cache = MetadataCache()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get("key", fail)
+    assert cache.get("key", lambda: {"ok": True}) == {"ok": True}
+
+def test_async_lookups_are_collapsed():
+    cache = MetadataCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"name": "endpoint"}
+
+    async def run():
+        return await asyncio.gather(*[cache.get_async("key", fetch) for _ in range(5)])
+
+    assert asyncio.run(run()) == [{"name": "endpoint"}] * 5
+    assert len(calls) == 1
+
+def test_cancelled_async_leader_hands_over_to_followers():
+    cache = MetadataCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"name": "endpoint"}
+
+    async def run():
+        leader = asyncio.ensure_future(cache.get_async("key", fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(cache.get_async("key", fetch)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(run()) == [{"name": "endpoint"}] * 3
+    assert len(calls) == 2
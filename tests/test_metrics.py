@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+import requests_mock
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.exceptions import NotFoundError
+from databricks.model_serving.metrics import (
+    Histogram,
+    MetricsRegistry,
+    RequestTiming,
+    parse_uri,
+)
+
+
+def test_parse_uri():
+    assert parse_uri("api/2.0/serving-endpoints") == ("", "serving-endpoints")
+    assert parse_uri("api/2.0/serving-endpoints/e") == ("e", "serving-endpoint")
+    assert parse_uri("serving-endpoints/e/invocations") == ("e", "invocations")
+    assert parse_uri("api/2.0/serving-endpoints/e/served-models/m/logs") == ("e", "logs")
+
+def test_histogram_quantiles():
+    histogram = Histogram(buckets = (1, 2, 3, 4))
+    for value in (0.5, 1.5, 1.5, 2.5, 10):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 0, 1]
+    assert histogram.quantile(0.5) == pytest.approx(1.75)
+    assert histogram.quantile(0.99) == 4
+    assert histogram.to_dict()["mean"] == pytest.approx(3.2)
+    assert Histogram().quantile(0.5) is None
+
+def test_registry_exports_prometheus():
+    registry = MetricsRegistry(latency_buckets = (0.1, 1), size_buckets = (100,))
+    registry(RequestTiming("POST", "serving-endpoints/e/invocations", status_code = 200, total = 0.05, request_bytes = 10))
+    registry(RequestTiming("POST", "serving-endpoints/e/invocations", error = "ConnectionError", total = 2))
+
+    text = registry.to_prometheus()
+    labels = 'endpoint="e",route="invocations",method="POST"'
+    assert f'model_serving_request_duration_seconds_bucket{{{labels},phase="total",le="0.1"}} 1' in text
+    assert f'model_serving_request_duration_seconds_bucket{{{labels},phase="total",le="+Inf"}} 2' in text
+    assert f'model_serving_responses_total{{{labels},status="200"}} 1' in text
+    assert f'model_serving_responses_total{{{labels},status="ConnectionError"}} 1' in text
+    stats = registry.to_dict()["e"]["POST invocations"]
+    assert stats["latency"]["total"]["count"] == 2
+    assert stats["status"] == {"200": 1, "ConnectionError": 1}
+
+def test_client_reports_request_timings():
+    timings = []
+    registry = MetricsRegistry()
+    client = EndpointClient("https://test.com", "FAKETOKEN", request_hooks = [timings.append, registry])
+    with requests_mock.Mocker() as m:
+        m.post("https://test.com/serving-endpoints/e/invocations", json = {"predictions": [1]})
+        m.get("https://test.com/api/2.0/serving-endpoints/missing", status_code = 404, text = "nope")
+        assert client.query_inference_endpoint("e", {"inputs": [1]}) == {"predictions": [1]}
+        with pytest.raises(NotFoundError):
+            client.get_inference_endpoint("missing")
+
+    invocation, lookup = timings
+    assert (invocation.endpoint_name, invocation.route) == ("e", "invocations")
+    assert invocation.status_code == 200
+    assert invocation.request_bytes == len(b'{"inputs":[1]}')
+    assert invocation.response_bytes > 0
+    assert invocation.error is None
+    assert invocation.total >= invocation.ttfb + invocation.transfer
+    assert (lookup.status_code, lookup.error) == (404, "NotFoundError")
+    assert registry.latency("e", "invocations", "POST").count == 1
+
+def test_failing_hook_does_not_break_requests():
+    def hook(timing):
+        raise RuntimeError("boom")
+
+    client = EndpointClient("https://test.com", "FAKETOKEN", request_hooks = [hook])
+    with requests_mock.Mocker() as m:
+        m.get("https://test.com/api/2.0/serving-endpoints", json = {"endpoints": []})
+        assert client.list_inference_endpoints() == {"endpoints": []}
+
+def test_connect_time_measured_on_new_connections(local_server):
+    timings = []
+    with EndpointClient(local_server.base_url, "FAKETOKEN", request_hooks = [timings.append]) as client:
+        client.list_inference_endpoints()
+        client.list_inference_endpoints()
+
+    assert timings[0].connect > 0
+    assert timings[1].connect == 0
+
+def test_async_client_reports_request_timings(local_server):
+    pytest.importorskip("aiohttp")
+    from databricks.model_serving.async_client import AsyncEndpointClient
+
+    timings = []
+
+    async def run():
+        async with AsyncEndpointClient(local_server.base_url, "FAKETOKEN", request_hooks = [timings.append]) as client:
+            await client.query_inference_endpoint("e", {"inputs": [1]})
+            await client.query_inference_endpoint("e", {"inputs": [2]})
+
+    asyncio.run(run())
+
+    assert [t.route for t in timings] == ["invocations", "invocations"]
+    assert [t.status_code for t in timings] == [200, 200]
+    assert timings[0].connect > 0
+    assert timings[1].connect == 0
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from databricks.model_serving.payloads import (
+    dataframe_split,
+    tensor_inputs,
+    tensor_instances,
+)
+
+
+def test_dataframe_split_payload():
+    df = pd.DataFrame(
+        {
+            "a": np.array([0.1, np.nan], dtype = np.float32),
+            "b": [1, 2],
+            "c": ["x", None],
+            "d": pd.to_datetime(["2023-01-01", None]),
+        }
+    )
+
+    payload = dataframe_split(df)["dataframe_split"]
+    first, second = payload["data"]
+
+    assert payload["columns"] == ["a", "b", "c", "d"]
+    assert first[:3] == [0.1, 1, "x"]
+    assert first[3].startswith("2023-01-01T00:00:00")
+    assert second == [None, 2, None, None]
+    json.dumps(payload, allow_nan = False)
+
+def test_float_precision_rounds_values():
+    df = pd.DataFrame({"a": [0.123456789]})
+
+    assert dataframe_split(df, float_precision = 3)["dataframe_split"]["data"] == [[0.123]]
+
+def test_tensor_payloads():
+    x = np.arange(6, dtype = np.float32).reshape(3, 2) / 10
+    y = np.array([1, 2, 3])
+
+    assert tensor_inputs(x) == {"inputs": [[0.0, 0.1], [0.2, 0.3], [0.4, 0.5]]}
+    assert tensor_inputs({"x": x, "y": y})["inputs"]["y"] == [1, 2, 3]
+    assert tensor_instances({"x": x, "y": y})["instances"][1] == {"x": [0.2, 0.3], "y": 2}
+    assert tensor_instances(y) == {"instances": [1, 2, 3]}
+
+def test_float32_precision_and_timezone_aware_nat():
+    df = pd.DataFrame(
+        {
+            "a": np.array([0.123456, 1.5], dtype = np.float32),
+            "b": pd.to_datetime(["2023-01-01", None]).tz_localize("UTC"),
+        }
+    )
+
+    first, second = dataframe_split(df, float_precision = 3)["dataframe_split"]["data"]
+
+    assert first[0] == 0.123
+    assert first[1].startswith("2023-01-01T00:00:00")
+    assert second == [1.5, None]
+    assert tensor_inputs(np.array([0.1], dtype = np.float32), float_precision = 2) == {"inputs": [0.1]}
@@ -0,0 +1,92 @@
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.fleet import CREATE, UPDATE
+from databricks.model_serving.reconcile import UNCHANGED, plan_reconcile
+
+
+def _model(version, **fields):
+    return {"model_name": "m", "model_version": version, **fields}
+
+def _endpoint(name, served_models, traffic_config = None):
+    return {"name": name, "config": {"served_models": served_models, "traffic_config": traffic_config}}
+
+def test_service_fields_and_number_formats_are_ignored():
+    current = [_endpoint("e", [_model(1, name = "m-1", workload_size = "Small", state = {"deployment": "DEPLOYMENT_READY"})])]
+
+    plan = plan_reconcile({"e": {"served_models": [_model("1", workload_size = "Small")]}}, current)
+
+    assert plan.changes[0].action == UNCHANGED
+    assert plan.operations() == []
+
+def test_differences_are_listed():
+    current = [_endpoint("e", [_model("1", name = "m-1"), {"name": "old", "model_name": "o"}], {"routes": [{"served_model_name": "m-1", "traffic_percentage": 100}]})]
+    desired = {
+        "e": {
+            "served_models": [_model("2"), {"model_name": "n", "model_version": "1"}],
+            "traffic_config": {"routes": [{"served_model_name": "m-2", "traffic_percentage": "100"}]},
+        },
+        "new": {"served_models": [_model("1")]},
+    }
+
+    plan = plan_reconcile(desired, current)
+    changes = {c.endpoint_name: c for c in plan.changes}
+
+    assert changes["new"].action == CREATE
+    assert changes["e"].action == UPDATE
+    assert changes["e"].differences[:3] == [
+        'served model m: model_version "1" -> "2"',
+        "served model n added",
+        "served model old removed",
+    ]
+    assert changes["e"].differences[3].startswith("traffic_config")
+    assert "2 to change, 0 unchanged" in plan.format()
+
+def test_traffic_percentages_compare_as_numbers():
+    routes = [{"served_model_name": "m-1", "traffic_percentage": 100}]
+    current = [_endpoint("e", [_model("1", name = "m-1")], {"routes": routes})]
+
+    plan = plan_reconcile({"e": {"served_models": [_model("1")], "traffic_config": {"routes": [{"served_model_name": "m-1", "traffic_percentage": "100"}]}}}, current)
+
+    assert plan.pending == []
+
+def test_fields_left_out_of_the_listing_are_fetched():
+    env = {"environment_vars": {"A": "1"}}
+    routes = {"routes": [{"served_model_name": "m-1", "traffic_percentage": 100}]}
+    listed = [_endpoint("e", [_model(1, name = "m-1")]), _endpoint("f", [_model(1, name = "m-1")])]
+    full = {"e": _endpoint("e", [_model(1, name = "m-1", **env)], routes), "f": _endpoint("f", [_model(1, name = "m-1")], routes)}
+    fetched = []
+
+    def fetch(name):
+        fetched.append(name)
+        return full[name]
+
+    desired = {name: {"served_models": [_model(1, **env)], "traffic_config": routes} for name in ("e", "f")}
+    plan = plan_reconcile(desired, listed, fetch)
+    changes = {c.endpoint_name: c for c in plan.changes}
+
+    assert fetched == ["e", "f"]
+    assert changes["e"].action == UNCHANGED
+    assert changes["f"].differences == ['served model m: environment_vars null -> {"A": "1"}']
+    assert plan_reconcile(desired, listed).changes[0].action == UPDATE
+
+def test_reconcile_only_updates_changed_endpoints(local_server):
+    local_server.add_endpoint("same", [_model("1")])
+    local_server.add_endpoint("stale", [_model("1")])
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+    desired = {
+        "same": {"served_models": [_model("1")]},
+        "stale": {"served_models": [_model("2")]},
+        "fresh": {"served_models": [_model("1")]},
+    }
+
+    dry_run = client.reconcile_endpoints(desired, dry_run = True)
+    requests_before = len(local_server.requests)
+    plan = client.reconcile_endpoints(desired, wait = True)
+    writes = [(r.method, r.path) for r in local_server.requests[requests_before:] if r.method != "GET"]
+    again = client.reconcile_endpoints(desired)
+
+    assert dry_run.result is None
+    assert [c.endpoint_name for c in dry_run.pending] == ["stale", "fresh"]
+    assert requests_before == 1
+    assert sorted(writes) == [("POST", "/api/2.0/serving-endpoints"), ("PUT", "/api/2.0/serving-endpoints/stale/config")]
+    assert sorted(plan.result.succeeded) == ["fresh", "stale"]
+    assert again.pending == [] and again.result.results == {}
@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from databricks.model_serving.circuit import CircuitBreakerConfig
+from databricks.model_serving.exceptions import BadRequestError, ServerError
+from databricks.model_serving.replicas import Replica, ReplicatedEndpointClient, ReplicaState
+from databricks.model_serving.testing import LocalServingServer
+
+
+@pytest.fixture
+def servers():
+    with LocalServingServer() as a, LocalServingServer() as b:
+        yield a, b
+
+def _client(servers, **kwargs):
+    return ReplicatedEndpointClient([(s.base_url, "FAKETOKEN", "e") for s in servers], seed = 1, **kwargs)
+
+def test_ewma_decays_with_time():
+    state = ReplicaState(Replica("http://a", "t", "e"), decay = 1.0)
+    state.observe(1.0, now = 0.0)
+    state.observe(0.0, now = 0.001)
+    assert state.ewma == pytest.approx(1.0, rel = 0.01)
+    state.observe(0.0, now = 10.0)
+    assert state.ewma < 0.001
+
+def test_fast_replica_gets_most_calls(servers):
+    fast, slow = servers
+    slow.behavior.latency = 0.02
+    client = _client(servers)
+
+    for _ in range(40):
+        assert client.query_inference_endpoint({"inputs": [1]}) == {"predictions": [1]}
+    stats = client.stats()
+
+    assert len(fast.requests) > 3 * len(slow.requests)
+    assert stats[f"{slow.base_url}/e"]["ewma"] > stats[f"{fast.base_url}/e"]["ewma"]
+
+def test_concurrent_load_is_spread(servers):
+    for server in servers:
+        server.behavior.latency = 0.01
+    client = _client(servers)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: client.query_inference_endpoint({"inputs": [i]}), range(80)))
+
+    counts = sorted(len(server.requests) for server in servers)
+    assert sum(counts) == 80
+    assert counts[0] >= 25
+    assert all(s["in_flight"] == 0 for s in client.stats().values())
+
+def test_fails_over_and_cools_down(servers):
+    broken, healthy = servers
+    broken.behavior.error_rate = 1.0
+    client = _client(servers, cooldown = 60)
+
+    responses = [client.query_inference_endpoint({"inputs": [i]}) for i in range(5)]
+    stats = client.stats()[f"{broken.base_url}/e"]
+
+    assert responses == [{"predictions": [i]} for i in range(5)]
+    assert len(broken.requests) == 1
+    assert stats["errors"] == 1 and stats["cooling_down"]
+
+def test_throttled_replica_waits_for_retry_after(servers):
+    throttled, other = servers
+    throttled.behavior.throttle_rate = 1.0
+    throttled.behavior.retry_after = "0"
+    client = _client(servers, cooldown = 60)
+
+    for _ in range(6):
+        client.query_inference_endpoint({"inputs": [1]})
+
+    assert client.stats()[f"{throttled.base_url}/e"]["throttled"] >= 2
+    assert not client.stats()[f"{throttled.base_url}/e"]["cooling_down"]
+
+def test_errors_when_every_replica_fails(servers):
+    for server in servers:
+        server.behavior.error_rate = 1.0
+    client = _client(servers)
+
+    with pytest.raises(ServerError):
+        client.query_inference_endpoint({"inputs": [1]})
+    assert sum(len(s.requests) for s in servers) == 2
+
+def test_client_errors_do_not_fail_over(servers):
+    servers[0].inject_errors(400, count = 10)
+    servers[1].inject_errors(400, count = 10)
+    client = _client(servers)
+
+    with pytest.raises(BadRequestError):
+        client.query_inference_endpoint({"inputs": [1]})
+    assert sum(len(s.requests) for s in servers) == 1
+
+def test_open_circuit_breaker_fails_over(servers):
+    broken, healthy = servers
+    broken.behavior.error_rate = 1.0
+    client = _client(servers, cooldown = 0, circuit_breaker = CircuitBreakerConfig(min_calls = 1, open_duration = 60))
+
+    for i in range(6):
+        client.query_inference_endpoint({"inputs": [i]})
+
+    assert len(broken.requests) == 1
+    assert len(healthy.requests) == 6
+
+def test_fallback_answers_only_once_every_breaker_is_open(servers):
+    broken, healthy = servers
+    broken.behavior.error_rate = 1.0
+    calls = []
+
+    def fallback(endpoint_name, data, error):
+        calls.append(endpoint_name)
+        return {"predictions": None}
+
+    breaker = CircuitBreakerConfig(min_calls = 1, open_duration = 60, fallback = fallback)
+    client = _client(servers, cooldown = 0, circuit_breaker = breaker)
+
+    for i in range(6):
+        assert client.query_inference_endpoint({"inputs": [i]}) == {"predictions": [i]}
+    assert calls == [] and len(healthy.requests) == 6
+
+
+    healthy.behavior.error_rate = 1.0
+    client = _client(servers, cooldown = 0, circuit_breaker = breaker)
+    with pytest.raises(ServerError):
+        client.query_inference_endpoint({"inputs": [7]})
+    assert calls == []
+
+    assert client.query_inference_endpoint({"inputs": [8]}) == {"predictions": None}
+    assert calls == ["e"]
@@ -0,0 +1,91 @@
+import pytest
+import requests_mock
+
+from databricks.model_serving import client as client_module
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.exceptions import (
+    BadRequestError,
+    ServiceUnavailableError,
+    ThrottledError,
+    parse_retry_after,
+)
+from databricks.model_serving.retry import RetryPolicy
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(client_module.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_backoff_uses_full_jitter_under_ceiling():
+    policy = RetryPolicy(backoff_base = 1, backoff_max = 4)
+
+    for attempt in range(6):
+        assert 0 <= policy.backoff(attempt) <= min(4, 2 ** attempt)
+
+def test_delay_respects_attempts_deadline_and_retry_after():
+    policy = RetryPolicy(max_attempts = 3, deadline = 10)
+
+    assert policy.delay(0, elapsed = 0, retry_after = 2) == 2
+    assert policy.delay(0, elapsed = 9, retry_after = 2) is None
+    assert policy.delay(2, elapsed = 0) is None
+
+def test_parse_retry_after():
+
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("garbage") is None
+
+def test_get_is_retried_on_throttling(sleeps):
+    client = EndpointClient("http://fake.url", "FAKETOKEN")
+
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, [
+            {"status_code": 429, "text": "slow down", "headers": {"Retry-After": "1.5"}},
+            {"status_code": 503, "text": "scaling"},
+            {"status_code": 200, "json": {"name": "endpoint"}},
+        ])
+        result = client.get_inference_endpoint("endpoint")
+
+    assert result == {"name": "endpoint"}
+    assert m.call_count == 3
+    assert sleeps[0] == 1.5
+
+def test_invocations_are_not_retried_by_default(sleeps):
+    client = EndpointClient("http://fake.url", "FAKETOKEN")
+
+    with requests_mock.Mocker() as m:
+        m.post(requests_mock.ANY, status_code = 429, text = "slow down")
+        with pytest.raises(ThrottledError) as e:
+            client.query_inference_endpoint("endpoint", {"inputs": [1]})
+
+    assert e.value.status_code == 429
+    assert m.call_count == 1
+    assert sleeps == []
+
+def test_invocations_retry_is_opt_in(sleeps):
+    client = EndpointClient(
+        "http://fake.url", "FAKETOKEN",
+        retry_policy = RetryPolicy(max_attempts = 2, retry_invocations = True),
+    )
+
+    with requests_mock.Mocker() as m:
+        m.post(requests_mock.ANY, status_code = 503, text = "scaling")
+        with pytest.raises(ServiceUnavailableError):
+            client.query_inference_endpoint("endpoint", {"inputs": [1]})
+
+    assert m.call_count == 2
+    assert len(sleeps) == 1
+
+def test_client_errors_are_not_retried(sleeps):
+    client = EndpointClient("http://fake.url", "FAKETOKEN")
+
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, status_code = 400, text = "bad")
+        with pytest.raises(BadRequestError, match = "Bad request: bad"):
+            client.get_inference_endpoint("endpoint")
+
+    assert m.call_count == 1
@@ -0,0 +1,127 @@
+import threading
+
+import pytest
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.exceptions import EndpointClientError
+from databricks.model_serving.rollout import COMPLETED, ROLLBACK_FAILED, ROLLED_BACK, RolloutController, RolloutSLO
+from databricks.model_serving.testing import LocalServingServer
+
+MODELS = [{"model_name": "m", "model_version": "1"}, {"model_name": "m", "model_version": "2"}]
+
+
+@pytest.fixture
+def server():
+    with LocalServingServer(seed = 1) as server:
+        server.add_endpoint("e", MODELS)
+        client = EndpointClient(server.base_url, "FAKETOKEN")
+        client.update_served_models("e", MODELS, {"routes": [
+            {"served_model_name": "m-1", "traffic_percentage": 100},
+            {"served_model_name": "m-2", "traffic_percentage": 0},
+        ]})
+        yield server
+
+def _rollout(server, **kwargs):
+    client = EndpointClient(server.base_url, "FAKETOKEN")
+    stop = threading.Event()
+
+    def traffic():
+        while not stop.is_set():
+            try:
+                client.query_inference_endpoint("e", {"inputs": [1]})
+            except EndpointClientError:
+                pass
+
+    thread = threading.Thread(target = traffic)
+    thread.start()
+    try:
+        options = dict(schedule = (20, 50, 100), step_duration = 0.1, check_interval = 0.02, max_step_duration = 5)
+        options.update(kwargs)
+        return RolloutController(client, "e", "m-2", **options).run()
+    finally:
+        stop.set()
+        thread.join()
+
+def _traffic(server):
+    routes = server.endpoint("e")["config"]["traffic_config"]["routes"]
+    return {r["served_model_name"]: int(r["traffic_percentage"]) for r in routes}
+
+def test_healthy_candidate_gets_all_traffic(server):
+    steps = []
+
+    result = _rollout(server, slo = RolloutSLO(max_error_rate = 0.0, min_requests = 5), on_step = steps.append)
+
+    assert result.status == COMPLETED
+    assert [s.percentage for s in steps] == [20, 50, 100]
+    assert all(s.requests >= 5 and s.errors == 0 and s.p99 is not None for s in steps)
+    assert _traffic(server) == {"m-2": 100, "m-1": 0}
+
+def test_failing_candidate_is_rolled_back(server):
+    server.set_behavior("e/m-2", error_rate = 1.0)
+
+    result = _rollout(server, slo = RolloutSLO(max_error_rate = 0.05, min_requests = 5))
+
+    assert result.status == ROLLED_BACK
+    assert len(result.steps) == 1
+    assert result.reason.startswith("20%: error rate 100.00%")
+    assert _traffic(server) == {"m-1": 100, "m-2": 0}
+
+def test_slow_candidate_is_rolled_back(server):
+    server.set_behavior("e/m-2", latency = 0.03)
+
+    result = _rollout(server, slo = RolloutSLO(max_p99 = 0.02, min_requests = 3))
+
+    assert result.status == ROLLED_BACK
+    assert "p99" in result.steps[0].breach
+    assert _traffic(server)["m-1"] == 100
+
+def test_failed_config_update_is_rolled_back(server):
+    server.fail_config_updates("e")
+
+    result = _rollout(server, on_step = lambda step: server.fail_config_updates("e", False))
+
+    assert result.status == ROLLED_BACK
+    assert result.reason == "20%: config update failed"
+    assert _traffic(server) == {"m-1": 100, "m-2": 0}
+
+def test_failed_rollback_is_reported(server):
+    server.set_behavior("e/m-2", error_rate = 1.0)
+
+    result = _rollout(server, slo = RolloutSLO(min_requests = 5), on_step = lambda step: server.fail_config_updates("e"))
+
+    assert result.status == ROLLBACK_FAILED
+    assert result.reason.endswith("rollback failed: config update failed")
+    assert _traffic(server) == {"m-2": 20, "m-1": 80}
+
+def test_interrupted_rollout_is_rolled_back(server):
+    def interrupt(step):
+        if step.percentage == 50:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        _rollout(server, slo = RolloutSLO(min_requests = 5), on_step = interrupt)
+
+    assert _traffic(server) == {"m-1": 100, "m-2": 0}
+
+def test_too_little_traffic_rolls_back(server):
+    client = EndpointClient(server.base_url, "FAKETOKEN")
+
+    result = RolloutController(client, "e", "m-2", step_duration = 0.05, check_interval = 0.01, max_step_duration = 0.1).run()
+
+    assert result.status == ROLLED_BACK
+    assert "fewer than 100" in result.reason
+    assert client.request_hooks == []
+
+def test_remaining_traffic_keeps_baseline_proportions(server):
+    client = EndpointClient(server.base_url, "FAKETOKEN")
+    controller = RolloutController(client, "e", "m-3")
+
+    routes = controller._routes(5, {"a": 2.0, "b": 1.0})
+
+    assert routes == [
+        {"served_model_name": "m-3", "traffic_percentage": 5},
+        {"served_model_name": "a", "traffic_percentage": 63},
+        {"served_model_name": "b", "traffic_percentage": 32},
+    ]
+    with pytest.raises(ValueError):
+        controller.run()
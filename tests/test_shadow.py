@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.shadow import ShadowMirror, compare_predictions
+from databricks.model_serving.testing import LocalServingServer, echo_predictions
+
+
+def _candidate_adds(offset):
+    def predict(endpoint_name, body):
+        response = echo_predictions(endpoint_name, body)
+        if endpoint_name == "candidate":
+            response["predictions"] = [p + offset for p in response["predictions"]]
+        return response
+
+    return predict
+
+def test_compare_predictions():
+    match, diff = compare_predictions({"predictions": [1, 2.0]}, {"predictions": [1, 2.0000001]})
+    assert match and diff < 1e-6
+    assert compare_predictions([1, 2], [1, 3]) == (False, 1)
+    assert compare_predictions([["a"]], [["b"]]) == (False, None)
+    assert compare_predictions([1, 2], [1]) == (False, None)
+
+def test_primary_returns_while_payloads_are_mirrored():
+    with LocalServingServer(predict = _candidate_adds(0.5)) as server:
+        client = EndpointClient(server.base_url, "FAKETOKEN")
+        mirror = client.add_shadow("primary", "candidate", sample_rate = 1.0)
+
+        responses = [client.query_inference_endpoint("primary", {"inputs": [i]}) for i in range(5)]
+        client.remove_shadow("primary")
+        stats = mirror.stats()
+
+    assert responses == [{"predictions": [i]} for i in range(5)]
+    assert stats["mirrored"] == 5 and stats["mismatches"] == 5
+    assert stats["candidate_latency"]["count"] == 5
+    assert {r.max_abs_diff for r in mirror.records} == {0.5}
+    assert [p for r in mirror.records for p in r.candidate] == [i + 0.5 for i in range(5)]
+    assert client.shadow_stats() == {}
+
+def test_sample_rate(local_server):
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+    mirror = client.add_shadow("primary", "candidate", sample_rate = 0.0)
+
+    client.query_inference_endpoint("primary", {"inputs": [1]})
+    client.close()
+
+    assert mirror.stats()["offered"] == 1
+    assert mirror.stats()["mirrored"] == 0
+    assert len(local_server.requests) == 1
+
+def test_full_queue_drops_without_blocking_primary(local_server):
+    release = threading.Event()
+    local_server.set_behavior("candidate", latency = lambda: release.wait(5) and 0)
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+    mirror = client.add_shadow("primary", "candidate", sample_rate = 1.0, queue_size = 1, workers = 1)
+
+    for i in range(10):
+        client.query_inference_endpoint("primary", {"inputs": [i]})
+    dropped = mirror.stats()["dropped"]
+    release.set()
+    client.close()
+
+    assert dropped >= 8
+    assert mirror.stats()["mirrored"] == 10 - dropped
+
+def test_candidate_errors_are_recorded(local_server, tmp_path):
+    local_server.inject_errors(500, count = 1, endpoint_name = "candidate")
+    records = []
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+    mirror = client.add_shadow("primary", "candidate", sample_rate = 1.0, keep_payloads = True, sink = records.append)
+
+    assert client.query_inference_endpoint("primary", {"inputs": [1]}) == {"predictions": [1]}
+    client.query_inference_endpoint("primary", {"inputs": [2]})
+    client.close()
+    mirror.write_jsonl(str(tmp_path / "shadow.jsonl"))
+    lines = [json.loads(line) for line in open(tmp_path / "shadow.jsonl")]
+
+    assert mirror.stats()["errors"] == 1 and mirror.stats()["matches"] == 1
+    assert records[0].error.startswith("ServerError")
+    assert [line["payload"] for line in lines] == [{"inputs": [1]}, {"inputs": [2]}]
+    assert lines[1]["match"] is True
+
+def test_mirror_without_client_registration(local_server):
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+    mirror = ShadowMirror(client, "primary", "candidate", sample_rate = 1.0)
+
+    assert mirror.offer({"inputs": [3]}, {"predictions": [3]}, 0.01)
+    mirror.close()
+
+    assert mirror.records[0].match is True
+    assert mirror.records[0].primary_latency == 0.01
+
+def test_payload_is_copied_when_offered(local_server):
+    release = threading.Event()
+    local_server.set_behavior("candidate", latency = lambda: release.wait(5) and 0)
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+    mirror = ShadowMirror(client, "primary", "candidate", sample_rate = 1.0, keep_payloads = True)
+    data = {"inputs": [1]}
+
+    mirror.offer(data, {"predictions": [1]}, 0.01)
+    data["inputs"].append(2)
+    release.set()
+    mirror.close()
+
+    assert mirror.records[0].payload == {"inputs": [1]}
+    assert mirror.records[0].match is True
+
+def test_close_does_not_block_on_a_full_queue(local_server):
+    release = threading.Event()
+    local_server.set_behavior("candidate", latency = lambda: release.wait(5) and 0)
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+    mirror = ShadowMirror(client, "primary", "candidate", sample_rate = 1.0, queue_size = 1, workers = 1)
+    mirror.offer({"inputs": [0]}, {"predictions": [0]}, 0.01)
+    while mirror.stats()["queued"]:
+        time.sleep(0.01)
+    # The worker is stuck on the first payload and the second fills the queue.
+    assert mirror.offer({"inputs": [1]}, {"predictions": [1]}, 0.01)
+
+    start = time.monotonic()
+    mirror.close(timeout = 0.2)
+    elapsed = time.monotonic() - start
+    release.set()
+
+    assert elapsed < 1
+    mirror._threads[0].join(5)
+    assert not mirror._threads[0].is_alive()
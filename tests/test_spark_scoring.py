@@ -0,0 +1,40 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.spark import score_batches
+
+
+def test_score_batches_adds_predictions(local_server):
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+    batches = [
+        pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [10.0, 20.0, 30.0], "id": [1, 2, 3]}),
+        pd.DataFrame({"a": [4.0], "b": [40.0], "id": [4]}),
+    ]
+
+    scored = list(score_batches(client, iter(batches), "endpoint", ["a", "b"], max_rows = 2))
+
+    assert [list(b["prediction"]) for b in scored] == [[11.0, 22.0, 33.0], [44.0]]
+    assert list(scored[0].columns) == ["a", "b", "id", "prediction"]
+
+def test_score_batches_reports_errors(local_server):
+    client = EndpointClient("http://127.0.0.1:1", "FAKETOKEN", connect_timeout = 0.1)
+    batch = pd.DataFrame({"a": [1.0, 2.0]})
+
+    scored = next(score_batches(client, iter([batch]), "endpoint", ["a"], error_col = "error"))
+
+    assert scored["prediction"].isna().all()
+    assert scored["error"].notna().all()
+
+def test_score_dataframe_local_spark(local_server):
+    pytest.importorskip("pyspark")
+    from pyspark.sql import SparkSession
+    from databricks.model_serving.spark import score_dataframe
+
+    spark = SparkSession.builder.master("local[2]").getOrCreate()
+    df = spark.createDataFrame(pd.DataFrame({"a": [1.0, 2.0], "b": [10.0, 20.0]}))
+
+    scored = score_dataframe(df, "endpoint", local_server.base_url, "FAKETOKEN")
+
+    assert sorted(r.prediction for r in scored.collect()) == [11.0, 22.0]
@@ -0,0 +1,107 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.exceptions import (
+    NotFoundError,
+    ServiceUnavailableError,
+    ThrottledError,
+)
+from databricks.model_serving.retry import RetryPolicy
+from databricks.model_serving.testing import LocalServingServer, lognormal
+
+
+def test_endpoint_lifecycle():
+    with LocalServingServer(config_update_delay = 0.1) as server:
+        client = EndpointClient(server.base_url, "FAKETOKEN")
+        created = client.create_inference_endpoint("e", [{"model_name": "m", "model_version": "1"}])
+        assert created["state"] == {"ready": "NOT_READY", "config_update": "IN_PROGRESS"}
+        with pytest.raises(ServiceUnavailableError):
+            client.query_inference_endpoint("e", {"inputs": [1]})
+
+        result = client.wait_until_ready("e", timeout = 5)
+
+        assert result.succeeded
+        endpoint = client.get_inference_endpoint("e")
+        assert endpoint["config"]["config_version"] == 1
+        assert endpoint["config"]["served_models"][0]["name"] == "m-1"
+        assert "pending_config" not in endpoint
+        assert client.query_inference_endpoint("e", {"inputs": [1]}) == {"predictions": [1]}
+
+        client.update_served_models("e", [{"model_name": "m", "model_version": "2"}])
+        client.wait_for_config_update("e", timeout = 5)
+
+        assert client.get_inference_endpoint("e")["config"]["config_version"] == 2
+        assert len(client.get_inference_endpoint_events("e")["events"]) == 4
+        client.delete_inference_endpoint("e")
+        with pytest.raises(NotFoundError):
+            client.get_inference_endpoint("e")
+
+def test_failed_config_update_keeps_previous_config(local_server):
+    local_server.add_endpoint("e", [{"model_name": "m", "model_version": "1"}])
+    local_server.fail_config_updates("e")
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    client.update_served_models("e", [{"model_name": "m", "model_version": "2"}])
+    result = client.wait_for_config_update("e", timeout = 5)
+
+    assert result.failed
+    assert result.state == {"ready": "READY", "config_update": "UPDATE_FAILED"}
+    assert result.endpoint["config"]["served_models"][0]["model_version"] == "1"
+
+def test_strict_server_rejects_unknown_endpoints():
+    with LocalServingServer(strict = True) as server:
+        with pytest.raises(NotFoundError):
+            EndpointClient(server.base_url, "FAKETOKEN").query_inference_endpoint("e", {"inputs": [1]})
+
+def test_concurrency_limit_throttles(local_server):
+    local_server.set_behavior("e", latency = 0.05, concurrency_limit = 2)
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    def call(i):
+        try:
+            return client.query_inference_endpoint("e", {"inputs": [i]})
+        except ThrottledError as e:
+            return e
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(call, range(8)))
+
+    assert any(isinstance(r, ThrottledError) for r in results)
+    assert local_server.max_in_flight <= 2
+
+def test_injected_errors_are_retried(local_server):
+    local_server.inject_errors(503, count = 2, retry_after = "0")
+    client = EndpointClient(
+        local_server.base_url, "FAKETOKEN", retry_policy = RetryPolicy(retry_invocations = True, backoff_base = 0.01)
+    )
+
+    assert client.query_inference_endpoint("e", {"inputs": [1]}) == {"predictions": [1]}
+    assert len(local_server.requests) == 3
+
+def test_read_timeout(local_server):
+    local_server.behavior.latency = 0.5
+    client = EndpointClient(local_server.base_url, "FAKETOKEN", read_timeout = 0.1)
+
+    with pytest.raises(requests.Timeout):
+        client.query_inference_endpoint("e", {"inputs": [1]})
+
+def test_latency_distribution(local_server):
+    local_server.behavior.latency = lognormal(0.01, 0.1)
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    start = time.perf_counter()
+    for i in range(5):
+        client.query_inference_endpoint("e", {"inputs": [i]})
+
+    assert time.perf_counter() - start >= 0.03
+
+def test_served_model_logs(local_server):
+    local_server.add_endpoint("e", [{"name": "m-1", "model_name": "m", "model_version": "1"}])
+    local_server.append_logs("e", "m-1", "started", "ready")
+    client = EndpointClient(local_server.base_url, "FAKETOKEN")
+
+    assert "Build" in client.get_served_model_build_logs("e", "m-1")["logs"]
@@ -0,0 +1,116 @@
+import pytest
+
+from databricks.model_serving import waiter
+from databricks.model_serving.client import EndpointClient
+from databricks.model_serving.exceptions import NotFoundError
+from databricks.model_serving.waiter import (
+    UNTIL_CONFIG_UPDATED,
+    WaitTimeoutError,
+    wait_for_endpoints,
+)
+
+
+def _endpoint(name, config_update, ready = "NOT_READY"):
+    return {"name": name, "state": {"config_update": config_update, "ready": ready}}
+
+
+class ScriptedClient:
+    """Returns a scripted sequence of states per endpoint."""
+
+    def __init__(self, script):
+        self.script = script
+        self.gets = 0
+        self.lists = 0
+
+    def _next(self, name):
+        states = self.script[name]
+        return states.pop(0) if len(states) > 1 else states[0]
+
+    def get_inference_endpoint(self, endpoint_name, refresh = False):
+        self.gets += 1
+        endpoint = self._next(endpoint_name)
+        if endpoint is None:
+            raise NotFoundError("not found", 404, "")
+        return endpoint
+
+    def list_inference_endpoints(self, refresh = False):
+        self.lists += 1
+        return {"endpoints": [self._next(name) for name in self.script]}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(waiter.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_waits_until_ready_with_backoff(sleeps):
+    client = ScriptedClient({"a": [
+        _endpoint("a", "IN_PROGRESS"),
+        _endpoint("a", "IN_PROGRESS"),
+        _endpoint("a", "IN_PROGRESS"),
+        _endpoint("a", "NOT_UPDATING", "READY"),
+    ]})
+
+    result = wait_for_endpoints(client, ["a"], initial_delay = 1, backoff_factor = 2)["a"]
+
+    assert result.succeeded
+    assert result.state == {"config_update": "NOT_UPDATING", "ready": "READY"}
+    assert [t.state["config_update"] for t in result.timeline] == ["IN_PROGRESS", "NOT_UPDATING"]
+    assert sleeps == [1, 2, 4]
+
+def test_failure_state_stops_immediately(sleeps):
+    client = ScriptedClient({"a": [_endpoint("a", "UPDATE_FAILED")]})
+
+    result = wait_for_endpoints(client, ["a"])["a"]
+
+    assert result.failed
+    assert sleeps == []
+
+def test_not_ready_after_update_fails_only_when_waiting_for_ready(sleeps):
+    client = ScriptedClient({"a": [_endpoint("a", "NOT_UPDATING")]})
+
+    assert wait_for_endpoints(client, ["a"])["a"].failed
+    assert wait_for_endpoints(client, ["a"], until = UNTIL_CONFIG_UPDATED)["a"].succeeded
+
+def test_single_endpoint_not_found_yet_is_waited_for(sleeps):
+    client = ScriptedClient({"a": [None, _endpoint("a", "NOT_UPDATING", "READY")]})
+
+    result = wait_for_endpoints(client, ["a"], initial_delay = 1)["a"]
+
+    assert result.succeeded
+    assert sleeps == [1]
+
+def test_many_endpoints_share_one_list_call_per_round(sleeps):
+    client = ScriptedClient({
+        "a": [_endpoint("a", "IN_PROGRESS"), _endpoint("a", "NOT_UPDATING", "READY")],
+        "b": [_endpoint("b", "IN_PROGRESS"), _endpoint("b", "IN_PROGRESS"),
+              _endpoint("b", "NOT_UPDATING", "READY")],
+    })
+
+    results = wait_for_endpoints(client, ["a", "b"])
+
+    assert all(r.succeeded for r in results.values())
+    assert client.gets == 1
+    assert client.lists == 2
+
+def test_timeout_reports_partial_results(sleeps, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(waiter.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(waiter.time, "sleep", lambda s: now.__setitem__(0, now[0] + s))
+    client = ScriptedClient({"a": [_endpoint("a", "IN_PROGRESS")]})
+
+    with pytest.raises(WaitTimeoutError) as e:
+        wait_for_endpoints(client, ["a"], timeout = 10)
+
+    assert not e.value.results["a"].done
+
+def test_client_wait_until_ready(sleeps, monkeypatch):
+    client = EndpointClient("http://fake.url", "FAKETOKEN")
+    states = [_endpoint("a", "IN_PROGRESS"), _endpoint("a", "NOT_UPDATING", "READY")]
+    monkeypatch.setattr(
+        client, "get_inference_endpoint", lambda name, refresh = False: states.pop(0)
+    )
+
+    assert client.wait_until_ready("a").succeeded